@@ -30,16 +30,16 @@ try:
 except ImportError as e:
     print(f"❌ Import failed: {e}")
     # Create minimal Flask app if main app fails
-    from flask import Flask, jsonify, send_from_directory
+    from flask import Flask, jsonify
+    from src.static_assets import StaticAssetStore, serve_asset_or_404
     app = Flask(__name__)
+    static_assets = StaticAssetStore(os.path.join(parent_dir, 'website'))
     
     @app.route('/')
     def index():
         # Try to serve the main website HTML directly
         try:
-            website_path = os.path.join(parent_dir, 'website', 'index.html')
-            with open(website_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return serve_asset_or_404(static_assets, 'index.html')
         except:
             return jsonify({
                 'error': 'Could not load main app',
@@ -49,11 +49,11 @@ except ImportError as e:
     
     @app.route('/css/<path:filename>')
     def css_files(filename):
-        return send_from_directory(os.path.join(parent_dir, 'website', 'css'), filename)
+        return serve_asset_or_404(static_assets, f'css/{filename}')
     
     @app.route('/js/<path:filename>')
     def js_files(filename):
-        return send_from_directory(os.path.join(parent_dir, 'website', 'js'), filename)
+        return serve_asset_or_404(static_assets, f'js/{filename}')
     
     @app.route('/health')
     def health():
@@ -1,5 +1,6 @@
 from flask import Flask, send_from_directory, request, jsonify
 import os
+import sys
 import json
 import time
 import re
@@ -11,6 +12,12 @@ app = Flask(__name__)
 
 # Get parent directory path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.static_assets import StaticAssetStore, serve_asset_or_404
+
+# Website bundle, precompressed in memory
+static_assets = StaticAssetStore(os.path.join(parent_dir, 'website'))
 
 # Global state for workflow
 workflow_state = {
@@ -46,7 +53,7 @@ channel_data = {
 def index():
     """Serve main website"""
     try:
-        return send_from_directory(os.path.join(parent_dir, 'website'), 'index.html')
+        return serve_asset_or_404(static_assets, 'index.html')
     except Exception as e:
         return f'''<!DOCTYPE html>
 <html>
@@ -74,12 +81,12 @@ def index():
 @app.route('/css/<path:filename>')
 def serve_css(filename):
     """Serve CSS files"""
-    return send_from_directory(os.path.join(parent_dir, 'website', 'css'), filename)
+    return serve_asset_or_404(static_assets, f'css/{filename}')
 
 @app.route('/js/<path:filename>')
 def serve_js(filename):
     """Serve JS files"""
-    return send_from_directory(os.path.join(parent_dir, 'website', 'js'), filename)
+    return serve_asset_or_404(static_assets, f'js/{filename}')
 
 @app.route('/images/<path:filename>')
 def serve_images(filename):
@@ -89,17 +96,17 @@ def serve_images(filename):
 @app.route('/about')
 def about():
     """Serve about page"""
-    return send_from_directory(os.path.join(parent_dir, 'website'), 'about.html')
+    return serve_asset_or_404(static_assets, 'about.html')
 
 @app.route('/privacy')
 def privacy():
     """Serve privacy page"""
-    return send_from_directory(os.path.join(parent_dir, 'website'), 'privacy.html')
+    return serve_asset_or_404(static_assets, 'privacy.html')
 
 @app.route('/terms')
 def terms():
     """Serve terms page"""
-    return send_from_directory(os.path.join(parent_dir, 'website'), 'terms.html')
+    return serve_asset_or_404(static_assets, 'terms.html')
 
 # Helper functions
 def extract_video_id(url):
@@ -372,7 +379,7 @@ def reset_workflow():
         'error_message': '',
         'upload_results': {}
     }
-        return jsonify({'success': True, 'message': 'Workflow reset successfully'})
+    return jsonify({'success': True, 'message': 'Workflow reset successfully'})
 
 @app.route('/api/channel_info')
 def get_channel_info():
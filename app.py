@@ -12,35 +12,123 @@ import os
 import json
 import logging
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, abort, render_template, request, jsonify, send_from_directory, redirect, url_for
+from werkzeug.utils import safe_join, secure_filename
 import threading
 import time
+import uuid
 from datetime import datetime
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from urllib.parse import urlencode, urlparse
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+from concurrent.futures import ThreadPoolExecutor
+import http.client
 import re
+import sqlite3
 
 # Import automation framework
 from src.automation_framework import AutomationFramework
 from src.config_manager import ConfigManager
 from src.auto_clip_uploader import AutoClipUploader
+from src.cancellation import CancellationToken, JobCancelled
+from src.job_events import JobEventBus
+from src.progress import ProgressTracker
+from src.response_cache import ResponseCache
+from src.http_client import PooledHTTPClient, fan_out
+from src.channel_id_cache import ChannelIdCache
+from src.youtube_data import YouTubeDataClient
+from src.static_assets import StaticAssetStore, serve_asset_or_404
+from src.previews import clip_fingerprint, load_cached_previews
+from src.metrics import MetricsRegistry, format_duration, format_time_ago
+from src.tracing import Tracer, activate, span
+from src.profiling import Profiler
+from src.task_execution import allow_process_isolation
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'automation-with-irtza-secret-key'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
+# Website bundle, precompressed in memory (reloads on change in debug mode)
+static_assets = StaticAssetStore('website')
+app.jinja_env.globals['asset_url'] = static_assets.url
+
+# Clip files are served from here (see video_files)
+VIDEO_ROOT = 'videos'
+VIDEO_CACHE_MAX_AGE = 365 * 24 * 3600
+
 # Create upload directory
 Path(app.config['UPLOAD_FOLDER']).mkdir(exist_ok=True)
 
-# Initialize automation framework
 config_manager = ConfigManager()
-automation_framework = AutomationFramework(config_manager)
-clip_uploader = AutoClipUploader()
+# Cache in front of YouTube Data API reads (see youtube_api.cache in config)
+youtube_cache = ResponseCache(
+    max_entries=config_manager.get_setting('youtube_api.cache.max_entries', 256),
+    ttls=config_manager.get_setting('youtube_api.cache.ttl_seconds', {}),
+    disk_dir=config_manager.get_setting('youtube_api.cache.disk_dir') or None
+)
+# Keep-alive connection pool and worker threads for YouTube API fan-out
+youtube_http = PooledHTTPClient(
+    timeout=config_manager.get_setting('youtube_api.timeout', 10),
+    retries=config_manager.get_setting('youtube_api.retries', 2),
+    max_retry_after=config_manager.get_setting('youtube_api.max_retry_after_seconds', 30)
+)
+youtube_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='youtube-api')
+# Persistent handle/username/custom URL -> channel ID mapping
+channel_id_cache = ChannelIdCache(
+    path=config_manager.get_setting('youtube_api.channel_id_cache.path', 'cache/channel_ids.json'),
+    ttl=config_manager.get_setting('youtube_api.channel_id_cache.ttl_seconds', 30 * 24 * 3600),
+    negative_ttl=config_manager.get_setting('youtube_api.channel_id_cache.negative_ttl_seconds', 24 * 3600)
+)
+
+# Durations, outcomes and throughput shown on the dashboard and exported at /metrics
+metrics = MetricsRegistry()
+youtube_data = YouTubeDataClient(youtube_http, youtube_cache, metrics=metrics)
+
+# Forking this multithreaded server could deadlock; process-isolated tasks run in threads
+allow_process_isolation(False)
+
+# Initialize automation framework
+automation_framework = AutomationFramework(config_manager, youtube_client=youtube_data, metrics=metrics)
+# Processing jobs and their clips are recorded in the framework's catalog (catalog.path)
+clip_catalog = automation_framework.catalog
+clip_uploader = AutoClipUploader(metrics=metrics, catalog=clip_catalog)
+# task_settings.clip_uploader (Whisper 'auto' resolved by the last system_check), re-applied
+# between jobs whenever the configuration file changes
+clip_uploader.configure(automation_framework.uploader_settings())
+config_manager.subscribe(lambda new, old: clip_uploader.configure(automation_framework.uploader_settings()))
+job_events = JobEventBus()
+# Cancellation tokens of running jobs, keyed by job id
+job_tokens = {}
+metrics.set_gauge('active_jobs', lambda: len(job_tokens))
+metrics.adjust_gauge('whisper_models_resident', 0)
+# Export clip counters from the first scrape, before any job has run
+for _counter in ('clips_created', 'clips_uploaded', 'clips_failed'):
+    metrics.increment(_counter, 0)
+
+# Chrome trace files of traced jobs, downloadable from /api/jobs/<job_id>/trace
+TRACE_DIR = Path(config_manager.get_setting('tracing.dir', 'cache/traces'))
+# pstats, collapsed stacks and summaries of profiled jobs (see /api/jobs/<job_id>/profile)
+PROFILE_DIR = Path(config_manager.get_setting('profiling.dir', 'cache/profiles'))
+PROFILE_FILES = {'summary': '.summary.json', 'pstats': '.pstats', 'collapsed': '.collapsed'}
+
+_background_started = False
+
+
+def start_background_services():
+    """
+    Start the configuration file watcher and the scheduled tasks (those with a
+    'schedule', and channel_sync every interval_seconds). Called by the server
+    entry points, not on import, so tests, serverless handlers and every WSGI
+    worker that imports the app do not each start their own scheduler.
+    """
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
+    if config_manager.get_setting('config_reload.enabled', True):
+        config_manager.start_watching(config_manager.get_setting('config_reload.interval_seconds', 2))
+    automation_framework.start_scheduled_tasks()
 
 # Global state for workflow
 workflow_state = {
@@ -50,8 +138,12 @@ workflow_state = {
     'processing_status': 'idle',
     'clips': [],
     'progress': 0,
+    'stage': '',
+    'eta_seconds': None,
     'error_message': '',
-    'upload_results': {}
+    'upload_results': {},
+    'job_id': '',
+    'upload_job_id': ''
 }
 
 # Setup logging
@@ -61,7 +153,7 @@ logger = logging.getLogger(__name__)
 @app.route('/')
 def home():
     """Main homepage with 3D website"""
-    return send_from_directory('website', 'index.html')
+    return serve_asset_or_404(static_assets, 'index.html')
 
 @app.route('/workflow')
 def workflow():
@@ -71,17 +163,17 @@ def workflow():
 @app.route('/about')
 def about():
     """About page"""
-    return send_from_directory('website', 'about.html')
+    return serve_asset_or_404(static_assets, 'about.html')
 
 @app.route('/privacy')
 def privacy():
     """Privacy policy page"""
-    return send_from_directory('website', 'privacy.html')
+    return serve_asset_or_404(static_assets, 'privacy.html')
 
 @app.route('/terms')
 def terms():
     """Terms of service page"""
-    return send_from_directory('website', 'terms.html')
+    return serve_asset_or_404(static_assets, 'terms.html')
 
 @app.route('/contact', methods=['POST'])
 def contact():
@@ -129,24 +221,28 @@ def contact():
 @app.route('/dashboard')
 def dashboard():
     """Dashboard view for monitoring all processes"""
+    snapshot = metrics.snapshot()
     # Get system status
+    success_rate = snapshot['outcomes'].get('processing', {}).get('success_rate')
+    clips_created = snapshot['rates'].get('clips_created', {})
     system_status = {
-        'active_tasks': 0,
-        'clips_processed': len(workflow_state['clips']),
-        'success_rate': 98.5,
-        'uptime': '99.9%'
+        'active_tasks': snapshot['gauges'].get('active_jobs', 0) + (snapshot['gauges'].get('clip_queue_depth') or 0),
+        'clips_processed': clips_created.get('total', 0),
+        'clips_per_hour': clips_created.get('per_hour', 0),
+        'success_rate': f"{success_rate}%" if success_rate is not None else '--',
+        'uptime': format_duration(snapshot['uptime_seconds'])
     }
+    stage_durations = {name.split('.', 1)[1]: summary for name, summary in snapshot['durations'].items()
+                       if name.startswith('stage.')}
     
     # Get recent activity
-    recent_activity = [
-        {'type': 'success', 'message': 'Video processing completed', 'time': '2 minutes ago'},
-        {'type': 'upload', 'message': f"{len(workflow_state['clips'])} clips processed", 'time': '5 minutes ago'},
-        {'type': 'info', 'message': 'AI transcription finished', 'time': '8 minutes ago'}
-    ]
+    recent_activity = [dict(entry, time=format_time_ago(entry['timestamp']))
+                       for entry in metrics.recent_activity(10)]
     
     return render_template('dashboard.html', 
                          system_status=system_status,
                          recent_activity=recent_activity,
+                         stage_durations=stage_durations,
                          clips=workflow_state['clips'])
 
 @app.route('/api/set_youtube_channel', methods=['POST'])
@@ -162,6 +258,10 @@ def set_youtube_channel():
     workflow_state['current_step'] = 2
     workflow_state['error_message'] = ''
     
+    # Warm the channel ID cache so the /api/youtube/* calls that follow are free
+    if get_youtube_api_key():
+        youtube_executor.submit(parse_channel_id_from_url, youtube_channel)
+    
     logger.info(f"YouTube channel set: {youtube_channel}")
     return jsonify({'success': True, 'next_step': 2})
 
@@ -186,60 +286,221 @@ def process_video():
     """Step 3: Process video and create clips"""
     if not workflow_state['video_url']:
         return jsonify({'success': False, 'message': 'No video URL provided'}), 400
+    if _job_running():
+        return jsonify({'success': False, 'message': 'A job is already running'}), 409
+    data = request.get_json(silent=True) or {}
     
     # Start processing in background
+    job_id = uuid.uuid4().hex[:12]
+    tracer = _job_tracer(job_id, 'processing', data.get('trace'))
+    profile = bool(data.get('profile'))
+    workflow_state['job_id'] = job_id
     workflow_state['processing_status'] = 'processing'
     workflow_state['progress'] = 0
+    workflow_state['stage'] = ''
+    workflow_state['eta_seconds'] = None
     workflow_state['clips'] = []
     workflow_state['error_message'] = ''
+    cancel_token = CancellationToken()
+    job_tokens[job_id] = cancel_token
+    job_events.publish(job_id, 'status', _processing_snapshot())
+    # This job's state; a reset swaps in a new dict, which the job then leaves alone
+    state = workflow_state
+    
+    def publish_status():
+        job_events.publish(job_id, 'status', _processing_snapshot(state))
+    
+    def on_pipeline_event(event, data):
+        if event == 'progress':
+            # Weighted progress from the pipeline drives the status snapshot
+            state['progress'] = data['progress']
+            state['stage'] = data['stage'] or ''
+            state['eta_seconds'] = data['eta_seconds']
+            publish_status()
+        else:
+            job_events.publish(job_id, event, data)
     
     def process_in_background():
+        started = time.monotonic()
+        profiler = Profiler(f"processing {job_id}").start() if profile else None
         try:
             logger.info("Starting video processing...")
-            workflow_state['progress'] = 10
             
             # Process video with clip uploader
-            results = clip_uploader.process_video(workflow_state['video_url'], dry_run=True)
+            results = clip_uploader.process_video(state['video_url'], dry_run=True,
+                                                  on_event=on_pipeline_event,
+                                                  cancel_token=cancel_token, tracer=tracer, job_id=job_id,
+                                                  clip_dir=clip_uploader.CLIP_DIR / job_id)
             
-            workflow_state['progress'] = 50
             logger.info(f"Processing results: {results}")
             
             # Update clips data
-            workflow_state['clips'] = results.get('clips', [])[:6]  # Limit to 6 clips
-            workflow_state['progress'] = 90
+            state['clips'] = results.get('clips', [])
             
-            if results.get('errors'):
-                workflow_state['error_message'] = '; '.join(results['errors'])
-                workflow_state['processing_status'] = 'error'
+            if results.get('cancelled'):
+                state['processing_status'] = 'cancelled'
+                state['error_message'] = cancel_token.reason
+            elif results.get('errors'):
+                state['error_message'] = '; '.join(results['errors'])
+                state['processing_status'] = 'error'
             else:
-                workflow_state['processing_status'] = 'completed'
-                workflow_state['current_step'] = 4
+                state['processing_status'] = 'completed'
+                state['current_step'] = 4
             
-            workflow_state['progress'] = 100
+            if not results.get('cancelled'):
+                state['progress'] = 100
+                state['eta_seconds'] = 0
             logger.info("Video processing completed")
             
         except Exception as e:
             logger.error(f"Video processing failed: {str(e)}")
-            workflow_state['processing_status'] = 'error'
-            workflow_state['error_message'] = str(e)
-            workflow_state['progress'] = 0
+            state['processing_status'] = 'error'
+            state['error_message'] = str(e)
+            state['progress'] = 0
+        finally:
+            job_tokens.pop(job_id, None)
+            _write_trace(job_id, tracer)
+            _write_profile(job_id, profiler)
+            _record_job_metrics('processing', state['processing_status'], time.monotonic() - started,
+                                f"Video processing finished: {len(state['clips'])} clips", state)
+            publish_status()
     
     # Start background processing
     thread = threading.Thread(target=process_in_background)
     thread.daemon = True
     thread.start()
     
-    return jsonify({'success': True, 'message': 'Video processing started'})
+    return jsonify(_job_started('Video processing started', job_id, tracer, profile))
+
+def _job_tracer(job_id, kind, requested=None):
+    """Return a tracer for the job if tracing was requested or is enabled in config"""
+    if requested is None:
+        requested = config_manager.get_setting('tracing.enabled', False)
+    if not requested:
+        return None
+    return Tracer(f"{kind} {job_id}", {'job_id': job_id, 'kind': kind, 'video_url': workflow_state['video_url']})
+
+def _write_trace(job_id, tracer):
+    """Write a finished job's trace; failures only cost the trace"""
+    if tracer is None:
+        return
+    try:
+        tracer.write(TRACE_DIR / f'{job_id}.json')
+    except OSError as e:
+        logger.warning(f"Could not write trace for job {job_id}: {e}")
+
+def _write_profile(job_id, profiler):
+    """Stop a job's profiler and write its files"""
+    if profiler is None:
+        return
+    try:
+        profiler.stop()
+        profiler.write(PROFILE_DIR / job_id)
+    except OSError as e:
+        logger.warning(f"Could not write profile for job {job_id}: {e}")
+
+def _job_started(message, job_id, tracer, profile=False):
+    """Response body for a started job"""
+    body = {'success': True, 'message': message, 'job_id': job_id}
+    if tracer is not None:
+        body['trace_url'] = url_for('job_trace', job_id=job_id)
+    if profile:
+        body['profile_url'] = url_for('job_profile', job_id=job_id)
+    return body
+
+# Job statuses mapped to metric outcomes and activity feed types
+_JOB_OUTCOMES = {
+    'completed': ('success', 'success'),
+    'upload_completed': ('success', 'upload'),
+    'cancelled': ('cancelled', 'info'),
+}
+
+def _record_job_metrics(kind, status, seconds, message, state):
+    """Record a finished job's duration, outcome and activity entry"""
+    outcome, activity = _JOB_OUTCOMES.get(status, ('error', 'error'))
+    metrics.record_duration(f'job.{kind}', seconds)
+    metrics.record_outcome(kind, outcome)
+    if outcome == 'error':
+        message = f"{message} ({state['error_message'][:120]})"
+    metrics.record_activity(activity, message)
+
+def _job_running():
+    """True while a processing or upload job is running"""
+    return workflow_state['processing_status'] in ('processing', 'uploading')
+
+def _processing_snapshot(state=None):
+    """Build the processing status payload (of a job's own state, or the current one)"""
+    if state is None:
+        state = workflow_state
+    return {
+        'status': state['processing_status'],
+        'progress': state['progress'],
+        'stage': state['stage'],
+        'eta_seconds': state['eta_seconds'],
+        'clips_count': len(state['clips']),
+        'error_message': state['error_message']
+    }
+
+def _upload_snapshot(state=None):
+    """Build the upload status payload (of a job's own state, or the current one)"""
+    if state is None:
+        state = workflow_state
+    return {
+        'status': state['processing_status'],
+        'progress': state['progress'],
+        'eta_seconds': state['eta_seconds'],
+        'results': state['upload_results'],
+        'error_message': state['error_message']
+    }
 
 @app.route('/api/processing_status')
 def processing_status():
     """Get current processing status"""
-    return jsonify({
-        'status': workflow_state['processing_status'],
-        'progress': workflow_state['progress'],
-        'clips_count': len(workflow_state['clips']),
-        'error_message': workflow_state['error_message']
-    })
+    return jsonify(dict(_processing_snapshot(), job_id=workflow_state.get('job_id', '')))
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a running processing or upload job"""
+    token = job_tokens.get(job_id)
+    if token is None:
+        return jsonify({'success': False, 'message': 'Job is not running'}), 404
+    token.cancel('Cancelled by user')
+    logger.info(f"Job {job_id} cancelled")
+    return jsonify({'success': True, 'message': 'Job cancelled'})
+
+@app.route('/api/jobs/<job_id>/events')
+def job_event_stream(job_id):
+    """Stream job stage, progress, clip and upload events as Server-Sent Events"""
+    if not job_events.has_job(job_id):
+        return jsonify({'error': 'Unknown job'}), 404
+    last_event_id = request.headers.get('Last-Event-ID', default=0, type=int)
+    return Response(job_events.stream(job_id, last_event_id),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs/<job_id>/trace')
+def job_trace(job_id):
+    """Download a job's Chrome trace (open in chrome://tracing or ui.perfetto.dev)"""
+    if not re.fullmatch(r'[0-9a-f]{12}', job_id):
+        abort(404)
+    if not (TRACE_DIR / f'{job_id}.json').is_file():
+        return jsonify({'error': 'No trace for this job'}), 404
+    return send_from_directory(TRACE_DIR.resolve(), f'{job_id}.json', mimetype='application/json',
+                               as_attachment=True, download_name=f'trace-{job_id}.json', max_age=0)
+
+@app.route('/api/jobs/<job_id>/profile')
+def job_profile(job_id):
+    """Get a profiled job's summary, or its pstats/collapsed file with ?format="""
+    kind = request.args.get('format', 'summary')
+    if not re.fullmatch(r'[0-9a-f]{12}', job_id) or kind not in PROFILE_FILES:
+        abort(404)
+    filename = job_id + PROFILE_FILES[kind]
+    if not (PROFILE_DIR / filename).is_file():
+        return jsonify({'error': 'No profile for this job'}), 404
+    if kind == 'summary':
+        return send_from_directory(PROFILE_DIR.resolve(), filename, mimetype='application/json', max_age=0)
+    return send_from_directory(PROFILE_DIR.resolve(), filename, as_attachment=True,
+                               download_name=f'profile-{filename}', max_age=0)
 
 @app.route('/api/get_clips')
 def get_clips():
@@ -252,6 +513,8 @@ def get_clips():
             'duration': f"{clip.get('duration', 0):.1f}s",
             'transcript': clip.get('transcript', '')[:100] + '...' if clip.get('transcript', '') else '',
             'file_path': clip.get('file_path', ''),
+            'preview_url': _video_preview_url(clip.get('file_path', '')),
+            'previews': _clip_previews(clip),
             'file_size': f"{clip.get('file_size', 0) / 1024 / 1024:.1f}MB" if clip.get('file_size') else '0MB'
         })
     
@@ -260,6 +523,52 @@ def get_clips():
         'total_clips': len(clips_data)
     })
 
+@app.route('/api/clips')
+def list_catalog_clips():
+    """Clips of all jobs, newest first: ?source=&status=&job_id=&since=&until=&limit=&cursor=&total=1"""
+    args = request.args
+    try:
+        page = clip_catalog.list_clips(
+            source=args.get('source') or None,
+            status=args.get('status') or None,
+            job_id=args.get('job_id') or None,
+            created_after=args.get('since', type=float),
+            created_before=args.get('until', type=float),
+            limit=args.get('limit', 50, type=int),
+            cursor=args.get('cursor') or None,
+            include_total=args.get('total') in ('1', 'true'),
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    for clip in page['clips']:
+        clip['preview_url'] = _video_preview_url(clip.get('file_path') or '')
+    return jsonify(page)
+
+@app.route('/api/clips/<int:clip_id>')
+def get_catalog_clip(clip_id):
+    """One catalogued clip with its full transcript"""
+    clip = clip_catalog.get_clip(clip_id)
+    if clip is None:
+        return jsonify({'error': 'Clip not found'}), 404
+    clip['preview_url'] = _video_preview_url(clip.get('file_path') or '')
+    clip['previews'] = _clip_previews(clip)
+    return jsonify(clip)
+
+@app.route('/api/jobs')
+def list_catalog_jobs():
+    """Recent processing jobs from the catalog: ?status=&limit="""
+    return jsonify({'jobs': clip_catalog.list_jobs(status=request.args.get('status') or None,
+                                                   limit=request.args.get('limit', 50, type=int))})
+
+def _record_upload(clip, youtube_id=None, error=None):
+    """Store an upload outcome for a workflow clip in the catalog."""
+    if clip.get('catalog_id') is None:
+        return
+    try:
+        clip_catalog.record_upload(clip['catalog_id'], youtube_id=youtube_id, error=error)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not record upload of clip {clip['catalog_id']}: {e}")
+
 @app.route('/api/upload_to_youtube', methods=['POST'])
 def upload_to_youtube():
     """Step 5: Upload clips to YouTube (real upload if configured)"""
@@ -268,12 +577,34 @@ def upload_to_youtube():
     
     if not workflow_state['clips']:
         return jsonify({'success': False, 'message': 'No clips available for upload'}), 400
+    if _job_running():
+        return jsonify({'success': False, 'message': 'A job is already running'}), 409
     
     # Start upload process
+    job_id = uuid.uuid4().hex[:12]
+    tracer = _job_tracer(job_id, 'upload', data.get('trace'))
+    profile = bool(data.get('profile'))
+    workflow_state['upload_job_id'] = job_id
     workflow_state['processing_status'] = 'uploading'
     workflow_state['upload_results'] = {}
+    workflow_state['progress'] = 0
+    workflow_state['eta_seconds'] = None
+    cancel_token = CancellationToken()
+    job_tokens[job_id] = cancel_token
+    job_events.publish(job_id, 'status', _upload_snapshot())
+    # This job's state; a reset swaps in a new dict, which the job then leaves alone
+    state = workflow_state
+    
+    def on_upload_progress(snapshot):
+        state['progress'] = snapshot['progress']
+        state['eta_seconds'] = snapshot['eta_seconds']
+        job_events.publish(job_id, 'status', _upload_snapshot(state))
+    
+    tracker = ProgressTracker({'upload': 1.0}, callback=on_upload_progress)
     
     def upload_in_background():
+        started = time.monotonic()
+        profiler = Profiler(f"upload {job_id}").start() if profile else None
         try:
             logger.info("Starting YouTube upload...")
             youtube = None
@@ -281,60 +612,89 @@ def upload_to_youtube():
                 youtube = clip_uploader.youtube_auth()
             except Exception as e:
                 logger.error(f"YouTube auth failed: {e}")
-                workflow_state['error_message'] = f"YouTube auth failed: {e}"
+                state['error_message'] = f"YouTube auth failed: {e}"
                 # We'll mark as error and stop
-                workflow_state['processing_status'] = 'upload_error'
+                state['processing_status'] = 'upload_error'
+                job_tokens.pop(job_id, None)
+                _write_profile(job_id, profiler)
+                _record_job_metrics('upload', 'error', time.monotonic() - started, "YouTube upload failed",
+                                    state)
+                job_events.publish(job_id, 'status', _upload_snapshot(state))
                 return
             
             # Process each selected clip
-            for clip_id in selected_clips:
-                if clip_id < len(workflow_state['clips']):
-                    clip = workflow_state['clips'][clip_id]
+            for position, clip_id in enumerate(selected_clips):
+                cancel_token.raise_if_cancelled()
+                if clip_id < len(state['clips']):
+                    clip = state['clips'][clip_id]
                     file_path = clip.get('file_path')
                     title = clip.get('title') or f"Clip {clip_id+1}"
                     description = clip.get('description') or ''
                     tags = clip.get('tags') or []
+                    def on_chunk(fraction, clip_id=clip_id, position=position):
+                        job_events.publish(job_id, 'upload', {'clip_id': clip_id, 'progress': round(fraction * 100, 1)})
+                        tracker.update('upload', (position + fraction) / len(selected_clips))
                     try:
-                        resp = clip_uploader.youtube_upload(youtube, file_path, title, description, tags)
+                        with metrics.time('stage.upload'), activate(tracer), \
+                                span('youtube_upload', clip=clip_id, file=file_path):
+                            resp = clip_uploader.youtube_upload(youtube, file_path, title, description, tags,
+                                                                progress_callback=on_chunk,
+                                                                cancel_token=cancel_token)
                         vid = resp.get('id') if isinstance(resp, dict) else None
-                        workflow_state['upload_results'][clip_id] = {
+                        state['upload_results'][clip_id] = {
                             'success': True,
                             'youtube_id': vid or 'unknown',
                             'url': f'https://youtube.com/watch?v={vid}' if vid else ''
                         }
                         logger.info(f"Uploaded clip {clip_id} -> {vid}")
+                        metrics.increment('clips_uploaded')
+                        _record_upload(clip, youtube_id=vid)
+                    except JobCancelled:
+                        raise
                     except Exception as e:
                         err = f"Upload failed for clip {clip_id}: {e}"
                         logger.error(err)
-                        workflow_state['upload_results'][clip_id] = {
+                        metrics.increment('clips_failed')
+                        state['upload_results'][clip_id] = {
                             'success': False,
                             'error': str(e)
                         }
+                        _record_upload(clip, error=str(e))
+                    job_events.publish(job_id, 'upload_result',
+                                       dict(state['upload_results'][clip_id], clip_id=clip_id))
             
-            workflow_state['processing_status'] = 'upload_completed'
-            workflow_state['current_step'] = 6
+            state['processing_status'] = 'upload_completed'
+            state['progress'] = 100
+            state['current_step'] = 6
             logger.info("YouTube upload completed")
             
+        except JobCancelled as e:
+            logger.warning(f"YouTube upload cancelled: {e}")
+            state['processing_status'] = 'cancelled'
+            state['error_message'] = str(e)
         except Exception as e:
             logger.error(f"YouTube upload failed: {str(e)}")
-            workflow_state['processing_status'] = 'upload_error'
-            workflow_state['error_message'] = str(e)
+            state['processing_status'] = 'upload_error'
+            state['error_message'] = str(e)
+        job_tokens.pop(job_id, None)
+        _write_trace(job_id, tracer)
+        _write_profile(job_id, profiler)
+        uploaded = sum(1 for r in state['upload_results'].values() if r.get('success'))
+        _record_job_metrics('upload', state['processing_status'], time.monotonic() - started,
+                            f"{uploaded} of {len(selected_clips)} clips uploaded to YouTube", state)
+        job_events.publish(job_id, 'status', _upload_snapshot(state))
     
     # Start background upload
     thread = threading.Thread(target=upload_in_background)
     thread.daemon = True
     thread.start()
     
-    return jsonify({'success': True, 'message': 'YouTube upload started'})
+    return jsonify(_job_started('YouTube upload started', job_id, tracer, profile))
 
 @app.route('/api/upload_status')
 def upload_status():
     """Get upload status"""
-    return jsonify({
-        'status': workflow_state['processing_status'],
-        'results': workflow_state['upload_results'],
-        'error_message': workflow_state['error_message']
-    })
+    return jsonify(dict(_upload_snapshot(), job_id=workflow_state.get('upload_job_id', '')))
 
 @app.route('/api/workflow_state')
 def get_workflow_state():
@@ -345,6 +705,9 @@ def get_workflow_state():
 def reset_workflow():
     """Reset workflow to start over"""
     global workflow_state
+    # Stop running jobs instead of orphaning their threads and child processes
+    for token in list(job_tokens.values()):
+        token.cancel('Workflow reset')
     workflow_state = {
         'current_step': 1,
         'youtube_channel': '',
@@ -352,30 +715,81 @@ def reset_workflow():
         'processing_status': 'idle',
         'clips': [],
         'progress': 0,
+        'stage': '',
+        'eta_seconds': None,
         'error_message': '',
-        'upload_results': {}
+        'upload_results': {},
+        'job_id': '',
+        'upload_job_id': ''
     }
     return jsonify({'success': True})
 
 @app.route('/static/<path:filename>')
 def static_files(filename):
     """Serve static files"""
-    return send_from_directory('website', filename)
+    return serve_asset_or_404(static_assets, filename)
 
 @app.route('/css/<path:filename>')
 def css_files(filename):
     """Serve CSS files"""
-    return send_from_directory('website/css', filename)
+    return serve_asset_or_404(static_assets, f'css/{filename}')
 
 @app.route('/js/<path:filename>')
 def js_files(filename):
     """Serve JS files"""
-    return send_from_directory('website/js', filename)
+    return serve_asset_or_404(static_assets, f'js/{filename}')
 
 @app.route('/videos/<path:filename>')
 def video_files(filename):
-    """Serve video files"""
-    return send_from_directory('videos', filename)
+    """Serve video files with Range, ETag/Last-Modified and 304 support.
+    Requests carrying the file's current version (?v=) may be cached forever;
+    all others are revalidated, since clip file names are reused across jobs."""
+    path = safe_join(VIDEO_ROOT, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    version = _file_version(path)
+    versioned = request.args.get('v') == version
+    response = send_from_directory(VIDEO_ROOT, filename, conditional=True, etag=version,
+                                   max_age=VIDEO_CACHE_MAX_AGE if versioned else None)
+    if versioned:
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+def _file_version(path):
+    """Strong validator for a file: changes whenever it is rewritten."""
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}-{st.st_ino:x}"
+
+def _clip_previews(clip):
+    """Proxy/poster/sprite URLs and sprite layout for a clip, if previews exist."""
+    previews = clip.get('previews')
+    file_path = clip.get('file_path', '')
+    if not previews and file_path and os.path.isfile(file_path):
+        previews = load_cached_previews(clip_uploader.PREVIEW_DIR, clip_fingerprint(file_path))
+    if not previews:
+        return None
+    urls = {f'{kind}_url': _video_preview_url(previews.get(kind, '')) for kind in ('proxy', 'poster', 'sprite')}
+    if not all(urls.values()):
+        return None
+    layout = {k: previews[k] for k in ('sprite_columns', 'sprite_rows', 'sprite_frames', 'sprite_interval') if k in previews}
+    return dict(urls, **layout)
+
+def _video_preview_url(file_path: str):
+    """Versioned /videos URL for a clip file, or None if it is not servable."""
+    if not file_path or not os.path.isfile(file_path):
+        return None
+    try:
+        rel = Path(file_path).resolve().relative_to(Path(VIDEO_ROOT).resolve())
+    except ValueError:
+        return None
+    return url_for('video_files', filename=rel.as_posix(), v=_file_version(file_path))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint (text exposition format)"""
+    return Response(metrics.to_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.errorhandler(404)
 def not_found(error):
@@ -396,60 +810,76 @@ def get_youtube_api_key():
     return os.environ.get('YOUTUBE_API_KEY')
 
 def _http_get_json(url: str):
-    try:
-        req = Request(url, headers={'User-Agent': 'Mozilla/5.0 (AutomationWithIrtza/1.0)'} )
-        with urlopen(req, timeout=10) as resp:
-            data = resp.read().decode('utf-8')
-            return json.loads(data)
-    except (HTTPError, URLError, TimeoutError) as e:
-        logger.error(f"YouTube API HTTP error: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"YouTube API parse error: {e}")
-        return None
+    """GET a YouTube Data API URL through the response cache (see YouTubeDataClient.get_json)."""
+    return youtube_data.get_json(url)
+
+def _channel_lookup_key(channel_url: str):
+    """Classify a channel URL as (kind, value): handle, user or custom path."""
+    if '@' in channel_url:
+        return 'handle', channel_url.split('@')[1].split('/')[0].split('?')[0]
+    if '/user/' in channel_url:
+        return 'user', channel_url.split('/user/')[1].split('/')[0]
+    # As last resort, use the URL path (/c/name or /name) as query
+    path = urlparse(channel_url).path.strip('/')
+    if path:
+        return 'custom', path.replace('@', '').split('/')[-1]
+    return None
 
 def parse_channel_id_from_url(channel_url: str):
     """Best-effort parse of channel ID. Supports /channel/ID and @handle and /user/NAME.
-    For @handle and user, falls back to search API to resolve channelId."""
+    Handles and usernames are resolved with channels.list (1 unit) before falling
+    back to the search API (100 units); results, including "not found", are kept
+    in the persistent channel ID cache."""
     if not channel_url:
         return None
 
+    # Extract after youtube.com/
+    if 'channel/' in channel_url:
+        return channel_url.split('channel/')[1].split('/')[0]
+
+    lookup = _channel_lookup_key(channel_url)
+    if not lookup:
+        return None
+    kind, value = lookup
+    cache_key = ChannelIdCache.make_key(kind, value)
+    found, channel_id = channel_id_cache.get(cache_key)
+    if found:
+        return channel_id
+
     try:
-        # Extract after youtube.com/
-        if 'channel/' in channel_url:
-            return channel_url.split('channel/')[1].split('/')[0]
-        if '@' in channel_url:
-            handle = channel_url.split('@')[1].split('/')[0]
-            return resolve_channel_id_by_search(handle)
-        if '/user/' in channel_url:
-            username = channel_url.split('/user/')[1].split('/')[0]
-            # Try forUsername first (legacy)
-            api_key = get_youtube_api_key()
-            if not api_key:
-                return None
-            url = 'https://www.googleapis.com/youtube/v3/channels?' + urlencode({
-                'part': 'id',
-                'forUsername': username,
-                'key': api_key
-            })
-            data = _http_get_json(url)
-            if data and data.get('items'):
-                return data['items'][0]['id']
-            # Fallback to search
-            return resolve_channel_id_by_search(username)
-    except Exception:
-        pass
-    
-    # As last resort, try to use the URL path as query
-    path = urlparse(channel_url).path.strip('/')
-    if path:
-        return resolve_channel_id_by_search(path.replace('@',''))
-    return None
+        channel_id, definitive = _resolve_channel_id(kind, value)
+    except (KeyError, IndexError, TypeError) as e:
+        logger.error(f"Unexpected channel lookup response for {cache_key}: {e}")
+        return None
+    # Only cache answers from YouTube, never transport errors or a missing key
+    if channel_id or definitive:
+        channel_id_cache.put(cache_key, channel_id)
+        logger.info(f"Resolved {cache_key} -> {channel_id}")
+    return channel_id
 
-def resolve_channel_id_by_search(query: str):
+def _resolve_channel_id(kind: str, value: str):
+    """Resolve a handle/username/custom name via the API. Returns (channel_id, definitive)."""
     api_key = get_youtube_api_key()
     if not api_key:
-        return None
+        return None, False
+    lookup_param = {'handle': 'forHandle', 'user': 'forUsername'}.get(kind)
+    if lookup_param:
+        url = 'https://www.googleapis.com/youtube/v3/channels?' + urlencode({
+            'part': 'id',
+            lookup_param: f'@{value}' if kind == 'handle' else value,
+            'key': api_key
+        })
+        data = _http_get_json(url)
+        if data and data.get('items'):
+            return data['items'][0]['id'], True
+    # Fallback to search
+    return _search_channel_id(value.replace('@', ''))
+
+def _search_channel_id(query: str):
+    """Find a channel ID with search.list. Returns (channel_id, definitive)."""
+    api_key = get_youtube_api_key()
+    if not api_key:
+        return None, False
     url = 'https://www.googleapis.com/youtube/v3/search?' + urlencode({
         'part': 'snippet',
         'type': 'channel',
@@ -458,35 +888,22 @@ def resolve_channel_id_by_search(query: str):
         'key': api_key
     })
     data = _http_get_json(url)
-    if data and data.get('items'):
-        return data['items'][0]['snippet']['channelId'] if 'channelId' in data['items'][0]['snippet'] else data['items'][0]['id'].get('channelId')
-    return None
+    if data is None:
+        return None, False
+    if data.get('items'):
+        return data['items'][0]['snippet']['channelId'] if 'channelId' in data['items'][0]['snippet'] else data['items'][0]['id'].get('channelId'), True
+    return None, True
 
-def parse_iso8601_duration(duration: str) -> float:
-    """Parse ISO8601 duration like PT1M5S to seconds."""
-    if not duration or not duration.startswith('P'):
-        return 0.0
-    hours = minutes = seconds = 0
-    match_h = re.search(r"(\d+)H", duration)
-    match_m = re.search(r"(\d+)M", duration)
-    match_s = re.search(r"(\d+)S", duration)
-    if match_h:
-        hours = int(match_h.group(1))
-    if match_m:
-        minutes = int(match_m.group(1))
-    if match_s:
-        seconds = int(match_s.group(1))
-    return hours*3600 + minutes*60 + seconds
+def resolve_channel_id_by_search(query: str):
+    return _search_channel_id(query)[0]
 
-@app.route('/api/youtube/channel_info')
-def api_youtube_channel_info():
-    channel_url = request.args.get('channel_url', '')
-    api_key = get_youtube_api_key()
-    if not api_key:
-        return jsonify({'success': False, 'message': 'Server is missing YOUTUBE_API_KEY'}), 500
-    channel_id = parse_channel_id_from_url(channel_url)
-    if not channel_id:
-        return jsonify({'success': False, 'message': 'Unable to resolve channel from URL'}), 400
+@app.route('/api/youtube/cache_stats')
+def api_youtube_cache_stats():
+    """Report YouTube API cache hit ratio and quota units saved"""
+    return jsonify({'success': True, 'cache': youtube_cache.stats(), 'http': youtube_http.stats()})
+
+def fetch_channel_info(channel_id: str, api_key: str):
+    """Fetch channel snippet and statistics. Returns (payload, http_status)."""
     url = 'https://www.googleapis.com/youtube/v3/channels?' + urlencode({
         'part': 'snippet,statistics',
         'id': channel_id,
@@ -494,11 +911,11 @@ def api_youtube_channel_info():
     })
     data = _http_get_json(url)
     if not data or not data.get('items'):
-        return jsonify({'success': False, 'message': 'No data returned from YouTube'}), 502
+        return {'success': False, 'message': 'No data returned from YouTube'}, 502
     item = data['items'][0]
     snippet = item.get('snippet', {})
     statistics = item.get('statistics', {})
-    return jsonify({
+    return {
         'success': True,
         'channelId': channel_id,
         'title': snippet.get('title'),
@@ -506,81 +923,93 @@ def api_youtube_channel_info():
         'customUrl': snippet.get('customUrl'),
         'thumbnails': snippet.get('thumbnails', {}),
         'statistics': statistics
-    })
+    }, 200
 
-@app.route('/api/youtube/latest_videos')
-def api_youtube_latest_videos():
+LATEST_VIDEOS_MAX_TOTAL = 500
+
+def fetch_latest_videos(channel_id: str, api_key: str, page_size: int = 15, total: int = 15,
+                        page_token: str = None):
+    """Fetch the channel's latest videos with durations. Returns (payload, http_status)."""
+    total = max(1, min(int(total), LATEST_VIDEOS_MAX_TOTAL))
+    return youtube_data.latest_videos(channel_id, api_key, page_size=page_size, total=total,
+                                      page_token=page_token)
+
+def _latest_videos_params():
+    """Read page_size, max_results and page_token from the query string."""
+    return {
+        'page_size': request.args.get('page_size', default=15, type=int),
+        'total': request.args.get('max_results', default=15, type=int),
+        'page_token': request.args.get('page_token') or None
+    }
+
+def _resolve_channel_request():
+    """Resolve API key and channel ID for a /api/youtube/* request.
+    Returns (api_key, channel_id, error_response)."""
     channel_url = request.args.get('channel_url', '')
     api_key = get_youtube_api_key()
     if not api_key:
-        return jsonify({'success': False, 'message': 'Server is missing YOUTUBE_API_KEY'}), 500
+        return None, None, (jsonify({'success': False, 'message': 'Server is missing YOUTUBE_API_KEY'}), 500)
     channel_id = parse_channel_id_from_url(channel_url)
     if not channel_id:
-        return jsonify({'success': False, 'message': 'Unable to resolve channel from URL'}), 400
+        return None, None, (jsonify({'success': False, 'message': 'Unable to resolve channel from URL'}), 400)
+    return api_key, channel_id, None
 
-    # Step 1: get latest video IDs from the channel
-    search_url = 'https://www.googleapis.com/youtube/v3/search?' + urlencode({
-        'part': 'snippet',
-        'channelId': channel_id,
-        'order': 'date',
-        'type': 'video',
-        'maxResults': 15,
-        'key': api_key
-    })
-    search_data = _http_get_json(search_url)
-    if not search_data:
-        return jsonify({'success': False, 'message': 'Search failed'}), 502
-
-    items = search_data.get('items', [])
-    video_ids = []
-    snippet_map = {}
-    for it in items:
-        vid = it.get('id', {}).get('videoId')
-        sn = it.get('snippet', {})
-        if vid:
-            video_ids.append(vid)
-            snippet_map[vid] = sn
-
-    if not video_ids:
-        return jsonify({'success': True, 'videos': []})
-
-    # Step 2: get durations and more details
-    videos_url = 'https://www.googleapis.com/youtube/v3/videos?' + urlencode({
-        'part': 'contentDetails,snippet',
-        'id': ','.join(video_ids),
-        'key': api_key
+@app.route('/api/youtube/channel_info')
+def api_youtube_channel_info():
+    api_key, channel_id, error = _resolve_channel_request()
+    if error:
+        return error
+    payload, status = fetch_channel_info(channel_id, api_key)
+    return jsonify(payload), status
+
+@app.route('/api/youtube/latest_videos')
+def api_youtube_latest_videos():
+    api_key, channel_id, error = _resolve_channel_request()
+    if error:
+        return error
+    payload, status = fetch_latest_videos(channel_id, api_key, **_latest_videos_params())
+    return jsonify(payload), status
+
+@app.route('/api/youtube/channel_overview')
+def api_youtube_channel_overview():
+    """Channel info and latest videos in one call, fetched concurrently"""
+    api_key, channel_id, error = _resolve_channel_request()
+    if error:
+        return error
+    params = _latest_videos_params()
+    results = fan_out(youtube_executor, {
+        'channel': lambda: fetch_channel_info(channel_id, api_key),
+        'latest': lambda: fetch_latest_videos(channel_id, api_key, **params),
     })
-    videos_data = _http_get_json(videos_url)
-    if not videos_data:
-        return jsonify({'success': False, 'message': 'Videos fetch failed'}), 502
-
-    videos = []
-    for item in videos_data.get('items', []):
-        vid = item.get('id')
-        sn = item.get('snippet', {})
-        cd = item.get('contentDetails', {})
-        duration_s = parse_iso8601_duration(cd.get('duration',''))
-        # Treat as short if <= 90 seconds
-        is_short = duration_s <= 90
-        thumb = None
-        thumbs = sn.get('thumbnails', {})
-        # pick best available
-        for key in ['medium','high','default']:
-            if key in thumbs:
-                thumb = thumbs[key]['url']
-                break
-        videos.append({
-            'id': vid,
-            'title': sn.get('title') or (snippet_map.get(vid, {}).get('title')),
-            'publishedAt': sn.get('publishedAt') or (snippet_map.get(vid, {}).get('publishedAt')),
-            'thumbnail': thumb,
-            'durationSeconds': duration_s,
-            'isShort': is_short
-        })
+    channel, channel_status = results['channel']
+    latest, latest_status = results['latest']
+    status = max(channel_status, latest_status)
+    return jsonify({
+        'success': channel['success'] and latest['success'],
+        'channel': channel,
+        'videos': latest.get('videos', []),
+        'nextPageToken': latest.get('nextPageToken'),
+        'message': channel.get('message') or latest.get('message', '')
+    }), status
 
-    # Prioritize shorts at the top
-    videos.sort(key=lambda v: (not v['isShort'], v.get('publishedAt','')), reverse=False)
-    return jsonify({'success': True, 'videos': videos})
+@app.route('/api/youtube/channel_index')
+def api_youtube_channel_index():
+    """Indexed uploads of a channel; pass sync=1 to refresh the index first"""
+    api_key, channel_id, error = _resolve_channel_request()
+    if error:
+        return error
+    new_videos = []
+    if request.args.get('sync') in ('1', 'true'):
+        new_videos = automation_framework.channel_index.sync_channel(youtube_data, channel_id, api_key)
+        if new_videos is None:
+            return jsonify({'success': False, 'message': 'Channel sync failed'}), 502
+    return jsonify({
+        'success': True,
+        'channelId': channel_id,
+        'newVideos': len(new_videos),
+        'videos': automation_framework.channel_index.videos(channel_id),
+        'status': automation_framework.channel_index.status().get(channel_id)
+    })
 
 # Vercel handler - this is what Vercel will call
 def handler(event, context):
@@ -598,5 +1027,9 @@ if __name__ == '__main__':
     Path('videos/tmp').mkdir(parents=True, exist_ok=True)
     Path('logs').mkdir(exist_ok=True)
     
+    # With the debug reloader, only the serving child process runs the background services
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
+    
     # Run the application
     app.run(debug=True, host='0.0.0.0', port=5000)
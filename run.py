@@ -141,7 +141,10 @@ def main():
     
     try:
         # Import the Flask app
-        from app import app
+        from app import app, start_background_services
+        
+        # Scheduled tasks and the configuration watcher
+        start_background_services()
         
         # Run the application
         app.run(debug=False, host='0.0.0.0', port=5000)
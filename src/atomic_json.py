@@ -0,0 +1,45 @@
+"""
+Atomic JSON file module.
+
+This module reads and writes the small JSON state files kept under cache/
+(channel IDs, the channel index, cached API responses, schedule state).
+Writes go to a uniquely named temporary file in the target directory that
+is then renamed over the target. Readers therefore never see a truncated
+file, and concurrent writers never write into the same temporary file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+
+def load_json(path: Union[str, Path], default: Any, logger: logging.Logger, description: str) -> Any:
+    """Parsed contents of path; default if it is missing, or (with a warning) unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable {description} {path}: {e}")
+        return default
+
+
+def save_json(path: Union[str, Path], data: Any, **dump_kwargs: Any) -> None:
+    """Write data as JSON atomically (dump_kwargs go to json.dump); raises OSError."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
@@ -26,11 +26,15 @@ import time
 import pickle
 import shutil
 import string
+import sqlite3
 import subprocess
 import logging
+import threading
+import uuid
 from pathlib import Path
 from collections import Counter
-from typing import List, Tuple, Dict, Any, Optional
+from contextlib import nullcontext
+from typing import List, Tuple, Dict, Any, Optional, Callable
 
 # 3rd-party libs (optional imports for graceful degradation)
 try:
@@ -56,6 +60,41 @@ try:
 except ImportError:
     YOUTUBE_API_AVAILABLE = False
 
+try:
+    from src.cancellation import CancellationToken, JobCancelled
+    from src.progress import (
+        ProgressTracker, DEFAULT_STAGE_WEIGHTS, format_progress,
+        parse_ffmpeg_progress_line, is_ffmpeg_progress_end
+    )
+    from src.previews import (
+        PREVIEW_DIR, clip_fingerprint, load_cached_previews, preview_paths,
+        build_preview_command, sprite_meta
+    )
+    from src.metrics import MetricsRegistry
+    from src.tracing import Tracer, span
+    from src.profiling import Profiler, child_finished, child_process, child_started
+    from src.batch import PipelineBudget
+    from src.janitor import acquire, mark_uploaded, release
+    from src.catalog import ClipCatalog
+except ImportError:  # executed directly as `python src/auto_clip_uploader.py`
+    from cancellation import CancellationToken, JobCancelled
+    from progress import (
+        ProgressTracker, DEFAULT_STAGE_WEIGHTS, format_progress,
+        parse_ffmpeg_progress_line, is_ffmpeg_progress_end
+    )
+    from previews import (
+        PREVIEW_DIR, clip_fingerprint, load_cached_previews, preview_paths,
+        build_preview_command, sprite_meta
+    )
+    from metrics import MetricsRegistry
+    from tracing import Tracer, span
+    from profiling import Profiler, child_finished, child_process, child_started
+    from batch import PipelineBudget
+    from janitor import acquire, mark_uploaded, release
+    from catalog import ClipCatalog
+
+_YTDLP_PERCENT = re.compile(r"\[download\]\s+(?P<pct>[0-9.]+)%")
+
 
 class AutoClipUploader:
     """Auto Clip Uploader class for automation framework integration."""
@@ -64,17 +103,74 @@ class AutoClipUploader:
     SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
     CLIP_DIR = Path("videos/clips")
     TMP_DIR = Path("videos/tmp")
+    PREVIEW_DIR = PREVIEW_DIR
     MAX_CLIPS_PER_RUN = 6
     WHISPER_MODEL = "tiny"
     SCENE_THRESHOLD = 0.4
     MIN_CLIP_SECONDS = 5
     MAX_CLIP_SECONDS = 180
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # must be a multiple of 256 KiB
+    UPLOAD_QUOTA_COST = 1600  # YouTube Data API units per videos.insert
+    # task_settings.clip_uploader keys and the attributes they set
+    SETTINGS = {
+        "max_clips": "MAX_CLIPS_PER_RUN",
+        "whisper_model": "WHISPER_MODEL",
+        "scene_threshold": "SCENE_THRESHOLD",
+        "min_clip_seconds": "MIN_CLIP_SECONDS",
+        "max_clip_seconds": "MAX_CLIP_SECONDS",
+    }
     
-    def __init__(self):
-        """Initialize the Auto Clip Uploader."""
+    def __init__(self, metrics: Optional[MetricsRegistry] = None, budget: Optional[PipelineBudget] = None,
+                 resident: bool = False, catalog: Optional[ClipCatalog] = None):
+        """Initialize the Auto Clip Uploader.
+        budget, if given, is shared with other uploaders to cap concurrent
+        downloads, ffmpeg encodes and transcriptions across jobs.
+        resident keeps the Whisper model and YouTube client loaded between
+        runs (for long-running processes such as the daemon).
+        catalog, if given, records each run, its clips and upload outcomes.
+        """
         self.logger = logging.getLogger(__name__)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.budget = budget
+        self.catalog = catalog
+        self.resident = resident
+        self._whisper_model = None
+        self._whisper_model_name = None
+        self._youtube = None
+        self._settings_lock = threading.Lock()
+        self._pending_settings = None
         self._check_dependencies()
     
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """
+        Take max_clips, whisper_model, scene_threshold and clip length limits from
+        task_settings.clip_uploader. They apply from the next process_video run,
+        so a running job keeps the values it started with.
+        """
+        with self._settings_lock:
+            self._pending_settings = dict(settings)
+    
+    def _apply_pending_settings(self) -> None:
+        with self._settings_lock:
+            settings, self._pending_settings = self._pending_settings, None
+        if not settings:
+            return
+        for key, attr in self.SETTINGS.items():
+            value = settings.get(key)
+            if value is not None and value != "auto" and value != getattr(self, attr):
+                self.logger.info(f"Using {key} = {value}")
+                setattr(self, attr, value)
+    
+    def _record(self, method: str, *args, **kwargs) -> Any:
+        """Call a catalog method; a catalog failure is logged, never fatal to the pipeline."""
+        if self.catalog is None:
+            return None
+        try:
+            return getattr(self.catalog, method)(*args, **kwargs)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Catalog {method} failed: {e}")
+            return None
+    
     def _check_dependencies(self) -> None:
         """Check if required dependencies are available."""
         missing_deps = []
@@ -118,12 +214,47 @@ class AutoClipUploader:
                 pickle.dump(creds, f)
         return build("youtube", "v3", credentials=creds)
     
-    def youtube_upload(self, youtube: Any, file_path: str, title: str, description: str, tags: List[str]) -> Dict:
-        """Upload video to YouTube."""
+    def load_whisper_model(self) -> Any:
+        """Load the Whisper model, reusing the resident one if there is one."""
+        if self.budget is not None:
+            # Shared budgets pool models per 'asr' slot (see _asr_model)
+            with span("whisper_load_model", model=self.WHISPER_MODEL):
+                model = whisper.load_model(self.WHISPER_MODEL)
+            self.metrics.adjust_gauge("whisper_models_resident", 1)
+            return model
+        if self._whisper_model is not None and self._whisper_model_name == self.WHISPER_MODEL:
+            return self._whisper_model
+        with span("whisper_load_model", model=self.WHISPER_MODEL):
+            model = whisper.load_model(self.WHISPER_MODEL)
+        self.metrics.adjust_gauge("whisper_models_resident", 1)
+        if self.resident:
+            if self._whisper_model is not None:
+                # The configured model changed; drop the old one
+                self.metrics.adjust_gauge("whisper_models_resident", -1)
+            self._whisper_model, self._whisper_model_name = model, self.WHISPER_MODEL
+        return model
+    
+    def youtube_service(self) -> Any:
+        """Authorized YouTube client, reusing the resident one if there is one."""
+        if self._youtube is not None:
+            return self._youtube
+        with span("youtube_auth"):
+            youtube = self.youtube_auth()
+        if self.resident:
+            self._youtube = youtube
+        return youtube
+    
+    def youtube_upload(self, youtube: Any, file_path: str, title: str, description: str, tags: List[str],
+                       progress_callback: Optional[Callable[[float], None]] = None,
+                       cancel_token: Optional[CancellationToken] = None) -> Dict:
+        """Upload video to YouTube.
+        progress_callback, if given, receives the uploaded fraction (0.0-1.0) after each chunk.
+        cancel_token is checked between chunks; a cancelled upload is abandoned.
+        """
         if not YOUTUBE_API_AVAILABLE:
             raise RuntimeError("YouTube API libraries not available")
         
-        media = MediaFileUpload(file_path, chunksize=-1, resumable=True)
+        media = MediaFileUpload(file_path, chunksize=self.UPLOAD_CHUNK_SIZE, resumable=True)
         body = {
             'snippet': {
                 'title': title[:100],
@@ -137,39 +268,106 @@ class AutoClipUploader:
         }
         req = youtube.videos().insert(part='snippet,status', body=body, media_body=media)
         resp = None
+        chunk = 0
         while resp is None:
-            status, resp = req.next_chunk()
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            with span("upload_chunk", chunk=chunk):
+                status, resp = req.next_chunk()
+            chunk += 1
             if status:
                 self.logger.info(f"Upload progress {int(status.progress() * 100)}%")
+                if progress_callback:
+                    progress_callback(status.progress())
+        if progress_callback:
+            progress_callback(1.0)
+        self.metrics.increment("youtube_quota_units", self.UPLOAD_QUOTA_COST, endpoint="videos.insert")
         self.logger.info(f"Upload finished, video id: {resp.get('id')}")
+        # Uploaded clips may now be evicted by the cleanup task
+        mark_uploaded(file_path, resp.get('id'))
         return resp
     
-    def prepare_input(self, url: str) -> str:
+    def _slot(self, kind: str):
+        """Hold a budget slot ('download', 'encode' or 'asr') if a budget is shared."""
+        return self.budget.slot(kind) if self.budget is not None else nullcontext()
+    
+    def _asr_model(self, model: Any):
+        """The run's Whisper model, or with a shared budget an 'asr' slot plus a pooled model."""
+        if self.budget is not None:
+            return self.budget.whisper_model(self.WHISPER_MODEL, self.load_whisper_model)
+        return nullcontext(model)
+    
+    @staticmethod
+    def is_youtube_url(url: str) -> bool:
+        """Check whether a URL needs to be fetched with yt-dlp."""
+        return 'youtube.com' in url or 'youtu.be' in url
+    
+    @staticmethod
+    def _spawn(cmd: List[str], cancel_token: Optional[CancellationToken] = None, **kwargs) -> subprocess.Popen:
+        """Start a child process, registering it with the cancellation token if given."""
+        if cancel_token is not None:
+            proc = cancel_token.popen(cmd, **kwargs)
+        else:
+            proc = subprocess.Popen(cmd, **kwargs)
+        child_started(proc)
+        return proc
+    
+    @staticmethod
+    def _finish(proc: subprocess.Popen, cmd: List[str], cancel_token: Optional[CancellationToken] = None,
+                check: bool = True) -> int:
+        """Wait for a child process, raising JobCancelled or CalledProcessError as appropriate."""
+        returncode = proc.wait()
+        child_finished(proc, cmd)
+        if cancel_token is not None:
+            cancel_token.release(proc)
+            cancel_token.raise_if_cancelled()
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+        return returncode
+    
+    def _run_yt_dlp(self, args: List[str], progress_callback: Optional[Callable[[float], None]] = None,
+                    cancel_token: Optional[CancellationToken] = None) -> None:
+        """Run yt-dlp, forwarding its download percentage to progress_callback."""
+        cmd = ['yt-dlp', '--newline'] + args
+        proc = self._spawn(cmd, cancel_token, stdout=subprocess.PIPE, text=True)
+        for line in proc.stdout:
+            m = _YTDLP_PERCENT.search(line)
+            if m and progress_callback:
+                progress_callback(float(m.group('pct')) / 100)
+        self._finish(proc, cmd, cancel_token)
+    
+    def prepare_input(self, url: str, progress_callback: Optional[Callable[[float], None]] = None,
+                      cancel_token: Optional[CancellationToken] = None, tmp_dir: Optional[Path] = None,
+                      stem: str = "source") -> str:
         """Prepare an input source for ffmpeg.
-        - If the url is a YouTube link, try to download using yt-dlp to a temp file and return its path.
+        - If the url is a YouTube link, try to download using yt-dlp to <stem>.<ext> in tmp_dir
+          (default TMP_DIR) and return its path.
         - Otherwise return the original URL/path.
         """
-        if 'youtube.com' in url or 'youtu.be' in url:
+        tmp_dir = Path(tmp_dir) if tmp_dir else self.TMP_DIR
+        if self.is_youtube_url(url):
             self.logger.info("Detected YouTube URL; attempting to fetch with yt-dlp")
-            self.TMP_DIR.mkdir(parents=True, exist_ok=True)
-            out_tpl = str(self.TMP_DIR / 'source.%(ext)s')
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            out_tpl = str(tmp_dir / f'{stem}.%(ext)s')
             try:
-                subprocess.run(['yt-dlp', '-f', 'mp4', '-o', out_tpl, url], check=True)
+                self._run_yt_dlp(['-f', 'mp4', '-o', out_tpl, url], progress_callback, cancel_token)
             except (subprocess.CalledProcessError, FileNotFoundError):
                 # Try with best format if mp4 not available or yt-dlp missing
                 try:
-                    subprocess.run(['yt-dlp', '-o', out_tpl, url], check=True)
+                    self._run_yt_dlp(['-o', out_tpl, url], progress_callback, cancel_token)
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     self.logger.error(f"yt-dlp failed or not installed: {e}")
                     raise RuntimeError("yt-dlp is required to process YouTube URLs. Install with: pip install yt-dlp")
             # Find the downloaded file
             for ext in ['mp4', 'mkv', 'webm']:
-                candidate = self.TMP_DIR / f'source.{ext}'
+                candidate = tmp_dir / f'{stem}.{ext}'
                 if candidate.exists():
                     self.logger.info(f"Using downloaded file: {candidate}")
                     return str(candidate)
-            # Fallback: pick the newest file in TMP_DIR
-            files = list(self.TMP_DIR.glob('source.*'))
+            # Fallback: pick the newest file in tmp_dir
+            files = list(tmp_dir.glob(f'{stem}.*'))
             if files:
                 latest = max(files, key=lambda p: p.stat().st_mtime)
                 self.logger.info(f"Using downloaded file: {latest}")
@@ -177,19 +375,46 @@ class AutoClipUploader:
             raise RuntimeError("Failed to locate downloaded video file from yt-dlp")
         return url
 
-    def run_ffmpeg_scene_detect(self, input_url: str, scene_threshold: float = None) -> List[float]:
+    def probe_duration(self, input_url: str) -> Optional[float]:
+        """Return the media duration in seconds using ffprobe, or None if unknown."""
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            input_url
+        ]
+        try:
+            with child_process(cmd):
+                out = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=60).stdout
+            duration = float(out.strip().splitlines()[0])
+            return duration if duration > 0 else None
+        except (subprocess.SubprocessError, FileNotFoundError, ValueError, IndexError) as e:
+            self.logger.debug(f"Could not probe duration of {input_url}: {e}")
+            return None
+    
+    def run_ffmpeg_scene_detect(self, input_url: str, scene_threshold: float = None,
+                                progress_callback: Optional[Callable[[float], None]] = None,
+                                duration: Optional[float] = None,
+                                cancel_token: Optional[CancellationToken] = None) -> List[float]:
         """
         Use ffmpeg's scene detection filter to produce timestamps where scene changes occur.
         Works with both local files and remote URLs.
         Returns list of timestamps (seconds) where scenes were detected.
+        progress_callback receives the fraction of the input analysed so far, measured
+        from ffmpeg's -progress out_time against the probed duration.
         """
         if scene_threshold is None:
             scene_threshold = self.SCENE_THRESHOLD
+        if progress_callback and duration is None:
+            duration = self.probe_duration(input_url)
         
         cmd = [
             "ffmpeg",
             "-hide_banner",
             "-loglevel", "info",
+            "-nostats",
+            "-progress", "pipe:2",
             "-i", input_url,
             "-vf", f"select=gt(scene\\,{scene_threshold}),showinfo",
             "-f", "null", "-"
@@ -197,49 +422,114 @@ class AutoClipUploader:
         self.logger.info("Running ffmpeg for scene detection (may take a while)")
         self.logger.debug(f"Command: {' '.join(cmd)}")
         
-        proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        proc = self._spawn(cmd, cancel_token, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
         scene_pts = []
         
+        # showinfo lines and -progress key=value lines share stderr
         for line in proc.stderr:
             m = re.search(r"pts_time:(?P<pts>[0-9]+\.?[0-9]*)", line)
             if m:
                 t = float(m.group('pts'))
                 scene_pts.append(t)
+                continue
+            if progress_callback:
+                out_time = parse_ffmpeg_progress_line(line)
+                if out_time is not None and duration:
+                    progress_callback(out_time / duration)
+                elif is_ffmpeg_progress_end(line):
+                    progress_callback(1.0)
         
-        proc.wait()
+        self._finish(proc, cmd, cancel_token, check=False)
         self.logger.info(f"Detected {len(scene_pts)} scene-change frames")
         return sorted(scene_pts)
     
-    def extract_clip_stream(self, input_url: str, start: float, end: float, out_path: Path) -> Path:
+    def extract_clip_stream(self, input_url: str, start: float, end: float, out_path: Path,
+                            progress_callback: Optional[Callable[[float], None]] = None,
+                            cancel_token: Optional[CancellationToken] = None) -> Path:
         """
         Extract a clip by streaming just the needed portion using ffmpeg seek and duration flags.
+        An existing out_path is overwritten.
         """
         dur = max(0.1, end - start)
         out_path.parent.mkdir(parents=True, exist_ok=True)
         
         cmd = [
             "ffmpeg",
+            "-y",
             "-hide_banner",
+            "-nostats",
+            "-progress", "pipe:1",
             "-ss", str(start),
             "-i", input_url,
             "-t", str(dur),
             "-c", "copy",
+            # Move the moov atom to the front so previews start playing right away
+            "-movflags", "+faststart",
             str(out_path)
         ]
         self.logger.info(f"Extracting clip: {start:.2f}s - {end:.2f}s -> {out_path.name}")
-        subprocess.run(cmd, check=True)
+        proc = self._spawn(cmd, cancel_token, stdout=subprocess.PIPE, text=True)
+        for line in proc.stdout:
+            out_time = parse_ffmpeg_progress_line(line)
+            if out_time is not None and progress_callback:
+                progress_callback(out_time / dur)
+        self._finish(proc, cmd, cancel_token)
+        if progress_callback:
+            progress_callback(1.0)
         return out_path
     
-    def transcribe_whisper(self, model: Any, file_path: str) -> str:
-        """Transcribe audio using Whisper."""
+    def generate_previews(self, clip_path: str, duration: float,
+                          cancel_token: Optional[CancellationToken] = None) -> Optional[Dict[str, Any]]:
+        """
+        Make a proxy rendition, poster frame and sprite sheet for a clip in one ffmpeg decode.
+        Previews are cached by clip fingerprint; returns None if ffmpeg fails.
+        """
+        fingerprint = clip_fingerprint(clip_path)
+        cached = load_cached_previews(self.PREVIEW_DIR, fingerprint)
+        if cached:
+            self.logger.info(f"Using cached previews for {Path(clip_path).name}")
+            return cached
+        
+        final_dir = preview_paths(self.PREVIEW_DIR, fingerprint)["meta"].parent
+        tmp_dir = final_dir.with_name(fingerprint + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        cmd = build_preview_command(clip_path, tmp_dir, duration)
+        self.logger.info(f"Generating previews: {Path(clip_path).name} -> {final_dir}")
+        try:
+            proc = self._spawn(cmd, cancel_token)
+            self._finish(proc, cmd, cancel_token)
+            with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(dict(sprite_meta(duration), fingerprint=fingerprint), f)
+            # Publish the finished set in one rename so readers never see partial previews
+            shutil.rmtree(final_dir, ignore_errors=True)
+            tmp_dir.replace(final_dir)
+        except JobCancelled:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        except (subprocess.CalledProcessError, OSError) as e:
+            self.logger.warning(f"Preview generation failed for {clip_path}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+        return load_cached_previews(self.PREVIEW_DIR, fingerprint)
+    
+    def transcribe_whisper(self, model: Any, file_path: str,
+                           cancel_token: Optional[CancellationToken] = None) -> str:
+        """Transcribe audio using Whisper.
+        A running model.transcribe() call cannot be interrupted, so the
+        cancel_token is checked before and after it (clips are short).
+        """
         if not WHISPER_AVAILABLE:
             self.logger.warning("Whisper not available, skipping transcription")
             return ""
         
         self.logger.info(f"Transcribing: {file_path}")
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
         res = model.transcribe(file_path)
-        text = res.get('text', '').strip()
-        return text
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        return res.get('text', '').strip()
     
     def generate_metadata_from_transcript(self, transcript: str) -> Tuple[str, str, List[str]]:
         """Generate title, description and tags from transcript using TF-IDF."""
@@ -331,139 +621,302 @@ class AutoClipUploader:
         
         return ranges[:max_clips]
     
-    def process_video(self, url: str, dry_run: bool = False) -> Dict[str, Any]:
+    def process_video(self, url: str, dry_run: bool = False,
+                      on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                      cancel_token: Optional[CancellationToken] = None,
+                      tracer: Optional[Tracer] = None, job_id: Optional[str] = None,
+                      clip_dir: Optional[Path] = None, tmp_dir: Optional[Path] = None) -> Dict[str, Any]:
         """
         Main pipeline to process a video URL and create/upload clips.
         
         Args:
             url: Video URL to process
             dry_run: If True, don't upload to YouTube, just create clips
+            on_event: Optional callback receiving (event, data) for stage changes
+                and per-clip results as they happen
+            cancel_token: Optional token; cancelling it kills running ffmpeg/yt-dlp
+                processes, stops the pipeline and removes this run's artifacts
+            tracer: Optional tracer; the run and each stage of each clip are
+                recorded as nested spans (see Tracer.write for the output)
+            job_id: Catalog id for this run (a new one is generated if omitted)
+            clip_dir, tmp_dir: Output and download directories for this run
+                (default CLIP_DIR and TMP_DIR), so concurrent runs can share an uploader
         
         Returns:
             Dict with processing results
         """
-        self.CLIP_DIR.mkdir(parents=True, exist_ok=True)
-        self.TMP_DIR.mkdir(parents=True, exist_ok=True)
+        if tracer is not None:
+            with tracer.activate(), tracer.span("process_video", url=url, dry_run=dry_run) as attrs:
+                results = self.process_video(url, dry_run, on_event, cancel_token, job_id=job_id,
+                                             clip_dir=clip_dir, tmp_dir=tmp_dir)
+                attrs.update(clips_created=results["clips_created"], clips_uploaded=results["clips_uploaded"],
+                             cancelled=results["cancelled"])
+                return results
         
+        self._apply_pending_settings()
+        
+        def emit(event: str, data: Dict[str, Any]) -> None:
+            if on_event:
+                try:
+                    on_event(event, data)
+                except Exception as e:
+                    self.logger.warning(f"Event callback failed: {e}")
+        
+        # Weighted overall progress, reported as "progress" events
+        weights = dict(DEFAULT_STAGE_WEIGHTS)
+        if not self.is_youtube_url(url):
+            del weights["prepare"]
+        if dry_run:
+            del weights["upload"]
+        if dry_run or not WHISPER_AVAILABLE:
+            del weights["transcribe"]
+        tracker = ProgressTracker(weights, callback=lambda snap: emit("progress", snap))
+        
+        clip_dir = Path(clip_dir) if clip_dir else self.CLIP_DIR
+        tmp_dir = Path(tmp_dir) if tmp_dir else self.TMP_DIR
+        clip_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        # Keep the cleanup task away from this run's source and clips
+        in_use_markers = acquire([clip_dir, tmp_dir])
+        
+        job_id = job_id or uuid.uuid4().hex
+        self._record("start_job", job_id, url, dry_run=dry_run)
         results = {
+            "job_id": job_id,
             "url": url,
             "clips_created": 0,
             "clips_uploaded": 0,
             "errors": [],
-            "clips": []
+            "clips": [],
+            "cancelled": False,
+            # True when the run failed before making any clip, so it is safe to run again
+            "retryable": False
         }
+        # Files written by this run, removed again if the job is cancelled
+        artifacts = []
+        # The downloaded source, removed once the run is over
+        download = None
+        model = None
+        preparing = True
         
         try:
             # Step 1: Prepare input (download YouTube if needed) and detect scenes
             self.logger.info("1) Preparing input and detecting scene-change timestamps")
+            emit("stage", {"stage": "scene_detect"})
+            source = url
             try:
-                source = self.prepare_input(url)
-                scenes = self.run_ffmpeg_scene_detect(source)
+                # A per-job name, so cancelling never deletes another job's download
+                stem = f"source-{job_id}"
+                if self.is_youtube_url(url):
+                    download = tmp_dir / f"{stem}.*"
+                with self._slot("download"), self.metrics.time("stage.prepare"), span("prepare_input", url=url):
+                    source = self.prepare_input(url, progress_callback=lambda f: tracker.update("prepare", f),
+                                                cancel_token=cancel_token, tmp_dir=tmp_dir, stem=stem)
+                tracker.complete("prepare")
+                with self._slot("encode"), self.metrics.time("stage.scene_detect"), span("run_ffmpeg_scene_detect") as attrs:
+                    scenes = self.run_ffmpeg_scene_detect(
+                        source, progress_callback=lambda f: tracker.update("scene_detect", f),
+                        cancel_token=cancel_token)
+                    attrs["scenes"] = len(scenes)
             except subprocess.CalledProcessError as e:
                 self.logger.warning(f"ffmpeg scene detection failed: {e}")
                 scenes = []
+            tracker.complete("scene_detect")
             
             # Step 2: Select clip ranges
+            preparing = False
             self.logger.info("2) Selecting clip ranges")
             clip_ranges = self.select_clip_ranges(scenes, max_clips=self.MAX_CLIPS_PER_RUN)
             self.logger.info(f"Will extract {len(clip_ranges)} clips")
+            emit("stage", {"stage": "clips", "total_clips": len(clip_ranges)})
             
             # Step 3: Load Whisper model
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
             model = None
-            if WHISPER_AVAILABLE and not dry_run:
+            transcribe = WHISPER_AVAILABLE and not dry_run
+            if transcribe and self.budget is None:
                 self.logger.info("3) Loading Whisper model")
-                model = whisper.load_model(self.WHISPER_MODEL)
+                model = self.load_whisper_model()
             
             # Step 4: YouTube auth (if not dry run)
             youtube = None
             if not dry_run and YOUTUBE_API_AVAILABLE:
                 self.logger.info("4) Authorizing YouTube")
                 try:
-                    youtube = self.youtube_auth()
+                    youtube = self.youtube_service()
                 except Exception as e:
                     results["errors"].append(f"YouTube auth failed: {str(e)}")
                     dry_run = True  # Fall back to dry run
+            if not transcribe:
+                tracker.complete("transcribe")
+            if dry_run:
+                tracker.complete("upload")
             
             # Step 5: Process clips
             uploaded = 0
+            total = max(1, len(clip_ranges))
+            
+            def stage_progress(stage: str, idx: int) -> Callable[[float], None]:
+                # Map one clip's fraction onto the stage's share of all clips
+                return lambda f: tracker.update(stage, (idx + f) / total)
+            
             for idx, (s, e) in enumerate(clip_ranges):
                 clip_info = {"index": idx, "start": s, "end": e, "duration": e-s}
-                out_file = self.CLIP_DIR / f"clip_{idx:03d}.mp4"
+                out_file = clip_dir / f"clip_{idx:03d}.mp4"
                 
-                try:
-                    # Extract clip (use local source if we downloaded)
-                    input_for_extract = source if 'source.' in (locals().get('source','')) else url
-                    self.extract_clip_stream(input_for_extract, s, e, out_file)
-                    clip_info["file_path"] = str(out_file)
-                    clip_info["file_size"] = out_file.stat().st_size if out_file.exists() else 0
-                    results["clips_created"] += 1
+                with span("clip", clip=idx, start=s, end=e, duration=e - s) as clip_attrs:
+                    try:
+                        # Extract clip (from the local download if there is one)
+                        input_for_extract = source
+                        artifacts.append(out_file)
+                        with self._slot("encode"), self.metrics.time("stage.extract"), \
+                                span("extract_clip_stream", clip=idx, start=s, end=e):
+                            self.extract_clip_stream(input_for_extract, s, e, out_file,
+                                                     progress_callback=stage_progress("extract", idx),
+                                                     cancel_token=cancel_token)
+                        clip_info["file_path"] = str(out_file)
+                        clip_info["file_size"] = out_file.stat().st_size if out_file.exists() else 0
+                        results["clips_created"] += 1
+                        self.metrics.increment("clips_created")
+                    
+                        # Lightweight previews for the review step (cached ones belong to earlier runs)
+                        preview_dir = preview_paths(self.PREVIEW_DIR, clip_fingerprint(str(out_file)))["meta"].parent
+                        if not preview_dir.exists():
+                            artifacts.append(preview_dir)
+                        with self._slot("encode"), self.metrics.time("stage.previews"), span("generate_previews", clip=idx):
+                            previews = self.generate_previews(str(out_file), e - s, cancel_token=cancel_token)
+                        if previews:
+                            clip_info["previews"] = previews
                     
-                    # Transcribe if available
-                    transcript = ""
-                    if model:
-                        transcript = self.transcribe_whisper(model, str(out_file))
-                        clip_info["transcript"] = transcript
+                        # Transcribe if available
+                        transcript = ""
+                        if transcribe:
+                            with self._asr_model(model) as asr_model, self.metrics.time("stage.transcribe"), \
+                                    span("transcribe_whisper", clip=idx) as attrs:
+                                transcript = self.transcribe_whisper(asr_model, str(out_file), cancel_token=cancel_token)
+                                attrs["characters"] = len(transcript)
+                            clip_info["transcript"] = transcript
+                            stage_progress("transcribe", idx)(1.0)
                     
-                    # Generate metadata
-                    title, description, tags = self.generate_metadata_from_transcript(transcript)
-                    if not title:
-                        title = f"Clip from {Path(url).name} #{idx}"
+                        # Generate metadata
+                        with self.metrics.time("stage.metadata"), span("generate_metadata", clip=idx):
+                            title, description, tags = self.generate_metadata_from_transcript(transcript)
+                        if not title:
+                            title = f"Clip from {Path(url).name} #{idx}"
                     
-                    clip_info.update({
-                        "title": title,
-                        "description": description,
-                        "tags": tags
-                    })
+                        clip_info.update({
+                            "title": title,
+                            "description": description,
+                            "tags": tags
+                        })
                     
-                    self.logger.info(f"Generated title: {title}")
-                    self.logger.info(f"Generated tags: {tags[:5]}")
+                        self.logger.info(f"Generated title: {title}")
+                        self.logger.info(f"Generated tags: {tags[:5]}")
                     
-                    # Upload if not dry run
-                    if not dry_run and youtube:
-                        try:
-                            youtube_resp = self.youtube_upload(youtube, str(out_file), title, description, tags)
-                            clip_info["youtube_id"] = youtube_resp.get('id')
-                            clip_info["uploaded"] = True
-                            uploaded += 1
-                            results["clips_uploaded"] += 1
-                        except Exception as e:
-                            error_msg = f"Upload failed for clip {idx}: {str(e)}"
-                            self.logger.error(error_msg)
-                            results["errors"].append(error_msg)
+                        # Upload if not dry run
+                        if not dry_run and youtube:
+                            try:
+                                with self.metrics.time("stage.upload"), span("youtube_upload", clip=idx,
+                                                                              bytes=clip_info["file_size"]):
+                                    youtube_resp = self.youtube_upload(youtube, str(out_file), title, description, tags,
+                                                                       progress_callback=stage_progress("upload", idx),
+                                                                       cancel_token=cancel_token)
+                                clip_info["youtube_id"] = youtube_resp.get('id')
+                                clip_info["uploaded"] = True
+                                uploaded += 1
+                                results["clips_uploaded"] += 1
+                                self.metrics.increment("clips_uploaded")
+                            except JobCancelled:
+                                raise
+                            except Exception as e:
+                                error_msg = f"Upload failed for clip {idx}: {str(e)}"
+                                self.logger.error(error_msg)
+                                results["errors"].append(error_msg)
+                                self.metrics.increment("clips_failed")
+                                clip_info["uploaded"] = False
+                                clip_info["upload_error"] = str(e)
+                        else:
                             clip_info["uploaded"] = False
-                    else:
-                        clip_info["uploaded"] = False
                     
-                    results["clips"].append(clip_info)
+                        clip_info["catalog_id"] = self._record("add_clip", job_id, url, clip_info)
+                        results["clips"].append(clip_info)
+                        emit("clip", clip_info)
                     
-                except Exception as e:
-                    error_msg = f"Failed processing clip {idx}: {str(e)}"
-                    self.logger.error(error_msg)
-                    results["errors"].append(error_msg)
-                    continue
+                    except JobCancelled:
+                        raise
+                    except Exception as e:
+                        error_msg = f"Failed processing clip {idx}: {str(e)}"
+                        self.logger.error(error_msg)
+                        results["errors"].append(error_msg)
+                        self.metrics.increment("clips_failed")
+                        clip_attrs["error"] = str(e)
+                        emit("clip", {"index": idx, "error": str(e)})
+                        continue
                 
                 if uploaded >= self.MAX_CLIPS_PER_RUN:
                     self.logger.info("Reached upload limit for this run.")
                     break
             
+            for stage in weights:
+                tracker.complete(stage)
             self.logger.info(f"Done. Created {results['clips_created']} clips, uploaded {results['clips_uploaded']}")
+            self._record("finish_job", job_id, "completed")
+            
+        except JobCancelled as e:
+            self.logger.warning(f"Pipeline cancelled: {e}")
+            results["cancelled"] = True
+            results["errors"].append(str(e))
+            results["retryable"] = preparing
+            self._remove_artifacts(artifacts)
+            # Uploaded clips stay on YouTube; everything local from this run is gone
+            results["clips"] = [c for c in results["clips"] if c.get("uploaded")]
+            self._record("finish_job", job_id, "cancelled", error=str(e))
             
         except Exception as e:
             error_msg = f"Pipeline failed: {str(e)}"
             self.logger.error(error_msg)
             results["errors"].append(error_msg)
+            results["retryable"] = preparing
+            self._record("finish_job", job_id, "failed", error=error_msg)
+        
+        finally:
+            if download is not None:
+                self._remove_artifacts([download])
+            release(in_use_markers)
+            if model is not None and model is not self._whisper_model:
+                self.metrics.adjust_gauge("whisper_models_resident", -1)
         
         return results
+    
+    def _remove_artifacts(self, artifacts: List[Path]) -> None:
+        """Delete files, directories or glob patterns (such as yt-dlp partial downloads) left by a run."""
+        for artifact in artifacts:
+            candidates = artifact.parent.glob(artifact.name) if '*' in artifact.name else [artifact]
+            for path in candidates:
+                try:
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                    self.logger.info(f"Removed artifact: {path}")
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.warning(f"Could not remove {path}: {e}")
 
 
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python auto_clip_uploader.py <video_url> [--dry-run]")
+        print("Usage: python auto_clip_uploader.py <video_url> [--dry-run] [--progress] [--trace FILE] [--profile]")
         sys.exit(1)
     
     url = sys.argv[1]
     dry_run = "--dry-run" in sys.argv
+    show_progress = "--progress" in sys.argv
+    trace_file = sys.argv[sys.argv.index("--trace") + 1] if "--trace" in sys.argv[:-1] else None
+    profile = "--profile" in sys.argv
     
     # Setup logging
     logging.basicConfig(
@@ -471,8 +924,23 @@ def main():
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     
+    def print_progress(event: str, data: Dict[str, Any]) -> None:
+        if event == "progress":
+            print(format_progress(data), file=sys.stderr)
+    
     uploader = AutoClipUploader()
-    results = uploader.process_video(url, dry_run=dry_run)
+    tracer = Tracer("process_video", {"url": url}) if trace_file else None
+    profiler = Profiler("process_video").start() if profile else None
+    results = uploader.process_video(url, dry_run=dry_run,
+                                     on_event=print_progress if show_progress else None,
+                                     tracer=tracer)
+    if profiler:
+        profiler.stop()
+        print(profiler.report(), file=sys.stderr)
+        paths = profiler.write(f"cache/profiles/process_video-{time.strftime('%Y%m%d-%H%M%S')}")
+        print(f"Profile written to {', '.join(paths.values())}")
+    if tracer:
+        print(f"Trace written to {tracer.write(trace_file)} (open in chrome://tracing or ui.perfetto.dev)")
     
     print("\\n" + "="*50)
     print("PROCESSING RESULTS")
@@ -5,40 +5,106 @@ This module provides the main automation framework class that orchestrates
 various automation tasks and workflows.
 """
 
+import json
 import logging
+import queue
+import threading
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from pathlib import Path
 
 from src.config_manager import ConfigManager
 from src.auto_clip_uploader import AutoClipUploader
+from src.batch import PipelineBudget, collect_sources, run_batch, video_slug
+from src.cancellation import current_token
+from src.catalog import ClipCatalog
+from src.channel_index import ChannelIndex
+from src.hardware import load_recommendations, probe, resolve_pipeline_settings, save_profile
+from src.janitor import DiskJanitor, format_report
+from src.metrics import MetricsRegistry
+from src.periodic import PeriodicScheduler, parse_schedule
+from src.task_execution import NonRetryableError, RetryPolicy, run_with_retries
+from src.task_scheduler import TaskResult, TaskScheduler, TaskSpec
+from src.youtube_data import YouTubeDataClient
 
 
 class AutomationFramework:
     """Main automation framework class."""
     
-    def __init__(self, config_manager: ConfigManager):
+    # Clips and downloads of the framework's own runs (scheduled clip_uploader,
+    # batches and the channel_sync queue), kept apart from the web app's
+    CLIP_DIR = AutoClipUploader.CLIP_DIR / "scheduled"
+    TMP_DIR = AutoClipUploader.TMP_DIR / "scheduled"
+    
+    def __init__(self, config_manager: ConfigManager,
+                 youtube_client: Optional[YouTubeDataClient] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         """Initialize the automation framework."""
         self.config_manager = config_manager
         self.logger = logging.getLogger(__name__)
         self.tasks = {}
+        self.task_specs = {}
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.youtube_client = youtube_client or YouTubeDataClient(metrics=self.metrics)
+        self.channel_index = ChannelIndex(
+            path=config_manager.get_task_setting("channel_sync", "index_path", "cache/channel_index.json"),
+            max_backfill=config_manager.get_task_setting("channel_sync", "max_backfill", 200)
+        )
+        # Jobs, clips and upload outcomes that outlive this process
+        self.catalog = ClipCatalog(config_manager.get_setting("catalog.path", "cache/catalog.db"))
+        # Videos waiting to be clipped, drained by a single worker thread
+        self.clip_queue = queue.Queue()
+        self.metrics.set_gauge("clip_queue_depth", self.clip_queue.qsize)
+        self._clip_worker = None
+        # Guards starting and retiring the worker, so no queued job is left without one
+        self._clip_worker_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.periodic = PeriodicScheduler(
+            self.run_task,
+            state_path=config_manager.get_setting("scheduler.state_path", "cache/schedule_state.json"),
+            metrics=self.metrics
+        )
+        self.scheduler = TaskScheduler(
+            max_workers=config_manager.get_setting("scheduler.max_workers", 4),
+            resource_limits=config_manager.get_setting("scheduler.resource_limits", {})
+        )
         self._initialize_tasks()
     
     def _initialize_tasks(self) -> None:
         """Initialize available automation tasks."""
         # Register built-in tasks
-        self.tasks = {
-            "hello_world": self._hello_world_task,
-            "system_check": self._system_check_task,
-            "cleanup": self._cleanup_task,
-            "clip_uploader": self._clip_uploader_task,
-        }
+        self.register_task("hello_world", self._hello_world_task)
+        self.register_task("system_check", self._system_check_task)
+        self.register_task("channel_sync", self._channel_sync_task, resource="network")
+        # A fresh hardware check in the same workflow is applied first; otherwise the saved profile is used
+        self.register_task("clip_uploader", self._clip_uploader_task,
+                           after=["system_check"], resource="media")
+        # Cleanup must not remove temp files while clips are still being made
+        self.register_task("cleanup", self._cleanup_task,
+                           after=["clip_uploader", "channel_sync"], resource="disk")
         
         # Initialize clip uploader
-        self.clip_uploader = AutoClipUploader()
+        self.clip_uploader = AutoClipUploader(metrics=self.metrics, catalog=self.catalog)
+        # Pipeline defaults recommended by the last system_check on this machine
+        self.recommended = load_recommendations(self.config_manager.get_task_setting(
+            "system_check", "profile_path", "cache/hardware_profile.json"))
+        self.apply_pipeline_settings()
+        # Pick up edited limits and thresholds without a restart
+        self.config_manager.subscribe(self._on_config_change)
         
         self.logger.info(f"Initialized {len(self.tasks)} automation tasks")
     
+    def register_task(self, name: str, task_function, depends_on: List[str] = (),
+                      after: List[str] = (), resource: str = "default") -> None:
+        """
+        Register a task for run_task and the scheduler.
+        depends_on tasks must succeed first (and are pulled into workflows that lack
+        them); after tasks only order this one when both run in the same workflow.
+        """
+        self.tasks[name] = task_function
+        self.task_specs[name] = TaskSpec(name, task_function, depends_on, after, resource)
+    
     def list_tasks(self) -> List[str]:
         """Return a list of available tasks."""
         return list(self.tasks.keys())
@@ -48,37 +114,74 @@ class AutomationFramework:
         if task_name not in self.tasks:
             self.logger.error(f"Task '{task_name}' not found")
             return False
+        return self.execute_task(task_name).success
+    
+    def retry_policy(self, task_name: str) -> RetryPolicy:
+        """Timeout/retry policy: automation_settings overridden by task_settings.<task>."""
+        config = self.config_manager.get_config()
+        return RetryPolicy.from_settings(config.get("automation_settings", {}),
+                                         config.get("task_settings", {}).get(task_name, {}))
+    
+    def execute_task(self, task_name: str) -> TaskResult:
+        """
+        Run one task (without its dependencies) under its timeout and retry
+        policy, and return its result, timing and per-attempt outcomes.
+        """
+        policy = self.retry_policy(task_name)
+        started_at = time.time()
+        start = time.monotonic()
+        self.logger.info(f"Starting task: {task_name}")
         
-        try:
-            self.logger.info(f"Starting task: {task_name}")
-            start_time = time.time()
-            
-            result = self.tasks[task_name]()
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
-            
+        def on_attempt(attempt):
+            self.metrics.increment("task_attempts", task=task_name, outcome=attempt.outcome)
+            if not attempt.success:
+                retrying = attempt.attempt <= policy.max_retries
+                self.logger.warning(f"Task '{task_name}' attempt {attempt.attempt} {attempt.outcome}"
+                                    f"{': ' + attempt.error if attempt.error else ''}"
+                                    f"{'; retrying' if retrying else ''}")
+        
+        attempts = run_with_retries(self.tasks[task_name], policy, on_attempt, sleep=self._stop_event.wait,
+                                    metrics=self.metrics)
+        result = attempts[-1].success
+        execution_time = time.monotonic() - start
+        error = None if result else attempts[-1].error
+        
+        if result:
             self.logger.info(f"Task '{task_name}' completed in {execution_time:.2f} seconds")
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Task '{task_name}' failed: {str(e)}")
-            return False
+        else:
+            self.logger.error(f"Task '{task_name}' failed after {len(attempts)} attempt(s)"
+                              f"{': ' + error if error else ''}")
+        self.metrics.record_duration(f"task.{task_name}", execution_time)
+        self.metrics.record_outcome("task", "success" if result else "error")
+        if not result:
+            self.metrics.record_activity("error", f"Task '{task_name}' failed{': ' + error if error else ''}")
+        return TaskResult(task_name, result, started_at, execution_time, error=error,
+                          attempts=[a.to_dict() for a in attempts])
     
-    def run_default_workflow(self) -> None:
-        """Run the default automation workflow."""
+    def run_tasks(self, task_names: List[str]) -> Dict[str, TaskResult]:
+        """
+        Run tasks and their dependencies, independent ones concurrently.
+        Returns each task's result in dependency order; raises ValueError for
+        unknown tasks or dependency cycles.
+        """
+        return self.scheduler.run(self.task_specs, task_names, lambda spec: self.execute_task(spec.name))
+    
+    def run_default_workflow(self) -> Dict[str, TaskResult]:
+        """Run the default automation workflow and return per-task results."""
         self.logger.info("Starting default automation workflow")
         
         # Get workflow configuration
         config = self.config_manager.get_config()
         workflow_tasks = config.get("default_workflow", ["hello_world", "system_check"])
         
-        for task_name in workflow_tasks:
-            success = self.run_task(task_name)
-            if not success:
-                self.logger.warning(f"Task '{task_name}' failed, continuing with next task")
+        results = self.run_tasks(workflow_tasks)
+        for name, result in results.items():
+            if not result.success:
+                self.logger.warning(f"Task '{name}' {'skipped' if result.skipped else 'failed'}"
+                                    f"{': ' + result.error if result.error else ''}")
         
         self.logger.info("Default workflow completed")
+        return results
     
     def _hello_world_task(self) -> bool:
         """A simple hello world task."""
@@ -86,8 +189,31 @@ class AutomationFramework:
         print("Hello World! Automation is running successfully.")
         return True
     
+    def pipeline_settings(self) -> Dict[str, Any]:
+        """Whisper model and stage budget for the clip uploader: configuration, else system_check's recommendation."""
+        task_config = self.config_manager.get_config().get("task_settings", {}).get("clip_uploader", {})
+        return resolve_pipeline_settings(task_config, self.recommended)
+    
+    def uploader_settings(self) -> Dict[str, Any]:
+        """task_settings.clip_uploader with the Whisper model resolved, for AutoClipUploader.configure."""
+        task_config = self.config_manager.get_config().get("task_settings", {}).get("clip_uploader", {})
+        return dict(task_config, whisper_model=self.pipeline_settings()["whisper_model"])
+    
+    def apply_pipeline_settings(self) -> Dict[str, Any]:
+        """Hand the current clip_uploader settings to the uploader (used from its next run)."""
+        self.clip_uploader.configure(self.uploader_settings())
+        return self.pipeline_settings()
+    
+    def _on_config_change(self, new_config: Dict[str, Any], old_config: Dict[str, Any]) -> None:
+        """Apply a reloaded configuration; running tasks and jobs keep their settings."""
+        scheduler = new_config.get("scheduler", {})
+        self.scheduler.set_limits(scheduler.get("max_workers", 4), scheduler.get("resource_limits", {}))
+        self.apply_pipeline_settings()
+        changed = sorted(k for k in set(new_config) | set(old_config) if new_config.get(k) != old_config.get(k))
+        self.logger.info(f"Applied configuration changes: {', '.join(changed)}")
+    
     def _system_check_task(self) -> bool:
-        """Perform basic system checks."""
+        """Probe the machine and publish recommended pipeline concurrency."""
         self.logger.info("Performing system checks...")
         
         # Check current time
@@ -98,32 +224,69 @@ class AutomationFramework:
         config = self.config_manager.get_config()
         self.logger.info(f"Configuration loaded: {len(config)} settings")
         
-        # Mock system resource check
-        self.logger.info("System resources: OK")
-        self.logger.info("Network connectivity: OK")
-        self.logger.info("Storage space: OK")
+        settings = config.get("task_settings", {}).get("system_check", {})
+        video_dirs = settings.get("video_dirs", [str(AutoClipUploader.TMP_DIR), str(AutoClipUploader.CLIP_DIR)])
+        profile = probe(video_dirs, settings.get("benchmark_seconds", 3))
+        ok = True
         
-        print("System check completed successfully!")
-        return True
+        memory = profile["memory"]
+        self.logger.info(f"CPUs: {profile['cpu_count']}, memory: {memory['available_gb']} GB available "
+                         f"of {memory['total_gb']} GB")
+        if settings.get("check_memory", True) and (memory["available_gb"] or 0) < settings.get("min_memory_gb", 1):
+            self.logger.warning(f"Low memory: {memory['available_gb']} GB available")
+        for path, disk in profile["disk"].items():
+            self.logger.info(f"Storage {path}: {disk['free_gb']} GB free of {disk['total_gb']} GB")
+            if settings.get("check_disk_space", True) and disk["free_gb"] < settings.get("min_free_gb", 2):
+                self.logger.error(f"Not enough free space for {path}: {disk['free_gb']} GB "
+                                  f"(need {settings.get('min_free_gb', 2)} GB)")
+                ok = False
+        ffmpeg = profile["ffmpeg"]
+        if not ffmpeg["available"]:
+            self.logger.warning("ffmpeg not found on PATH; clip extraction will fail")
+        else:
+            self.logger.info(f"{ffmpeg['version']}; hardware encoders: "
+                             f"{', '.join(ffmpeg['hardware_encoders']) or 'none'}")
+            if ffmpeg["missing_filters"]:
+                self.logger.warning(f"ffmpeg lacks filters: {', '.join(ffmpeg['missing_filters'])}")
+        if profile["decode_benchmark"]:
+            bench = profile["decode_benchmark"]
+            self.logger.info(f"Decode throughput: {bench['frames_per_second']} fps at {bench['resolution']} "
+                             f"({bench['realtime_factor']}x real time, one thread)")
+        
+        # Publish recommendations for this and later processes
+        self.recommended = profile["recommended"]
+        save_profile(profile, settings.get("profile_path", "cache/hardware_profile.json"))
+        applied = self.apply_pipeline_settings()
+        self.logger.info(f"Recommended: {self.recommended['extraction_workers']} extraction workers, "
+                         f"{self.recommended['asr_workers']} ASR workers, Whisper '{self.recommended['whisper_model']}'"
+                         f" (using Whisper '{applied['whisper_model'] or self.clip_uploader.WHISPER_MODEL}', "
+                         f"budget {applied['budget']})")
+        
+        print("System check completed successfully!" if ok else "System check found problems")
+        return ok
     
     def _cleanup_task(self) -> bool:
-        """Perform cleanup operations."""
+        """Evict old downloads, clips and caches (see task_settings.cleanup)."""
         self.logger.info("Performing cleanup operations...")
+        settings = self.config_manager.get_config().get("task_settings", {}).get("cleanup", {})
+        if not settings.get("cleanup_temp_files", True):
+            self.logger.info("Temporary file cleanup is disabled")
+            return True
         
-        # Mock cleanup operations
-        self.logger.info("Cleaning temporary files...")
-        time.sleep(1)  # Simulate work
-        
-        self.logger.info("Optimizing logs...")
-        time.sleep(1)  # Simulate work
+        report = DiskJanitor.from_settings(settings).run(dry_run=settings.get("dry_run", False))
+        for line in format_report(report).splitlines():
+            self.logger.info(line)
+        self.metrics.increment("cleanup_freed_bytes", report["freed_bytes"])
+        if report["over_cap"]:
+            self.logger.warning("Artifacts still exceed max_total_gb; everything left is protected")
         
-        self.logger.info("Cleanup completed successfully")
-        print("Cleanup task completed!")
+        print(f"Cleanup task completed! {format_report(report).splitlines()[0]}")
         return True
     
-    def add_custom_task(self, name: str, task_function) -> None:
-        """Add a custom task to the framework."""
-        self.tasks[name] = task_function
+    def add_custom_task(self, name: str, task_function, depends_on: List[str] = (),
+                        after: List[str] = (), resource: str = "default") -> None:
+        """Add a custom task to the framework (see register_task for the scheduling options)."""
+        self.register_task(name, task_function, depends_on, after, resource)
         self.logger.info(f"Added custom task: {name}")
     
     def _clip_uploader_task(self) -> bool:
@@ -138,16 +301,26 @@ class AutomationFramework:
             self.logger.info("Clip uploader task is disabled")
             return True
         
-        video_url = task_config.get("video_url")
-        if not video_url:
+        try:
+            sources = collect_sources(task_config)
+        except Exception as e:
+            self.logger.error(f"Could not read clip sources: {str(e)}")
+            return False
+        if not sources:
             self.logger.error("No video URL configured for clip uploader task")
-            self.logger.info("Set 'task_settings.clip_uploader.video_url' in configuration")
+            self.logger.info("Set 'task_settings.clip_uploader.video_url' (or video_urls, manifest, playlist_url) in configuration")
             return False
         
         dry_run = task_config.get("dry_run", True)  # Default to dry run for safety
+        self.apply_pipeline_settings()
+        if len(sources) > 1:
+            return self._clip_uploader_batch(sources, dry_run, task_config.get("batch", {}))
+        video_url = sources[0]
         
         try:
-            results = self.clip_uploader.process_video(video_url, dry_run=dry_run)
+            # A timed-out attempt cancels this token, which kills the running ffmpeg
+            results = self.clip_uploader.process_video(video_url, dry_run=dry_run, cancel_token=current_token(),
+                                                       clip_dir=self.CLIP_DIR, tmp_dir=self.TMP_DIR)
             
             self.logger.info(f"Clip processing results:")
             self.logger.info(f"  - URL: {results['url']}")
@@ -161,12 +334,167 @@ class AutomationFramework:
                     self.logger.warning(f"  - {error}")
             
             print(f"Auto Clip Uploader completed: {results['clips_created']} clips created, {results['clips_uploaded']} uploaded")
+            if results['errors'] and not results.get('retryable'):
+                # Rerunning would upload this run's clips again
+                raise NonRetryableError('; '.join(results['errors']))
             return len(results['errors']) == 0
             
+        except NonRetryableError:
+            raise
         except Exception as e:
             self.logger.error(f"Clip uploader task failed: {str(e)}")
             return False
     
+    def _clip_uploader_batch(self, sources: List[str], dry_run: bool, batch_config: Dict[str, Any]) -> bool:
+        """Process several source videos concurrently under a shared stage budget."""
+        budget = PipelineBudget(self.pipeline_settings()["budget"], metrics=self.metrics)
+        # One uploader for the whole batch; its Whisper models are pooled by the budget
+        uploader = AutoClipUploader(metrics=self.metrics, budget=budget, catalog=self.catalog)
+        uploader.configure(self.uploader_settings())
+        cancel_token = current_token()
+        
+        def process(url):
+            # Separate output dirs so concurrent videos do not overwrite each other's clips
+            slug = video_slug(url)
+            return uploader.process_video(url, dry_run=dry_run, cancel_token=cancel_token,
+                                          clip_dir=self.CLIP_DIR / slug,
+                                          tmp_dir=self.TMP_DIR / slug)
+        
+        max_concurrent = batch_config.get("max_concurrent_videos", 2)
+        self.logger.info(f"Processing {len(sources)} videos, {max_concurrent} at a time")
+        try:
+            report = run_batch(sources, process, max_concurrent)
+        finally:
+            budget.release_models()
+        
+        for video in report["videos"]:
+            self.logger.info(f"  - {video['status']:<9} {video['url']}: {video['clips_created']} clips created, "
+                             f"{video['clips_uploaded']} uploaded, {len(video['errors'])} errors "
+                             f"({video['duration_seconds']:.1f}s)")
+        totals = report["totals"]
+        report_dir = batch_config.get("report_dir")
+        if report_dir:
+            path = Path(report_dir) / f"batch-{time.strftime('%Y%m%d-%H%M%S')}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.logger.info(f"Batch report written to {path}")
+        print(f"Auto Clip Uploader batch completed: {totals['succeeded']}/{totals['videos']} videos, "
+              f"{totals['clips_created']} clips created, {totals['clips_uploaded']} uploaded")
+        if totals["failed"] and totals["clips_uploaded"]:
+            # A retry reprocesses every video, uploading these clips a second time
+            raise NonRetryableError(f"{totals['failed']} of {totals['videos']} videos failed")
+        return totals["failed"] == 0
+    
+    def _channel_sync_task(self) -> bool:
+        """Incrementally refresh the index of watched channels."""
+        config = self.config_manager.get_config()
+        task_config = config.get("task_settings", {}).get("channel_sync", {})
+        channels = task_config.get("channels", [])
+        if not channels:
+            self.logger.info("No channels configured for channel sync")
+            self.logger.info("Set 'task_settings.channel_sync.channels' to a list of channel IDs")
+            return True
+
+        api_key = self.youtube_client.api_key()
+        if not api_key:
+            self.logger.error("Channel sync requires the YOUTUBE_API_KEY environment variable")
+            return False
+
+        success = True
+        for channel_id in channels:
+            first_sync = not self.channel_index.has_channel(channel_id)
+            new_videos = self.channel_index.sync_channel(self.youtube_client, channel_id, api_key)
+            if new_videos is None:
+                self.logger.error(f"Channel sync failed for {channel_id}")
+                success = False
+                continue
+            # The first sync only builds the index; the back catalogue is never enqueued
+            if first_sync or not task_config.get("auto_enqueue", False):
+                continue
+            min_duration = task_config.get("min_duration_seconds", 180)
+            for video in new_videos:
+                if video["isShort"] or video["durationSeconds"] < min_duration:
+                    continue
+                self.enqueue_clip_job(f"https://www.youtube.com/watch?v={video['id']}",
+                                      dry_run=task_config.get("dry_run", True))
+        return success
+
+    def enqueue_clip_job(self, video_url: str, dry_run: bool = True) -> None:
+        """Queue a video for clipping; jobs run one at a time in a background worker."""
+        with self._clip_worker_lock:
+            self.clip_queue.put((video_url, dry_run))
+            self.logger.info(f"Enqueued for clipping: {video_url}")
+            if self._clip_worker is None:
+                self._clip_worker = threading.Thread(target=self._drain_clip_queue, name="clip-queue", daemon=True)
+                self._clip_worker.start()
+
+    def _drain_clip_queue(self) -> None:
+        """Process queued clip jobs until the queue is empty."""
+        while True:
+            with self._clip_worker_lock:
+                try:
+                    video_url, dry_run = self.clip_queue.get_nowait()
+                except queue.Empty:
+                    # Retire under the lock, so the next enqueue starts a new worker
+                    self._clip_worker = None
+                    return
+            try:
+                # Own directories per video, as a scheduled clip_uploader run may be in progress
+                slug = video_slug(video_url)
+                results = self.clip_uploader.process_video(video_url, dry_run=dry_run,
+                                                           clip_dir=self.CLIP_DIR / "queue" / slug,
+                                                           tmp_dir=self.TMP_DIR / "queue" / slug)
+                self.logger.info(f"Queued clip job finished for {video_url}: "
+                                 f"{results['clips_created']} clips created, {len(results['errors'])} errors")
+            except Exception as e:
+                self.logger.error(f"Queued clip job failed for {video_url}: {str(e)}")
+            finally:
+                self.clip_queue.task_done()
+
+    def schedule_task(self, task_name: str, schedule, catch_up: bool = True, run_now: bool = False) -> bool:
+        """
+        Run a task on a schedule (cron expression, 'every 15m' or seconds) in
+        this process. Overlapping runs of the task are skipped; see PeriodicScheduler.
+        """
+        if task_name not in self.tasks:
+            self.logger.error(f"Task '{task_name}' not found")
+            return False
+        try:
+            self.periodic.add(task_name, parse_schedule(schedule), catch_up=catch_up, run_now=run_now)
+        except ValueError as e:
+            self.logger.error(f"Invalid schedule for task '{task_name}': {e}")
+            return False
+        return True
+
+    def start_scheduled_tasks(self) -> List[str]:
+        """
+        Schedule every enabled task with a 'schedule' (or 'interval_seconds')
+        in its task_settings; returns the scheduled task names.
+        """
+        scheduled = []
+        for task_name, settings in self.config_manager.get_config().get("task_settings", {}).items():
+            if not settings.get("enabled", True) or task_name not in self.tasks:
+                continue
+            if settings.get("schedule"):
+                ok = self.schedule_task(task_name, settings["schedule"], settings.get("catch_up", True))
+            elif settings.get("interval_seconds"):
+                ok = self.schedule_task(task_name, settings["interval_seconds"], run_now=True)
+            else:
+                continue
+            if ok:
+                scheduled.append(task_name)
+        return scheduled
+
+    def start_periodic_task(self, task_name: str, interval_seconds: float) -> bool:
+        """Run a task now and then every interval_seconds in a background thread."""
+        return self.schedule_task(task_name, interval_seconds, run_now=True)
+
+    def stop_periodic_tasks(self) -> None:
+        """Stop all scheduled tasks after their current run."""
+        self._stop_event.set()
+        self.periodic.stop()
+        self._stop_event = threading.Event()
+
     def get_task_status(self) -> Dict[str, Any]:
         """Get the status of the automation framework."""
         return {
@@ -0,0 +1,201 @@
+"""
+Batch processing module.
+
+This module lets the clip uploader work through many source videos in
+one run. Sources come from a list of URLs, a manifest file or a
+playlist. Videos are processed concurrently, while a shared
+PipelineBudget caps how many downloads, ffmpeg encodes and Whisper
+transcriptions run at the same time across all of them. Results are
+aggregated per video, and a failing source does not stop the others.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+# Concurrent pipeline stages allowed across all videos of a batch
+DEFAULT_BUDGET = {
+    "download": 2,
+    "encode": 2,
+    "asr": 1,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineBudget:
+    """Global slots for downloads, ffmpeg encodes and ASR shared by concurrent jobs."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, metrics: Any = None):
+        """
+        Initialize the budget.
+
+        Args:
+            limits: Slots per kind ('download', 'encode', 'asr'); missing kinds use DEFAULT_BUDGET
+            metrics: Optional MetricsRegistry that records time spent waiting for a slot
+        """
+        self.limits = dict(DEFAULT_BUDGET, **(limits or {}))
+        self.metrics = metrics
+        self._semaphores = {kind: threading.BoundedSemaphore(max(1, int(n))) for kind, n in self.limits.items()}
+        # Idle Whisper models as (name, model); at most one per 'asr' slot is ever loaded
+        self._models_lock = threading.Lock()
+        self._idle_models = []
+
+    @contextmanager
+    def slot(self, kind: str) -> Iterator[None]:
+        """Hold one slot of a kind for the enclosed stage (unknown kinds are unlimited)."""
+        semaphore = self._semaphores.get(kind)
+        if semaphore is None:
+            yield
+            return
+        start = time.monotonic()
+        semaphore.acquire()
+        if self.metrics is not None:
+            self.metrics.record_duration(f"budget_wait.{kind}", time.monotonic() - start)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    @contextmanager
+    def whisper_model(self, name: str, load: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Hold an 'asr' slot and a Whisper model for one transcription. Models are
+        loaded inside the slot and reused by later transcriptions of any video,
+        so no more than 'asr' models are resident at once.
+        """
+        with self.slot("asr"):
+            with self._models_lock:
+                model = next((m for n, m in self._idle_models if n == name), None)
+                if model is not None:
+                    self._idle_models = [(n, m) for n, m in self._idle_models if m is not model]
+                stale = len([n for n, _ in self._idle_models if n != name])
+                # The configured model changed; drop the old ones
+                self._idle_models = [(n, m) for n, m in self._idle_models if n == name]
+            if stale and self.metrics is not None:
+                self.metrics.adjust_gauge("whisper_models_resident", -stale)
+            if model is None:
+                model = load()
+            try:
+                yield model
+            finally:
+                with self._models_lock:
+                    self._idle_models.append((name, model))
+
+    def release_models(self) -> None:
+        """Drop the pooled Whisper models (at the end of a batch)."""
+        with self._models_lock:
+            released, self._idle_models = len(self._idle_models), []
+        if released and self.metrics is not None:
+            self.metrics.adjust_gauge("whisper_models_resident", -released)
+
+
+def load_manifest(path: str) -> List[str]:
+    """
+    Read source URLs from a manifest: a JSON list (or {"videos": [...]}) of
+    URLs, or a text file with one URL per line ('#' starts a comment).
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".json"):
+        data = json.loads(text)
+        entries = data.get("videos", []) if isinstance(data, dict) else data
+        return [e["url"] if isinstance(e, dict) else str(e) for e in entries]
+    urls = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            urls.append(line)
+    return urls
+
+
+def expand_playlist(playlist_url: str, timeout: float = 120) -> List[str]:
+    """List the video URLs of a playlist with yt-dlp (no downloads)."""
+    out = subprocess.run(["yt-dlp", "--flat-playlist", "-J", playlist_url], capture_output=True,
+                         text=True, check=True, timeout=timeout).stdout
+    urls = []
+    for entry in json.loads(out).get("entries") or []:
+        url = entry.get("url") or ""
+        if url.startswith("http"):
+            urls.append(url)
+        elif entry.get("id"):
+            urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+    return urls
+
+
+def collect_sources(settings: Dict[str, Any]) -> List[str]:
+    """
+    Gather source URLs from clip_uploader settings (video_url, video_urls,
+    manifest, playlist_url) in that order, without duplicates.
+    """
+    urls = []
+    if settings.get("video_url"):
+        urls.append(settings["video_url"])
+    urls.extend(settings.get("video_urls") or [])
+    if settings.get("manifest"):
+        urls.extend(load_manifest(settings["manifest"]))
+    if settings.get("playlist_url"):
+        urls.extend(expand_playlist(settings["playlist_url"]))
+    return list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+
+
+def video_slug(url: str) -> str:
+    """Stable directory name for a source: its YouTube ID or file name plus a short hash."""
+    parsed = urlparse(url)
+    name = parse_qs(parsed.query).get("v", [""])[0] or Path(parsed.path).stem or parsed.netloc
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", name)[:40].strip("_") or "video"
+    return f"{name}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}"
+
+
+def run_batch(urls: List[str], process: Callable[[str], Dict[str, Any]],
+              max_concurrent: int = 2) -> Dict[str, Any]:
+    """
+    Run process(url) for every URL on a pool of max_concurrent workers and
+    aggregate the per-video results. An exception or error for one video
+    is recorded and the rest carry on.
+    """
+    def run_one(url):
+        start = time.monotonic()
+        try:
+            results = process(url)
+        except Exception as e:
+            logger.error(f"Batch video failed: {url}: {e}")
+            results = {"url": url, "clips_created": 0, "clips_uploaded": 0, "errors": [str(e)]}
+        if results.get("cancelled"):
+            status = "cancelled"
+        elif results.get("errors"):
+            status = "error"
+        else:
+            status = "success"
+        return {
+            "url": url,
+            "status": status,
+            "clips_created": results.get("clips_created", 0),
+            "clips_uploaded": results.get("clips_uploaded", 0),
+            "errors": results.get("errors", []),
+            "duration_seconds": round(time.monotonic() - start, 3),
+        }
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="batch") as executor:
+        videos = list(executor.map(run_one, urls))
+    return {
+        "videos": videos,
+        "totals": {
+            "videos": len(videos),
+            "succeeded": sum(1 for v in videos if v["status"] == "success"),
+            "failed": sum(1 for v in videos if v["status"] != "success"),
+            "clips_created": sum(v["clips_created"] for v in videos),
+            "clips_uploaded": sum(v["clips_uploaded"] for v in videos),
+        },
+        "duration_seconds": round(time.monotonic() - start, 3),
+    }
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark module.
+
+This module builds deterministic synthetic videos with ffmpeg's lavfi
+sources (test patterns with hard scene cuts and a sine tone or flite
+speech track) at several lengths and resolutions, times the clip
+pipeline's stages on them and writes the results to JSON. Results can be
+compared with a saved baseline; a stage whose median time grows by more
+than its configured tolerance is reported as a regression.
+
+Usage:
+    python src/benchmark.py [--sources 360p_30s,720p_60s] [--repeat 3]
+                            [--save-baseline] [--baseline FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.auto_clip_uploader import AutoClipUploader
+from src.config_manager import ConfigManager
+from src.metrics import MetricsRegistry
+
+
+# Synthetic sources: scene cuts every scene_seconds, each scene a different pattern
+DEFAULT_SOURCES = [
+    {"name": "360p_30s", "width": 640, "height": 360, "duration": 30, "scene_seconds": 6, "audio": "sine"},
+    {"name": "720p_60s", "width": 1280, "height": 720, "duration": 60, "scene_seconds": 8, "audio": "tts"},
+    {"name": "1080p_120s", "width": 1920, "height": 1080, "duration": 120, "scene_seconds": 12, "audio": "sine"},
+]
+
+# lavfi video sources cycled through so that every cut is a hard scene change
+SCENE_PATTERNS = ["testsrc", "smptebars", "rgbtestsrc", "testsrc2", "smptehdbars", "color=c=0x2040a0"]
+
+FRAME_RATE = 25
+
+SPEECH_TEXT = ("Scene detection finds the cuts. Each clip is extracted without re-encoding, "
+               "transcribed and given a title, description and tags before upload.")
+
+# Fixed transcript used to time metadata generation (about 2.5 words per second of video)
+TRANSCRIPT_WORDS = ("the quick brown fox jumps over the lazy dog while the camera pans across "
+                    "the city skyline at sunset and the narrator explains how video editing "
+                    "tools detect scene changes automatically").split()
+
+STAGES = ["scene_detect", "select_clip_ranges", "extract", "metadata", "process_video"]
+
+
+def ffmpeg_available() -> bool:
+    """True if ffmpeg is on PATH."""
+    return shutil.which("ffmpeg") is not None
+
+
+def ffmpeg_has_filter(name: str) -> bool:
+    """True if this ffmpeg build includes a filter (e.g. 'flite' for speech)."""
+    try:
+        out = subprocess.run(["ffmpeg", "-hide_banner", "-filters"], capture_output=True,
+                             text=True, check=True).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+    return any(line.split()[1:2] == [name] for line in out.splitlines() if line.strip())
+
+
+def build_source_command(out_path: Path, width: int, height: int, duration: float,
+                         scene_seconds: float, audio: str = "sine") -> List[str]:
+    """
+    ffmpeg command that renders a synthetic source: one lavfi input per scene,
+    concatenated into hard cuts, plus a sine tone or flite speech track.
+    """
+    scenes = max(1, int(-(-duration // scene_seconds)))
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+    for i in range(scenes):
+        length = min(scene_seconds, duration - i * scene_seconds)
+        pattern = SCENE_PATTERNS[i % len(SCENE_PATTERNS)]
+        sep = ":" if "=" in pattern else "="
+        cmd += ["-f", "lavfi", "-i", f"{pattern}{sep}size={width}x{height}:rate={FRAME_RATE}:duration={length}"]
+    if audio == "tts":
+        cmd += ["-f", "lavfi", "-i", f"flite=text='{SPEECH_TEXT}':voice=slt"]
+    else:
+        cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:beep_factor=4:sample_rate=44100:duration={duration}"]
+    inputs = "".join(f"[{i}:v]" for i in range(scenes))
+    graph = (f"{inputs}concat=n={scenes}:v=1:a=0,format=yuv420p[v];"
+             f"[{scenes}:a]apad,atrim=0:{duration},aresample=44100[a]")
+    cmd += [
+        "-filter_complex", graph,
+        "-map", "[v]", "-map", "[a]",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(FRAME_RATE * 2),
+        "-c:a", "aac", "-b:a", "96k",
+        "-fflags", "+bitexact", "-flags:v", "+bitexact", "-flags:a", "+bitexact",
+        "-movflags", "+faststart",
+        str(out_path)
+    ]
+    return cmd
+
+
+def synthetic_transcript(duration: float) -> str:
+    """Deterministic transcript of roughly the length speech over `duration` would have."""
+    count = max(10, int(duration * 2.5))
+    words = [TRANSCRIPT_WORDS[i % len(TRANSCRIPT_WORDS)] for i in range(count)]
+    # Sentence breaks every 12 words
+    return " ".join(w + ("." if (i + 1) % 12 == 0 else "") for i, w in enumerate(words))
+
+
+def measure(fn: Callable[[], Any], repeat: int = 1, number: int = 1) -> Tuple[Dict[str, Any], Any]:
+    """Time fn `repeat` times (each the mean of `number` calls); returns (stats, last result)."""
+    runs = []
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        for _ in range(max(1, number)):
+            result = fn()
+        runs.append((time.perf_counter() - start) / max(1, number))
+    return {
+        "median_seconds": round(statistics.median(runs), 6),
+        "min_seconds": round(min(runs), 6),
+        "max_seconds": round(max(runs), 6),
+        "runs": len(runs),
+        "calls_per_run": max(1, number),
+    }, result
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerances: Optional[Dict[str, float]] = None, default_tolerance: float = 0.25,
+                    noise_floor_seconds: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    Compare median stage times with a baseline results document.
+    A stage regresses when current > baseline * (1 + tolerance) and the
+    difference exceeds the noise floor. Sources or stages missing from
+    either side are skipped.
+    """
+    tolerances = tolerances or {}
+    regressions = []
+    for source, stages in current.get("results", {}).items():
+        base_stages = baseline.get("results", {}).get(source, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if not isinstance(stats, dict) or not isinstance(base, dict) or "median_seconds" not in base:
+                continue
+            now, before = stats["median_seconds"], base["median_seconds"]
+            tolerance = tolerances.get(stage, default_tolerance)
+            if now > before * (1 + tolerance) and now - before > noise_floor_seconds:
+                regressions.append({
+                    "source": source,
+                    "stage": stage,
+                    "baseline_seconds": before,
+                    "current_seconds": now,
+                    "ratio": round(now / before, 3) if before else None,
+                    "tolerance": tolerance,
+                })
+    return regressions
+
+
+class BenchmarkSuite:
+    """Builds synthetic sources and times the pipeline stages on them."""
+
+    def __init__(self, work_dir: str = "cache/benchmarks", repeat: int = 3):
+        """
+        Initialize the suite.
+
+        Args:
+            work_dir: Directory for cached sources and scratch output
+            repeat: Timed runs per stage (process_video runs once)
+        """
+        self.work_dir = Path(work_dir)
+        self.repeat = repeat
+        self.logger = logging.getLogger(__name__)
+        self._speech = None
+
+    def source(self, spec: Dict[str, Any]) -> Path:
+        """Render (or reuse) the synthetic source for a spec."""
+        audio = spec.get("audio", "sine")
+        if audio == "tts":
+            if self._speech is None:
+                self._speech = ffmpeg_has_filter("flite")
+            if not self._speech:
+                self.logger.warning("ffmpeg has no flite filter; using a sine track instead of speech")
+                audio = "sine"
+        params = dict(spec, audio=audio)
+        key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:10]
+        path = self.work_dir / "sources" / f"{spec['name']}-{key}.mp4"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name("tmp-" + path.name)
+            cmd = build_source_command(tmp_path, spec["width"], spec["height"], spec["duration"],
+                                       spec["scene_seconds"], audio)
+            self.logger.info(f"Rendering synthetic source {path.name}")
+            subprocess.run(cmd, check=True)
+            tmp_path.replace(path)
+        return path
+
+    def _uploader(self, scratch: Path) -> AutoClipUploader:
+        uploader = AutoClipUploader(metrics=MetricsRegistry())
+        uploader.CLIP_DIR = scratch / "clips"
+        uploader.TMP_DIR = scratch / "tmp"
+        uploader.PREVIEW_DIR = scratch / "previews"
+        return uploader
+
+    def run_source(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Time every stage on one synthetic source."""
+        source = str(self.source(spec))
+        scratch = self.work_dir / "scratch" / spec["name"]
+        shutil.rmtree(scratch, ignore_errors=True)
+        uploader = self._uploader(scratch)
+        results = {}
+
+        results["scene_detect"], scenes = measure(
+            lambda: uploader.run_ffmpeg_scene_detect(source), self.repeat)
+        results["select_clip_ranges"], ranges = measure(
+            lambda: uploader.select_clip_ranges(scenes, spec["duration"]), self.repeat, number=1000)
+
+        start, end = ranges[0] if ranges else (0.0, min(10.0, spec["duration"]))
+        out_path = scratch / "extract.mp4"
+        results["extract"], _ = measure(
+            lambda: uploader.extract_clip_stream(source, start, end, out_path), self.repeat)
+
+        transcript = synthetic_transcript(spec["duration"])
+        results["metadata"], _ = measure(
+            lambda: uploader.generate_metadata_from_transcript(transcript), self.repeat, number=10)
+
+        def dry_run():
+            # Previews are cached by fingerprint; time a cold run every time
+            shutil.rmtree(scratch / "previews", ignore_errors=True)
+            return uploader.process_video(source, dry_run=True)
+
+        results["process_video"], pipeline = measure(dry_run)
+
+        results["scenes_detected"] = len(scenes)
+        results["expected_cuts"] = max(0, int(-(-spec["duration"] // spec["scene_seconds"])) - 1)
+        results["clips_created"] = pipeline["clips_created"]
+        results["errors"] = pipeline["errors"]
+        shutil.rmtree(scratch, ignore_errors=True)
+        return results
+
+    def run(self, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the suite and return the results document."""
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": environment_info(),
+            "repeat": self.repeat,
+            "sources": {spec["name"]: spec for spec in specs},
+            "results": {spec["name"]: self.run_source(spec) for spec in specs},
+        }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Machine details stored with results so runs from different hosts are not compared blindly."""
+    try:
+        version = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True).stdout.split("\n")[0]
+    except FileNotFoundError:
+        version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "ffmpeg": version,
+    }
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the clip pipeline on synthetic videos")
+    parser.add_argument("--config", default="config/default.json", help="Path to configuration file")
+    parser.add_argument("--sources", help="Comma separated source names (default: all)")
+    parser.add_argument("--repeat", type=int, help="Timed runs per stage")
+    parser.add_argument("--output", help="Results file (default: <work_dir>/results-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Baseline results file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not ffmpeg_available():
+        print("ffmpeg is required to run the benchmarks", file=sys.stderr)
+        return 2
+
+    settings = ConfigManager(args.config).get_setting("benchmarks", {}) or {}
+    specs = settings.get("sources") or DEFAULT_SOURCES
+    if args.sources:
+        wanted = args.sources.split(",")
+        specs = [s for s in specs if s["name"] in wanted]
+    work_dir = settings.get("work_dir", "cache/benchmarks")
+    suite = BenchmarkSuite(work_dir, repeat=args.repeat or settings.get("repeat", 3))
+    results = suite.run(specs)
+
+    output = Path(args.output or Path(work_dir) / f"results-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+    for name, stages in results["results"].items():
+        timings = ", ".join(f"{stage} {stages[stage]['median_seconds']:.4f}s" for stage in STAGES)
+        print(f"  {name}: {timings} ({stages['scenes_detected']}/{stages['expected_cuts']} cuts found)")
+
+    baseline_path = Path(args.baseline or settings.get("baseline", Path(work_dir) / "baseline.json"))
+    if args.save_baseline:
+        shutil.copyfile(output, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    regressions = compare_results(results, json.loads(baseline_path.read_text()),
+                                  settings.get("tolerances"), settings.get("default_tolerance", 0.25),
+                                  settings.get("noise_floor_seconds", 0.01))
+    for r in regressions:
+        print(f"REGRESSION {r['source']}/{r['stage']}: {r['baseline_seconds']:.4f}s -> "
+              f"{r['current_seconds']:.4f}s (x{r['ratio']}, tolerance {r['tolerance']:.0%})")
+    if not regressions:
+        print(f"No regressions against {baseline_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
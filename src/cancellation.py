@@ -0,0 +1,116 @@
+"""
+Job cancellation module.
+
+This module provides a cancellation token that is threaded through the
+clip pipeline. Cancelling a token kills every child process registered
+with it (ffmpeg, yt-dlp, ...) and makes cooperative checkpoints raise
+JobCancelled so that the job stops within seconds.
+"""
+
+import contextvars
+import logging
+import os
+import signal
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+_current_token = contextvars.ContextVar("current_cancellation_token", default=None)
+
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint when the job's token has been cancelled."""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag that also owns the job's child processes."""
+
+    def __init__(self, kill_timeout: float = 3.0):
+        """Initialize the token."""
+        self.kill_timeout = kill_timeout
+        self.logger = logging.getLogger(__name__)
+        self.reason = ""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: List[subprocess.Popen] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Check whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Job cancelled") -> None:
+        """Request cancellation and kill all registered child processes."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            processes = list(self._processes)
+        self.logger.info(f"Cancelling job: {reason} ({len(processes)} child processes)")
+        for proc in processes:
+            self._kill(proc)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise JobCancelled(self.reason or "Job cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep until cancelled or timeout; returns True if cancelled."""
+        return self._event.wait(timeout)
+
+    def popen(self, cmd: List[str], **kwargs) -> subprocess.Popen:
+        """Start a child process that is killed when the token is cancelled."""
+        self.raise_if_cancelled()
+        if os.name == "posix":
+            # Own process group so tools that spawn helpers (yt-dlp -> ffmpeg) die together
+            kwargs.setdefault("start_new_session", True)
+        proc = subprocess.Popen(cmd, **kwargs)
+        with self._lock:
+            self._processes.append(proc)
+            cancelled = self._event.is_set()
+        if cancelled:
+            self._kill(proc)
+        return proc
+
+    def release(self, proc: subprocess.Popen) -> None:
+        """Forget a finished child process."""
+        with self._lock:
+            if proc in self._processes:
+                self._processes.remove(proc)
+
+    def _kill(self, proc: subprocess.Popen) -> None:
+        """Terminate a child process (and its group), escalating to SIGKILL."""
+        if proc.poll() is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGTERM)
+            else:
+                proc.terminate()
+            proc.wait(timeout=self.kill_timeout)
+        except subprocess.TimeoutExpired:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Return the token of the task attempt running in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def use_token(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make token the current_token() for the enclosed code."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
@@ -0,0 +1,244 @@
+"""
+Clip catalog module.
+
+This module keeps a persistent SQLite record of processing jobs, their
+source videos, the clips they produced (with transcripts and generated
+metadata) and upload outcomes, so results survive restarts and can be
+listed long after the job that made them. The database runs in WAL mode,
+so the web app can read while a job writes. Listings are filtered
+through indexes on source, status and creation time, and they are
+paginated with a keyset cursor instead of OFFSET, so a deep page costs
+the same as the first one.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source_id INTEGER REFERENCES sources(id),
+    status TEXT NOT NULL,
+    dry_run INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    clips_created INTEGER NOT NULL DEFAULT 0,
+    clips_uploaded INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs(source_id, created_at);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs(created_at);
+CREATE TABLE IF NOT EXISTS clips (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    source_id INTEGER REFERENCES sources(id),
+    clip_index INTEGER NOT NULL,
+    file_path TEXT,
+    start_seconds REAL,
+    end_seconds REAL,
+    duration REAL,
+    file_size INTEGER,
+    title TEXT,
+    description TEXT,
+    tags TEXT,
+    transcript TEXT,
+    status TEXT NOT NULL,
+    youtube_id TEXT,
+    upload_error TEXT,
+    created_at REAL NOT NULL,
+    uploaded_at REAL
+);
+CREATE INDEX IF NOT EXISTS clips_source ON clips(source_id, created_at, id);
+CREATE INDEX IF NOT EXISTS clips_status ON clips(status, created_at, id);
+CREATE INDEX IF NOT EXISTS clips_created ON clips(created_at, id);
+CREATE INDEX IF NOT EXISTS clips_job ON clips(job_id, clip_index);
+"""
+
+# Clip states
+CREATED = "created"
+UPLOADED = "uploaded"
+UPLOAD_FAILED = "upload_failed"
+DISCARDED = "discarded"
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: float, clip_id: int) -> str:
+    """Opaque cursor pointing just past a row."""
+    return f"{created_at!r}:{clip_id}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    created_at, clip_id = cursor.rsplit(":", 1)
+    return float(created_at), int(clip_id)
+
+
+class ClipCatalog:
+    """SQLite catalog of jobs, sources, clips and uploads."""
+
+    def __init__(self, path: str = "cache/catalog.db"):
+        """
+        Open (and create if needed) the catalog.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection (a forked child opens its own)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _source_id(self, conn: sqlite3.Connection, url: Optional[str]) -> Optional[int]:
+        if not url:
+            return None
+        conn.execute("INSERT OR IGNORE INTO sources (url, first_seen) VALUES (?, ?)", (url, time.time()))
+        return conn.execute("SELECT id FROM sources WHERE url = ?", (url,)).fetchone()[0]
+
+    def start_job(self, job_id: str, source_url: Optional[str], kind: str = "processing",
+                  dry_run: bool = False) -> None:
+        """Record a job as running."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, kind, source_id, status, dry_run, created_at) "
+                "VALUES (?, ?, ?, 'running', ?, ?)",
+                (job_id, kind, self._source_id(conn, source_url), int(dry_run), time.time()))
+
+    def finish_job(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """Record a job's final status; clip counts are taken from its clips."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ?, "
+                "clips_created = (SELECT COUNT(*) FROM clips WHERE job_id = jobs.id), "
+                "clips_uploaded = (SELECT COUNT(*) FROM clips WHERE job_id = jobs.id AND status = 'uploaded') "
+                "WHERE id = ?",
+                (status, time.time(), error, job_id))
+            if status == "cancelled":
+                # A cancelled run deletes its local files; only uploaded clips remain
+                conn.execute("UPDATE clips SET status = ? WHERE job_id = ? AND status != ?",
+                             (DISCARDED, job_id, UPLOADED))
+
+    def add_clip(self, job_id: str, source_url: Optional[str], clip: Dict[str, Any]) -> int:
+        """Store a clip_info dict from the pipeline and return its catalog id."""
+        if clip.get("uploaded"):
+            status = UPLOADED
+        else:
+            status = UPLOAD_FAILED if clip.get("upload_error") else CREATED
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO clips (job_id, source_id, clip_index, file_path, start_seconds, end_seconds, "
+                "duration, file_size, title, description, tags, transcript, status, youtube_id, upload_error, "
+                "created_at, uploaded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, self._source_id(conn, source_url), clip.get("index", 0), clip.get("file_path"),
+                 clip.get("start"), clip.get("end"), clip.get("duration"), clip.get("file_size"),
+                 clip.get("title"), clip.get("description"), json.dumps(clip.get("tags") or []),
+                 clip.get("transcript"), status, clip.get("youtube_id"), clip.get("upload_error"), now,
+                 now if status == UPLOADED else None))
+            return cur.lastrowid
+
+    def record_upload(self, clip_id: int, youtube_id: Optional[str] = None, error: Optional[str] = None) -> None:
+        """Record the outcome of uploading a clip."""
+        with self._connect() as conn:
+            if error is None:
+                conn.execute("UPDATE clips SET status = ?, youtube_id = ?, upload_error = NULL, uploaded_at = ? "
+                             "WHERE id = ?", (UPLOADED, youtube_id, time.time(), clip_id))
+            else:
+                conn.execute("UPDATE clips SET status = ?, upload_error = ? WHERE id = ?",
+                             (UPLOAD_FAILED, error, clip_id))
+
+    def _clip_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        clip = dict(row)
+        clip["tags"] = json.loads(clip["tags"] or "[]")
+        return clip
+
+    def get_clip(self, clip_id: int) -> Optional[Dict[str, Any]]:
+        """One clip with its source URL, or None."""
+        row = self._connect().execute(
+            "SELECT clips.*, sources.url AS source_url FROM clips LEFT JOIN sources ON sources.id = clips.source_id "
+            "WHERE clips.id = ?", (clip_id,)).fetchone()
+        return self._clip_dict(row) if row else None
+
+    def list_clips(self, source: Optional[str] = None, status: Optional[str] = None,
+                   job_id: Optional[str] = None, created_after: Optional[float] = None,
+                   created_before: Optional[float] = None, limit: int = 50, cursor: Optional[str] = None,
+                   include_total: bool = False) -> Dict[str, Any]:
+        """
+        Newest clips first, filtered by source URL, status, job and creation time.
+        Pass the returned next_cursor to get the following page. The transcript is
+        left out of listings (see get_clip). Raises ValueError for a bad cursor.
+        """
+        where, params = [], []
+        if source:
+            where.append("clips.source_id = (SELECT id FROM sources WHERE url = ?)")
+            params.append(source)
+        if status:
+            where.append("clips.status = ?")
+            params.append(status)
+        if job_id:
+            where.append("clips.job_id = ?")
+            params.append(job_id)
+        if created_after is not None:
+            where.append("clips.created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            where.append("clips.created_at < ?")
+            params.append(created_before)
+        filter_sql = " WHERE " + " AND ".join(where) if where else ""
+        filter_params = list(params)
+        if cursor:
+            where.append("(clips.created_at, clips.id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT clips.id, clips.job_id, clips.clip_index, clips.file_path, clips.start_seconds, "
+            "clips.end_seconds, clips.duration, clips.file_size, clips.title, clips.description, clips.tags, "
+            "clips.status, clips.youtube_id, clips.upload_error, clips.created_at, clips.uploaded_at, "
+            "sources.url AS source_url FROM clips LEFT JOIN sources ON sources.id = clips.source_id"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY clips.created_at DESC, clips.id DESC LIMIT ?",
+            params + [limit + 1]).fetchall()
+        page = [self._clip_dict(r) for r in rows[:limit]]
+        result = {
+            "clips": page,
+            "next_cursor": encode_cursor(page[-1]["created_at"], page[-1]["id"]) if len(rows) > limit else None,
+        }
+        if include_total:
+            result["total"] = conn.execute("SELECT COUNT(*) FROM clips" + filter_sql, filter_params).fetchone()[0]
+        return result
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs with their source URL."""
+        sql = ("SELECT jobs.*, sources.url AS source_url FROM jobs LEFT JOIN sources ON sources.id = jobs.source_id"
+               + (" WHERE jobs.status = ?" if status else "") + " ORDER BY jobs.created_at DESC LIMIT ?")
+        params = ([status] if status else []) + [max(1, min(int(limit), MAX_PAGE_SIZE))]
+        return [dict(r) for r in self._connect().execute(sql, params).fetchall()]
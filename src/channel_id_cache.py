@@ -0,0 +1,81 @@
+"""
+Channel ID cache module.
+
+This module persists the mapping from YouTube handles, legacy usernames
+and custom URLs to channel IDs, so that resolving the same channel does
+not spend search quota again. Lookups that YouTube answered with "no such
+channel" are cached too (negative caching) with a shorter lifetime.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.atomic_json import load_json, save_json
+
+
+class ChannelIdCache:
+    """Thread-safe, file-backed cache of channel lookup keys to channel IDs."""
+
+    def __init__(self, path: str = "cache/channel_ids.json",
+                 ttl: float = 30 * 24 * 3600, negative_ttl: float = 24 * 3600):
+        """
+        Initialize the cache and load existing entries.
+
+        Args:
+            path: JSON file the mapping is persisted to
+            ttl: Lifetime in seconds of a resolved channel ID
+            negative_ttl: Lifetime in seconds of a "not found" result
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._load()
+
+    @staticmethod
+    def make_key(kind: str, value: str) -> str:
+        """Build a lookup key such as 'handle:irtza' (handles are case-insensitive)."""
+        return f"{kind}:{value.strip().lstrip('@').lower()}"
+
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a key.
+        Returns (found, channel_id); channel_id is None for a cached negative result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        lifetime = self.ttl if entry["channel_id"] else self.negative_ttl
+        if time.time() - entry["resolved_at"] > lifetime:
+            return False, None
+        return True, entry["channel_id"]
+
+    def put(self, key: str, channel_id: Optional[str]) -> None:
+        """Record a resolved channel ID (or None for 'not found') and persist it."""
+        with self._lock:
+            self._entries[key] = {"channel_id": channel_id, "resolved_at": time.time()}
+            # Written under the lock so an older snapshot never lands after a newer one
+            self._save(self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _load(self) -> None:
+        """Load persisted entries, ignoring a missing or corrupt file."""
+        self._entries = load_json(self.path, {}, self.logger, "channel ID cache")
+        if self._entries:
+            self.logger.info(f"Loaded {len(self._entries)} cached channel IDs from {self.path}")
+
+    def _save(self, entries: dict) -> None:
+        """Persist entries (see save_json)."""
+        try:
+            save_json(self.path, entries, indent=2, sort_keys=True)
+        except OSError as e:
+            self.logger.error(f"Failed to save channel ID cache: {e}")
@@ -0,0 +1,140 @@
+"""
+Channel index module.
+
+This module keeps a locally persisted index of the videos on watched
+channels (ID, title, publish time, duration and Shorts flag). The index
+is refreshed incrementally: the uploads playlist is read newest first
+and listing stops at the first page that contains an already indexed
+video, and an unchanged playlist ETag skips the refresh entirely.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.atomic_json import load_json, save_json
+from src.youtube_data import YouTubeDataClient, summarize_video
+
+
+class ChannelIndex:
+    """Thread-safe, file-backed index of channel uploads."""
+
+    def __init__(self, path: str = "cache/channel_index.json", max_backfill: int = 200):
+        """
+        Initialize the index and load existing entries.
+
+        Args:
+            path: JSON file the index is persisted to
+            max_backfill: Maximum number of videos listed by the first sync of a channel
+        """
+        self.path = Path(path)
+        self.max_backfill = max_backfill
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._load()
+
+    def has_channel(self, channel_id: str) -> bool:
+        """Check whether a channel has been synced before."""
+        with self._lock:
+            return channel_id in self._channels
+
+    def videos(self, channel_id: str) -> List[Dict[str, Any]]:
+        """Return the indexed videos of a channel, newest first."""
+        with self._lock:
+            record = self._channels.get(channel_id, {})
+            videos = [dict(v, id=vid) for vid, v in record.get("videos", {}).items()]
+        videos.sort(key=lambda v: v.get("publishedAt") or "", reverse=True)
+        return videos
+
+    def status(self) -> Dict[str, Any]:
+        """Return per-channel video counts and last sync times."""
+        with self._lock:
+            return {cid: {"videos": len(r.get("videos", {})), "synced_at": r.get("synced_at")}
+                    for cid, r in self._channels.items()}
+
+    def sync_channel(self, client: YouTubeDataClient, channel_id: str,
+                     api_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Bring a channel's index up to date.
+        Returns the newly indexed videos (oldest first), or None if the API failed.
+        """
+        with self._lock:
+            record = dict(self._channels.get(channel_id) or {"videos": {}})
+        known = set(record["videos"])
+
+        playlist_id = record.get("uploads_playlist") or client.uploads_playlist_id(channel_id, api_key)
+        if not playlist_id:
+            return None
+        page = client.playlist_page(playlist_id, api_key)
+        if page is None:
+            return None
+
+        # An unchanged first page means no new uploads
+        etag = page.get("etag")
+        if etag and etag == record.get("playlist_etag"):
+            self._update(channel_id, record, playlist_id, etag, [])
+            return []
+
+        limit = self.max_backfill if not known else float("inf")
+        new_ids = {}
+        while page is not None:
+            reached_known = False
+            for item in page.get("items", []):
+                cd = item.get("contentDetails", {})
+                vid = cd.get("videoId")
+                if not vid:
+                    continue
+                if vid in known:
+                    reached_known = True
+                elif vid not in new_ids and len(new_ids) < limit:
+                    new_ids[vid] = cd.get("videoPublishedAt")
+            next_token = page.get("nextPageToken")
+            if reached_known or not next_token or len(new_ids) >= limit:
+                break
+            page = client.playlist_page(playlist_id, api_key, page_token=next_token)
+            if page is None:
+                return None
+
+        new_videos = []
+        if new_ids:
+            details = client.video_details(list(new_ids), api_key)
+            if details is None:
+                return None
+            new_videos = [summarize_video(item, new_ids.get(item.get("id"))) for item in details]
+            new_videos.sort(key=lambda v: v.get("publishedAt") or "")
+
+        self._update(channel_id, record, playlist_id, etag, new_videos)
+        self.logger.info(f"Synced channel {channel_id}: {len(new_videos)} new videos")
+        return new_videos
+
+    def _update(self, channel_id: str, record: Dict[str, Any], playlist_id: str,
+                etag: Optional[str], new_videos: List[Dict[str, Any]]) -> None:
+        """Merge sync results into the index and persist it."""
+        videos = dict(record["videos"])
+        for video in new_videos:
+            videos[video["id"]] = {k: video[k] for k in ("title", "publishedAt", "durationSeconds", "isShort")}
+        with self._lock:
+            self._channels[channel_id] = {
+                "uploads_playlist": playlist_id,
+                "playlist_etag": etag,
+                "synced_at": time.time(),
+                "videos": videos,
+            }
+            # Written under the lock so an older snapshot never lands after a newer one
+            self._save(self._channels)
+
+    def _load(self) -> None:
+        """Load the persisted index, ignoring a missing or corrupt file."""
+        self._channels = load_json(self.path, {}, self.logger, "channel index")
+        if self._channels:
+            self.logger.info(f"Loaded channel index for {len(self._channels)} channels from {self.path}")
+
+    def _save(self, channels: dict) -> None:
+        """Persist the index (see save_json)."""
+        try:
+            save_json(self.path, channels, indent=2, sort_keys=True)
+        except OSError as e:
+            self.logger.error(f"Failed to save channel index: {e}")
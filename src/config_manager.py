@@ -2,13 +2,77 @@
 Configuration management module.
 
 This module handles loading and managing configuration settings
-for the automation framework.
+for the automation framework. The configuration file can be watched for
+changes: a changed file is parsed and validated in full before it
+replaces the running configuration, and subscribers are then notified
+so they can pick up new limits and thresholds between jobs.
 """
 
 import json
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+
+WHISPER_MODELS = ("tiny", "base", "small", "medium", "large", "auto")
+
+
+def _check_number(errors: List[str], config: Dict[str, Any], key: str, low: Optional[float] = None,
+                  high: Optional[float] = None, integer: bool = False, allow_auto: bool = False) -> None:
+    """Validate an optional dotted-path setting's type and range."""
+    value = config
+    for k in key.split("."):
+        if not isinstance(value, dict) or k not in value:
+            return
+        value = value[k]
+    if allow_auto and value == "auto":
+        return
+    kind = int if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, kind):
+        errors.append(f"{key} must be {'an integer' if integer else 'a number'}, got {value!r}")
+    elif (low is not None and value < low) or (high is not None and value > high):
+        errors.append(f"{key} must be between {low} and {high}, got {value}")
+
+
+def validate_config(config: Any) -> List[str]:
+    """Return the problems found in a configuration (empty if it is usable)."""
+    if not isinstance(config, dict):
+        return ["configuration must be a JSON object"]
+    errors = []
+    for section in ("task_settings", "automation_settings", "scheduler"):
+        if section in config and not isinstance(config[section], dict):
+            errors.append(f"{section} must be an object")
+    if errors:
+        return errors
+    for name, settings in config.get("task_settings", {}).items():
+        if not isinstance(settings, dict):
+            errors.append(f"task_settings.{name} must be an object")
+    if errors:
+        return errors
+
+    clip = "task_settings.clip_uploader"
+    _check_number(errors, config, f"{clip}.scene_threshold", 0.0, 1.0)
+    _check_number(errors, config, f"{clip}.max_clips", 1, 100, integer=True)
+    _check_number(errors, config, f"{clip}.min_clip_seconds", 1, 3600)
+    _check_number(errors, config, f"{clip}.max_clip_seconds", 1, 3600)
+    _check_number(errors, config, f"{clip}.batch.max_concurrent_videos", 1, 64, integer=True)
+    for kind in ("download", "encode", "asr"):
+        _check_number(errors, config, f"{clip}.batch.budget.{kind}", 1, 64, integer=True, allow_auto=True)
+    model = config.get("task_settings", {}).get("clip_uploader", {}).get("whisper_model")
+    if model is not None and model not in WHISPER_MODELS:
+        errors.append(f"{clip}.whisper_model must be one of {', '.join(WHISPER_MODELS)}, got {model!r}")
+    _check_number(errors, config, "scheduler.max_workers", 1, 256, integer=True)
+    for kind in (config.get("scheduler", {}).get("resource_limits") or {}):
+        _check_number(errors, config, f"scheduler.resource_limits.{kind}", 1, 256, integer=True)
+    for key in ("max_retries", "retry_delay", "retry_backoff", "retry_max_delay", "timeout"):
+        _check_number(errors, config, f"automation_settings.{key}", 0)
+    _check_number(errors, config, "automation_settings.retry_jitter", 0, 1)
+    isolation = config.get("automation_settings", {}).get("isolation")
+    if isolation is not None and isolation not in ("thread", "process"):
+        errors.append(f"automation_settings.isolation must be 'thread' or 'process', got {isolation!r}")
+    return errors
 
 
 class ConfigManager:
@@ -20,15 +84,22 @@ class ConfigManager:
         self.logger = logging.getLogger(__name__)
         self.config = {}
         self._loaded = False
+        self._subscribers = []
+        self._file_state = None
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
         self.load_config()
     
     def load_config(self) -> None:
         """Load configuration from file."""
         try:
             if self.config_path.exists():
+                self._file_state = self._stat()
                 with open(self.config_path, 'r') as f:
                     self.config = json.load(f)
                 self.logger.info(f"Configuration loaded from {self.config_path}")
+                for error in validate_config(self.config):
+                    self.logger.warning(f"Invalid setting: {error}")
             else:
                 # Use default configuration
                 self.config = self._get_default_config()
@@ -66,7 +137,11 @@ class ConfigManager:
             "automation_settings": {
                 "max_retries": 3,
                 "retry_delay": 5,
-                "timeout": 300
+                "retry_backoff": 2,
+                "retry_max_delay": 300,
+                "retry_jitter": 0.5,
+                "timeout": 300,
+                "isolation": "thread"
             }
         }
     
@@ -121,9 +196,83 @@ class ConfigManager:
         """Check if configuration was loaded successfully."""
         return self._loaded
     
-    def reload_config(self) -> None:
-        """Reload configuration from file."""
-        self.load_config()
+    def reload_config(self) -> bool:
+        """
+        Reload configuration from file. The new configuration replaces the
+        current one only if it parses and validates; subscribers are notified
+        when it changed. Returns True if a new configuration was applied.
+        """
+        state = self._stat()
+        try:
+            with open(self.config_path, 'r') as f:
+                new_config = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Not reloading configuration: {e}")
+            self._file_state = state
+            return False
+        self._file_state = state
+        errors = validate_config(new_config)
+        if errors:
+            self.logger.error(f"Not reloading configuration, keeping the current one: {'; '.join(errors)}")
+            return False
+        if new_config == self.config:
+            return False
+        old_config, self.config = self.config, new_config
+        self._loaded = True
+        self.logger.info(f"Configuration reloaded from {self.config_path}")
+        for callback in list(self._subscribers):
+            try:
+                callback(new_config, old_config)
+            except Exception as e:
+                self.logger.error(f"Configuration subscriber failed: {e}")
+        return True
+    
+    def subscribe(self, callback: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> None:
+        """Call callback(new_config, old_config) after each successful reload."""
+        self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> None:
+        """Stop notifying a subscriber."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def _stat(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def check_for_changes(self) -> bool:
+        """Reload if the file changed since it was last read; returns True if a new configuration was applied."""
+        state = self._stat()
+        if state is None or state == self._file_state:
+            return False
+        return self.reload_config()
+    
+    def start_watching(self, interval_seconds: float = 2.0) -> None:
+        """Poll the configuration file in a background thread and reload it when it changes."""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+        
+        def watch():
+            while not self._watch_stop.wait(interval_seconds):
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    self.logger.error(f"Configuration watch failed: {e}")
+        
+        self._watch_thread = threading.Thread(target=watch, name="config-watch", daemon=True)
+        self._watch_thread.start()
+        self.logger.info(f"Watching {self.config_path} for changes every {interval_seconds:g}s")
+    
+    def stop_watching(self) -> None:
+        """Stop the watch thread."""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5)
+            self._watch_thread = None
     
     def get_task_setting(self, task_name: str, setting_key: str, default: Any = None) -> Any:
         """Get a setting for a specific task."""
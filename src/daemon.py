@@ -0,0 +1,292 @@
+"""
+Daemon module.
+
+This module keeps the automation framework running and feeds the clip
+uploader from an inbox directory and/or a queue file, so the interpreter,
+the Whisper model and the YouTube client are loaded once instead of once
+per video. Watching is plain polling kept cheap: the inbox is only listed
+again when its mtime changes, only files that are still settling are
+stat()ed, and a file is processed once its size and mtime have stayed
+the same for settle_seconds (i.e. it has stopped growing).
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.batch import video_slug
+from src.cancellation import current_token
+from src.task_execution import run_attempt
+
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm", ".avi", ".m4v", ".ts", ".flv")
+
+logger = logging.getLogger(__name__)
+
+
+class InboxWatcher:
+    """Reports new video files in a directory once they have stopped growing."""
+
+    def __init__(self, inbox: str, settle_seconds: float = 10.0, extensions=VIDEO_EXTENSIONS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the watcher.
+
+        Args:
+            inbox: Directory to watch (subdirectories and dotfiles are ignored)
+            settle_seconds: How long size and mtime must stay unchanged
+            extensions: File suffixes treated as videos
+            clock: Monotonic time source
+        """
+        self.inbox = Path(inbox)
+        self.settle_seconds = settle_seconds
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.clock = clock
+        self._dir_mtime = None
+        # path -> (size, mtime_ns, unchanged since)
+        self._pending = {}
+        self._reported = set()
+
+    def _scan(self, now: float) -> None:
+        """List the inbox and start tracking files not seen before."""
+        present = set()
+        with os.scandir(self.inbox) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.lower().endswith(self.extensions):
+                    continue
+                if not entry.is_file():
+                    continue
+                present.add(entry.path)
+                if entry.path not in self._pending and entry.path not in self._reported:
+                    self._pending[entry.path] = (None, None, now)
+        # Forget files that were moved away, so a new file with the same name counts again
+        self._reported &= present
+        for path in set(self._pending) - present:
+            del self._pending[path]
+
+    def poll(self) -> List[Path]:
+        """Return the files that became ready since the last poll, oldest name first."""
+        now = self.clock()
+        try:
+            dir_mtime = os.stat(self.inbox).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        # Creating, renaming or deleting an entry changes the directory mtime;
+        # a file growing in place does not, which is why pending files are stat()ed
+        if dir_mtime != self._dir_mtime:
+            self._dir_mtime = dir_mtime
+            self._scan(now)
+
+        ready = []
+        for path, (size, mtime, since) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[path]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (st.st_size, st.st_mtime_ns, now)
+            elif now - since >= self.settle_seconds:
+                del self._pending[path]
+                self._reported.add(path)
+                ready.append(Path(path))
+        return sorted(ready)
+
+    def pending(self) -> int:
+        """Number of files still settling."""
+        return len(self._pending)
+
+
+class QueueFile:
+    """Reads sources (URLs or paths) appended to a text file, one per line."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the reader.
+
+        The read position is kept in <path>.offset and advanced as each entry
+        is handled (see advance), so entries are processed once across daemon
+        restarts, and entries not yet handled are read again after a crash or
+        stop. Truncating the file starts over at the top.
+        """
+        self.path = Path(path)
+        self.offset_path = self.path.with_name(self.path.name + ".offset")
+        self._stat = None
+        # File offsets just past each entry returned by the last poll and not yet handled
+        self._ends = []
+        try:
+            self.offset = int(self.offset_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            self.offset = 0
+
+    def poll(self) -> List[str]:
+        """
+        Return entries after the saved position (complete lines only). Call
+        advance() after handling each one; unhandled entries are returned again.
+        """
+        if self._ends:
+            self._stat = None
+            self._ends = []
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if (st.st_size, st.st_mtime_ns) == self._stat:
+            return []
+        self._stat = (st.st_size, st.st_mtime_ns)
+        if st.st_size < self.offset:
+            logger.info(f"Queue file {self.path} was truncated; reading from the start")
+            self._save(0)
+        if st.st_size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        # Leave a partly written last line for the next poll
+        end = data.rfind(b"\n") + 1
+        if not end:
+            self._stat = None
+            return []
+        entries = []
+        pos = 0
+        for raw in data[:end].splitlines(keepends=True):
+            pos += len(raw)
+            line = raw.decode("utf-8", errors="replace").split("#", 1)[0].strip()
+            if line:
+                entries.append(line)
+                self._ends.append(self.offset + pos)
+        if self._ends:
+            # Trailing comments and blank lines are passed with the last entry
+            self._ends[-1] = self.offset + end
+        else:
+            self._save(self.offset + end)
+        return entries
+
+    def advance(self) -> None:
+        """Record the oldest entry returned by poll() as handled."""
+        if self._ends:
+            self._save(self._ends.pop(0))
+
+    def _save(self, offset: int) -> None:
+        self.offset = offset
+        self.offset_path.write_text(str(offset))
+
+
+class ClipDaemon:
+    """Long-running loop that clips every video arriving in the inbox or queue file."""
+
+    def __init__(self, framework: Any, settings: Dict[str, Any], stop_event: Optional[threading.Event] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            framework: AutomationFramework whose clip uploader is kept resident
+            settings: The 'daemon' configuration section
+            stop_event: Event that ends run(); one is created if not given
+        """
+        self.framework = framework
+        self.settings = settings
+        self.logger = logging.getLogger(__name__)
+        self.stop_event = stop_event or threading.Event()
+        self.poll_interval = float(settings.get("poll_interval", 2.0))
+        self.dry_run = settings.get("dry_run", True)
+        self.timeout = settings.get("timeout")
+        self.processed_dir = settings.get("processed_dir") or None
+        self.failed_dir = settings.get("failed_dir") or None
+
+        self.uploader = framework.clip_uploader
+        self.uploader.resident = True
+        self.watcher = None
+        if settings.get("inbox"):
+            Path(settings["inbox"]).mkdir(parents=True, exist_ok=True)
+            self.watcher = InboxWatcher(settings["inbox"], settings.get("settle_seconds", 10.0),
+                                        settings.get("extensions") or VIDEO_EXTENSIONS)
+        self.queue = QueueFile(settings["queue_file"]) if settings.get("queue_file") else None
+        self.processed = 0
+        self.failed = 0
+
+    def process(self, source: str) -> Dict[str, Any]:
+        """Clip one source under the daemon timeout and return the pipeline results."""
+        uploader = self.uploader
+        # Directories per source so clip_000.mp4 of the next video does not overwrite it;
+        # passed per call, as scheduled tasks share this uploader
+        slug = video_slug(source)
+        clip_dir, tmp_dir = uploader.CLIP_DIR / slug, uploader.TMP_DIR / slug
+        outcome = {}
+
+        def attempt():
+            outcome["results"] = uploader.process_video(source, dry_run=self.dry_run, cancel_token=current_token(),
+                                                        clip_dir=clip_dir, tmp_dir=tmp_dir)
+            return not outcome["results"]["errors"]
+
+        start = time.monotonic()
+        # Thread isolation keeps the resident model in this process
+        success, error, _ = run_attempt(attempt, self.timeout, "thread")
+        results = outcome.get("results") or {"url": source, "clips_created": 0, "clips_uploaded": 0,
+                                             "errors": [error or "processing failed"]}
+        duration = time.monotonic() - start
+        self.framework.metrics.record_duration("daemon.video", duration)
+        self.framework.metrics.record_outcome("daemon", "success" if success else "error")
+        if success:
+            self.processed += 1
+            self.logger.info(f"Processed {source}: {results['clips_created']} clips created, "
+                             f"{results['clips_uploaded']} uploaded ({duration:.1f}s)")
+        else:
+            self.failed += 1
+            self.logger.error(f"Processing failed for {source}: {'; '.join(results['errors'])}")
+        return results
+
+    def _archive(self, path: Path, success: bool) -> None:
+        """Move a processed inbox file out of the way so it is not picked up again."""
+        target_dir = self.processed_dir if success else self.failed_dir
+        if not target_dir:
+            return
+        target = Path(target_dir) / path.name
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(path), str(target))
+        except OSError as e:
+            self.logger.warning(f"Could not move {path} to {target_dir}: {e}")
+
+    def poll_once(self) -> int:
+        """Process everything that is ready now; returns how many sources were handled."""
+        handled = 0
+        if self.watcher is not None:
+            for path in self.watcher.poll():
+                if self.stop_event.is_set():
+                    break
+                results = self.process(str(path))
+                self._archive(path, not results["errors"])
+                handled += 1
+        if self.queue is not None and not self.stop_event.is_set():
+            for source in self.queue.poll():
+                if self.stop_event.is_set():
+                    break
+                self.process(source)
+                self.queue.advance()
+                handled += 1
+        return handled
+
+    def run(self) -> None:
+        """Poll and process until stop() is called; scheduled tasks run alongside."""
+        sources = [str(s) for s in (self.watcher and self.watcher.inbox, self.queue and self.queue.path) if s]
+        self.logger.info(f"Daemon watching {', '.join(sources) or 'nothing'} every {self.poll_interval:g}s")
+        scheduled = self.framework.start_scheduled_tasks()
+        if scheduled:
+            self.logger.info(f"Daemon running scheduled tasks: {', '.join(scheduled)}")
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"Daemon poll failed: {e}")
+            self.stop_event.wait(self.poll_interval)
+        self.framework.stop_periodic_tasks()
+        self.logger.info(f"Daemon stopped: {self.processed} processed, {self.failed} failed")
+
+    def stop(self) -> None:
+        """Ask run() to return after the current video."""
+        self.stop_event.set()
@@ -0,0 +1,233 @@
+"""
+Hardware probing module.
+
+This module measures the machine the pipeline runs on: usable CPUs, free
+memory, free disk on the video directories, the ffmpeg encoders and
+filters available, and how fast ffmpeg decodes a short synthetic H.264
+clip. From this it derives recommended values for the number of
+concurrent extraction (ffmpeg) and ASR (Whisper) workers and the Whisper
+model size, which the pipeline uses as defaults when the configuration
+says "auto".
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+
+# Approximate resident memory of one loaded Whisper model on CPU, in GB
+WHISPER_MODEL_MEMORY_GB = {
+    "tiny": 1.0,
+    "base": 1.0,
+    "small": 2.0,
+    "medium": 5.0,
+    "large": 10.0,
+}
+# Smallest core count worth using each model on CPU (larger models are slower than real time below this)
+WHISPER_MODEL_MIN_CPUS = {
+    "tiny": 1,
+    "base": 2,
+    "small": 4,
+    "medium": 8,
+    "large": 16,
+}
+# Memory one concurrent ffmpeg extraction/preview job may need, in GB
+FFMPEG_JOB_MEMORY_GB = 0.5
+
+HARDWARE_ENCODERS = ("h264_nvenc", "hevc_nvenc", "h264_qsv", "h264_vaapi", "h264_videotoolbox", "h264_amf")
+REQUIRED_FILTERS = ("select", "showinfo", "scale", "tile")
+
+logger = logging.getLogger(__name__)
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on (respects affinity masks and containers' cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def memory_info() -> Dict[str, Optional[float]]:
+    """Total and available memory in GB (None when unknown)."""
+    if PSUTIL_AVAILABLE:
+        vm = psutil.virtual_memory()
+        return {"total_gb": round(vm.total / 1024 ** 3, 2), "available_gb": round(vm.available / 1024 ** 3, 2)}
+    try:
+        fields = {}
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                fields[name] = int(value.split()[0]) * 1024
+        available = fields.get("MemAvailable", fields.get("MemFree", 0))
+        return {"total_gb": round(fields["MemTotal"] / 1024 ** 3, 2), "available_gb": round(available / 1024 ** 3, 2)}
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        return {"total_gb": round(total / 1024 ** 3, 2), "available_gb": None}
+    except (AttributeError, ValueError, OSError):
+        return {"total_gb": None, "available_gb": None}
+
+
+def disk_info(paths: List[str]) -> Dict[str, Dict[str, float]]:
+    """Free and total space (GB) of the filesystem holding each path."""
+    disks = {}
+    for path in paths:
+        probe = Path(path)
+        while not probe.exists() and probe != probe.parent:
+            probe = probe.parent
+        usage = shutil.disk_usage(probe)
+        disks[path] = {"free_gb": round(usage.free / 1024 ** 3, 2), "total_gb": round(usage.total / 1024 ** 3, 2)}
+    return disks
+
+
+def _ffmpeg_list(flag: str) -> List[str]:
+    """Names from `ffmpeg -encoders` / `-filters` (the second column of each entry line)."""
+    out = subprocess.run(["ffmpeg", "-hide_banner", flag], capture_output=True, text=True, timeout=30).stdout
+    names = []
+    for line in out.splitlines():
+        parts = line.split()
+        # Entries are "<flags> <name> ..."; legend lines read "<flag> = <meaning>"
+        if len(parts) >= 2 and parts[1] != "=":
+            names.append(parts[1])
+    return names
+
+
+def ffmpeg_capabilities() -> Dict[str, Any]:
+    """ffmpeg version, hardware encoders and whether the filters the pipeline needs exist."""
+    if shutil.which("ffmpeg") is None:
+        return {"available": False}
+    try:
+        version = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True,
+                                 timeout=30).stdout.split("\n")[0]
+        encoders = _ffmpeg_list("-encoders")
+        filters = _ffmpeg_list("-filters")
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not query ffmpeg: {e}")
+        return {"available": False}
+    return {
+        "available": True,
+        "version": version,
+        "libx264": "libx264" in encoders,
+        "hardware_encoders": [e for e in HARDWARE_ENCODERS if e in encoders],
+        "missing_filters": [f for f in REQUIRED_FILTERS if f not in filters],
+    }
+
+
+def decode_benchmark(seconds: float = 3.0, size: str = "1280x720", fps: int = 30) -> Optional[Dict[str, float]]:
+    """
+    Encode a short synthetic clip, then time how fast ffmpeg decodes it.
+    Returns decoded frames per second and the speed relative to real time,
+    or None if ffmpeg is unavailable or fails.
+    """
+    if shutil.which("ffmpeg") is None:
+        return None
+    with tempfile.TemporaryDirectory(prefix="hwprobe-") as tmp:
+        sample = os.path.join(tmp, "sample.mp4")
+        encode = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-f", "lavfi",
+                  "-i", f"testsrc2=size={size}:rate={fps}", "-t", str(seconds),
+                  "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", sample]
+        decode = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-threads", "1", "-i", sample, "-f", "null", "-"]
+        try:
+            subprocess.run(encode, capture_output=True, check=True, timeout=120)
+            start = time.perf_counter()
+            subprocess.run(decode, capture_output=True, check=True, timeout=120)
+            elapsed = max(time.perf_counter() - start, 1e-6)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Decode benchmark failed: {e}")
+            return None
+    return {
+        "resolution": size,
+        "frames_per_second": round(seconds * fps / elapsed, 1),
+        "realtime_factor": round(seconds / elapsed, 2),
+    }
+
+
+def recommend(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive pipeline defaults from a probe: extraction workers (ffmpeg jobs at
+    once), ASR workers (Whisper transcriptions at once) and the Whisper model.
+    """
+    cpus = profile["cpu_count"]
+    available = profile["memory"].get("available_gb") or profile["memory"].get("total_gb") or 2.0
+
+    # Largest model that the cores can run and that fits in half the free memory
+    model = "tiny"
+    for name in ("base", "small", "medium", "large"):
+        if cpus >= WHISPER_MODEL_MIN_CPUS[name] and WHISPER_MODEL_MEMORY_GB[name] <= available / 2:
+            model = name
+    model_memory = WHISPER_MODEL_MEMORY_GB[model]
+    # Whisper (PyTorch) already uses several threads per transcription
+    asr_workers = max(1, min(cpus // 4, int(available / 2 // model_memory), 2))
+
+    # Clip extraction is mostly stream copy; scene detection and previews decode
+    extraction_workers = max(1, min(cpus // 2, int((available - asr_workers * model_memory) // FFMPEG_JOB_MEMORY_GB), 4))
+    decode = profile.get("decode_benchmark")
+    if decode and decode["realtime_factor"] < 2:
+        # Decoding barely outruns real time: parallel decodes would just contend
+        extraction_workers = 1
+    return {
+        "extraction_workers": extraction_workers,
+        "asr_workers": asr_workers,
+        "whisper_model": model,
+    }
+
+
+def probe(video_dirs: List[str], benchmark_seconds: float = 3.0) -> Dict[str, Any]:
+    """Measure this machine and attach the recommended pipeline settings."""
+    profile = {
+        "probed_at": time.time(),
+        "cpu_count": cpu_count(),
+        "memory": memory_info(),
+        "disk": disk_info(video_dirs),
+        "ffmpeg": ffmpeg_capabilities(),
+        "decode_benchmark": decode_benchmark(benchmark_seconds) if benchmark_seconds else None,
+    }
+    profile["recommended"] = recommend(profile)
+    return profile
+
+
+def save_profile(profile: Dict[str, Any], path: str) -> None:
+    """Write a probe result atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_recommendations(path: str) -> Dict[str, Any]:
+    """Recommended settings from the last saved probe, or {} if there is none."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")).get("recommended", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def resolve_pipeline_settings(task_config: Dict[str, Any], recommended: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Whisper model and batch budget for the clip uploader: explicit settings
+    win, "auto" (or missing) falls back to the recommendation, then to the
+    built-in defaults.
+    """
+    model = task_config.get("whisper_model", "auto")
+    if model in (None, "", "auto"):
+        model = recommended.get("whisper_model")
+    budget = {k: v for k, v in (task_config.get("batch", {}).get("budget") or {}).items() if v != "auto"}
+    for kind, key in (("encode", "extraction_workers"), ("asr", "asr_workers")):
+        if kind not in budget and recommended.get(key):
+            budget[kind] = recommended[key]
+    return {"whisper_model": model, "budget": budget}
@@ -0,0 +1,199 @@
+"""
+Pooled HTTP client module.
+
+This module provides a small keep-alive HTTP client on top of
+http.client. Connections are pooled per host and reused across requests
+(and threads), requests have timeouts, and transient failures are
+retried with exponential backoff.
+"""
+
+import http.client
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class HTTPResponse:
+    """A fully read HTTP response (header names are lower-cased)."""
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body.decode("utf-8"))
+
+
+class PooledHTTPClient:
+    """Thread-safe HTTP/1.1 client with per-host keep-alive connection pools."""
+
+    def __init__(self, max_idle_per_host: int = 8, timeout: float = 10.0,
+                 retries: int = 2, backoff: float = 0.5, max_retry_after: float = 30.0,
+                 user_agent: str = "Mozilla/5.0 (AutomationWithIrtza/1.0)"):
+        """
+        Initialize the client.
+
+        Args:
+            max_idle_per_host: Idle connections kept open per host
+            timeout: Connect/read timeout in seconds
+            retries: Extra attempts for connection errors and retryable statuses
+            backoff: Base delay in seconds for exponential backoff
+            max_retry_after: Longest Retry-After honored; a longer one returns the response instead
+            user_agent: User-Agent header sent with every request
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.user_agent = user_agent
+        self.logger = logging.getLogger(__name__)
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "retries": 0}
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """
+        Perform a GET request.
+        Raises OSError or http.client.HTTPException when all attempts fail
+        at the connection level; HTTP error statuses are returned, not raised.
+        """
+        parts = urlsplit(url)
+        host_key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        request_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "identity"}
+        request_headers.update(headers or {})
+
+        attempt = 0
+        stale_retried = False
+        while True:
+            conn, reused = self._acquire(host_key)
+            try:
+                conn.request("GET", path, headers=request_headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                # A reused keep-alive connection may have been closed by the server; retry once
+                # on a new connection (dropping the other idle ones, likely closed too)
+                if reused and not stale_retried:
+                    stale_retried = True
+                    self._discard_idle(host_key)
+                    continue
+                if attempt >= self.retries:
+                    raise
+                self._sleep_before_retry(attempt, f"{type(e).__name__}: {e}")
+                attempt += 1
+                continue
+
+            with self._lock:
+                self._stats["requests"] += 1
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(host_key, conn)
+
+            if resp.status in RETRY_STATUSES and attempt < self.retries:
+                retry_after = resp.getheader("Retry-After")
+                if retry_after and retry_after.isdigit() and float(retry_after) > self.max_retry_after:
+                    # Do not hold the caller (e.g. a web request) for that long
+                    self.logger.warning(f"HTTP {resp.status} with Retry-After {retry_after}s; not retrying")
+                else:
+                    self._sleep_before_retry(attempt, f"HTTP {resp.status}", retry_after)
+                    attempt += 1
+                    continue
+            return HTTPResponse(resp.status, {k.lower(): v for k, v in resp.getheaders()}, body)
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        """GET a URL and decode a 200 response as JSON; returns None otherwise."""
+        resp = self.get(url, headers)
+        if resp.status != 200:
+            return None
+        return resp.json()
+
+    def stats(self) -> Dict[str, int]:
+        """Return request and connection counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle_connections"] = sum(p.qsize() for p in self._pools.values())
+        return stats
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def _acquire(self, host_key: Tuple[str, str, Optional[int]]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection for a host, or open a new one."""
+        with self._lock:
+            pool = self._pools.setdefault(host_key, queue.LifoQueue())
+        try:
+            conn = pool.get_nowait()
+            with self._lock:
+                self._stats["connections_reused"] += 1
+            return conn, True
+        except queue.Empty:
+            pass
+        scheme, host, port = host_key
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self._stats["connections_opened"] += 1
+        return conn_class(host, port, timeout=self.timeout), False
+
+    def _discard_idle(self, host_key: Tuple[str, str, Optional[int]]) -> None:
+        """Close a host's idle connections."""
+        with self._lock:
+            pool = self._pools.get(host_key)
+        while pool is not None:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _release(self, host_key: Tuple[str, str, Optional[int]], conn: http.client.HTTPConnection) -> None:
+        """Return a connection to its host pool, closing it if the pool is full."""
+        with self._lock:
+            pool = self._pools.get(host_key)
+        if pool is None or pool.qsize() >= self.max_idle_per_host:
+            conn.close()
+            return
+        pool.put(conn)
+
+    def _sleep_before_retry(self, attempt: int, reason: str, retry_after: Optional[str] = None) -> None:
+        """Sleep with exponential backoff and jitter (or honor Retry-After)."""
+        delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        with self._lock:
+            self._stats["retries"] += 1
+        self.logger.warning(f"HTTP request failed ({reason}); retrying in {delay:.2f}s")
+        time.sleep(delay)
+
+
+def fan_out(executor: ThreadPoolExecutor, calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """Run independent calls concurrently and return their results by name."""
+    futures = {name: executor.submit(call) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
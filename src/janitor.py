@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Disk janitor module.
+
+This module evicts pipeline artifacts (downloaded sources in videos/tmp,
+clips in videos/clips, previews, traces, profiles and batch reports)
+so they cannot fill the disk mid-encode. Files are removed when their
+last access is older than a TTL, and then least recently used first until
+the artifacts fit under a size cap and the filesystem has the required
+free space. Artifacts of running jobs (directories holding a live
+in-use marker), files written in the last few minutes and clips that
+have not been uploaded yet are never removed.
+
+Usage:
+    python src/janitor.py [--dry-run] [--json]
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+DEFAULT_TARGETS = ["videos/tmp", "videos/clips", "videos/previews", "cache/traces", "cache/profiles", "cache/batches"]
+# Targets whose videos wait for upload (see protect_unuploaded_hours)
+DEFAULT_CLIP_DIRS = ["videos/clips"]
+
+# Marker files a running job leaves in the directories it writes to
+IN_USE_PREFIX = ".in-use-"
+# Per-directory record of clips already uploaded to YouTube
+UPLOAD_LEDGER = ".uploaded.json"
+CLIP_SUFFIXES = (".mp4", ".mkv", ".mov", ".webm")
+
+GB = 1024 ** 3
+
+logger = logging.getLogger(__name__)
+_marker_ids = itertools.count()
+_ledger_lock = threading.Lock()
+
+
+def _marker_live(name: str) -> bool:
+    """True if an in-use marker belongs to a running process."""
+    try:
+        pid = int(name[len(IN_USE_PREFIX):].split("-")[0])
+        os.kill(pid, 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def acquire(paths: Iterable[Path]) -> List[Path]:
+    """
+    Mark directories as in use by this process; returns the marker files for
+    release(). Markers are files, so jobs in forked or separate processes
+    are protected too.
+    """
+    markers = []
+    for path in paths:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        marker = path / f"{IN_USE_PREFIX}{os.getpid()}-{next(_marker_ids)}"
+        marker.touch()
+        markers.append(marker)
+    return markers
+
+
+def release(markers: Iterable[Path]) -> None:
+    """Remove markers created by acquire()."""
+    for marker in markers:
+        try:
+            marker.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def in_use(*paths: Path) -> Iterator[None]:
+    """Protect directories from the janitor for the duration of a block."""
+    markers = acquire(paths)
+    try:
+        yield
+    finally:
+        release(markers)
+
+
+def mark_uploaded(file_path: str, video_id: Optional[str] = None) -> None:
+    """Record a clip as uploaded, which makes it evictable."""
+    path = Path(file_path)
+    ledger = path.parent / UPLOAD_LEDGER
+    with _ledger_lock:
+        try:
+            entries = json.loads(ledger.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            entries = {}
+        entries[path.name] = {"youtube_id": video_id, "uploaded_at": time.time(),
+                              "mtime": path.stat().st_mtime if path.exists() else None}
+        tmp = ledger.with_name(ledger.name + ".tmp")
+        tmp.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+        tmp.replace(ledger)
+
+
+def _uploaded(ledger_cache: Dict[Path, Dict[str, Any]], path: Path, mtime: float) -> bool:
+    """True if the ledger lists this clip (and it has not been overwritten since)."""
+    directory = path.parent
+    if directory not in ledger_cache:
+        try:
+            ledger_cache[directory] = json.loads((directory / UPLOAD_LEDGER).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            ledger_cache[directory] = {}
+    entry = ledger_cache[directory].get(path.name)
+    return bool(entry) and (entry.get("mtime") is None or abs(entry["mtime"] - mtime) < 1)
+
+
+class DiskJanitor:
+    """Plans and performs eviction of pipeline artifacts."""
+
+    def __init__(self, targets: Optional[List[str]] = None, max_age_hours: Optional[float] = None,
+                 max_total_gb: Optional[float] = None, min_free_gb: Optional[float] = None,
+                 grace_minutes: float = 10, protect_unuploaded_hours: Optional[float] = 168,
+                 clip_dirs: Optional[List[str]] = None):
+        """
+        Initialize the janitor.
+
+        Args:
+            targets: Directories to manage
+            max_age_hours: Evict files not accessed for this long (None = no TTL)
+            max_total_gb: Evict least recently used files until the targets fit (None = no cap)
+            min_free_gb: Evict least recently used files until the filesystem has this much free
+            grace_minutes: Never evict files modified more recently than this
+            protect_unuploaded_hours: Keep clips without an upload record for this long
+                (None = until uploaded)
+            clip_dirs: Directories holding clips that wait for upload
+        """
+        self.targets = [Path(t) for t in (targets or DEFAULT_TARGETS)]
+        self.clip_dirs = [Path(d).resolve() for d in (clip_dirs or DEFAULT_CLIP_DIRS)]
+        self.max_age = max_age_hours * 3600 if max_age_hours else None
+        self.max_total = int(max_total_gb * GB) if max_total_gb else None
+        self.min_free = int(min_free_gb * GB) if min_free_gb else None
+        self.grace = grace_minutes * 60
+        self.protect_unuploaded = protect_unuploaded_hours * 3600 if protect_unuploaded_hours is not None else None
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "DiskJanitor":
+        """Build a janitor from task_settings.cleanup."""
+        return cls(
+            targets=settings.get("targets"),
+            max_age_hours=settings.get("max_age_hours"),
+            max_total_gb=settings.get("max_total_gb"),
+            min_free_gb=settings.get("min_free_gb"),
+            grace_minutes=settings.get("grace_minutes", 10),
+            protect_unuploaded_hours=settings.get("protect_unuploaded_hours", 168),
+            clip_dirs=settings.get("clip_dirs"),
+        )
+
+    def scan(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        List the files under the targets with their size, last access and why
+        (if at all) they are protected. Stale in-use markers are ignored.
+        """
+        now = time.time() if now is None else now
+        files = []
+        ledgers = {}
+        for target in self.targets:
+            if not target.is_dir():
+                continue
+            for root, dirs, names in os.walk(target):
+                dirs.sort()
+                root = Path(root)
+                if any(n.startswith(IN_USE_PREFIX) and _marker_live(n) for n in names):
+                    # A running job owns this directory and everything below it
+                    for path in self._walk_files(root):
+                        entry = self._entry(path, now, "in_use")
+                        if entry is not None:
+                            files.append(entry)
+                    dirs[:] = []
+                    continue
+                for name in names:
+                    if name.startswith(IN_USE_PREFIX) or name == UPLOAD_LEDGER:
+                        continue
+                    path = root / name
+                    entry = self._entry(path, now)
+                    if entry is None:
+                        continue
+                    if now - entry["mtime"] < self.grace:
+                        entry["protected"] = "recent"
+                    elif (path.suffix.lower() in CLIP_SUFFIXES and self._in_clip_dir(path)
+                          and not _uploaded(ledgers, path, entry["mtime"])
+                          and (self.protect_unuploaded is None or now - entry["mtime"] < self.protect_unuploaded)):
+                        entry["protected"] = "not_uploaded"
+                    files.append(entry)
+        return files
+
+    def _in_clip_dir(self, path: Path) -> bool:
+        resolved = path.resolve()
+        return any(d == resolved.parent or d in resolved.parents for d in self.clip_dirs)
+
+    def _walk_files(self, directory: Path) -> Iterator[Path]:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if not name.startswith(IN_USE_PREFIX) and name != UPLOAD_LEDGER:
+                    yield Path(root) / name
+
+    def _entry(self, path: Path, now: float, protected: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return {
+            "path": str(path),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            # atime is not updated on noatime mounts, so a newer mtime wins
+            "last_access": max(st.st_atime, st.st_mtime),
+            "protected": protected,
+        }
+
+    def plan(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Decide what to evict (TTL first, then LRU for the cap and free space) without deleting."""
+        now = time.time() if now is None else now
+        files = self.scan(now)
+        total = sum(f["size"] for f in files)
+        protected = [f for f in files if f["protected"]]
+        candidates = sorted((f for f in files if not f["protected"]), key=lambda f: f["last_access"])
+        evict = []
+        for f in candidates:
+            if self.max_age is not None and now - f["last_access"] > self.max_age:
+                evict.append(dict(f, reason="ttl"))
+        remaining = total - sum(f["size"] for f in evict)
+        free = self._free_bytes() + total - remaining
+        chosen = {f["path"] for f in evict}
+        for f in candidates:
+            over_cap = self.max_total is not None and remaining > self.max_total
+            low_space = self.min_free is not None and free < self.min_free
+            if not (over_cap or low_space):
+                break
+            if f["path"] in chosen:
+                continue
+            evict.append(dict(f, reason="size_cap" if over_cap else "free_space"))
+            remaining -= f["size"]
+            free += f["size"]
+        return {
+            "scanned_files": len(files),
+            "total_bytes": total,
+            "protected_files": len(protected),
+            "protected_bytes": sum(f["size"] for f in protected),
+            "evict": evict,
+            "reclaimable_bytes": sum(f["size"] for f in evict),
+            "remaining_bytes": remaining,
+            "over_cap": self.max_total is not None and remaining > self.max_total,
+            "free_bytes_after": free,
+        }
+
+    def _free_bytes(self) -> int:
+        for target in self.targets:
+            if target.exists():
+                return shutil.disk_usage(target).free
+        return shutil.disk_usage(".").free
+
+    def run(self, dry_run: bool = False, now: Optional[float] = None) -> Dict[str, Any]:
+        """Evict per plan() (or only report with dry_run); returns the plan plus freed bytes."""
+        report = self.plan(now)
+        report["dry_run"] = dry_run
+        report["freed_bytes"] = 0
+        if dry_run:
+            return report
+        for f in report["evict"]:
+            try:
+                os.unlink(f["path"])
+                report["freed_bytes"] += f["size"]
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Could not remove {f['path']}: {e}")
+        self._remove_stale_markers_and_empty_dirs()
+        return report
+
+    def _remove_stale_markers_and_empty_dirs(self) -> None:
+        for target in self.targets:
+            if not target.is_dir():
+                continue
+            for root, dirs, names in os.walk(target, topdown=False):
+                root = Path(root)
+                for name in names:
+                    if name.startswith(IN_USE_PREFIX) and not _marker_live(name):
+                        (root / name).unlink(missing_ok=True)
+                if root != target:
+                    try:
+                        root.rmdir()  # only succeeds when empty
+                    except OSError:
+                        pass
+
+
+def format_bytes(n: float) -> str:
+    """Size with a binary unit, e.g. '1.5 GB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+
+
+def format_report(report: Dict[str, Any], limit: int = 20) -> str:
+    """Human-readable cleanup report."""
+    verb = "Would free" if report["dry_run"] else "Freed"
+    amount = report["reclaimable_bytes"] if report["dry_run"] else report["freed_bytes"]
+    lines = [
+        f"{verb} {format_bytes(amount)} in {len(report['evict'])} files "
+        f"({report['scanned_files']} files, {format_bytes(report['total_bytes'])} scanned; "
+        f"{report['protected_files']} protected, {format_bytes(report['protected_bytes'])})",
+    ]
+    for f in report["evict"][:limit]:
+        lines.append(f"  {f['reason']:<10} {format_bytes(f['size']):>10}  {f['path']}")
+    if len(report["evict"]) > limit:
+        lines.append(f"  ... and {len(report['evict']) - limit} more")
+    if report["over_cap"]:
+        lines.append("  Size cap still exceeded: the remaining files are protected")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """CLI entry point."""
+    from src.config_manager import ConfigManager
+
+    parser = argparse.ArgumentParser(description="Evict old pipeline artifacts")
+    parser.add_argument("--config", default="config/default.json", help="Path to configuration file")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    settings = ConfigManager(args.config).get_setting("task_settings.cleanup", {}) or {}
+    report = DiskJanitor.from_settings(settings).run(dry_run=args.dry_run or settings.get("dry_run", False))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Job event bus module.
+
+This module fans out job events (stage changes, progress, per-clip results,
+upload chunk progress) to Server-Sent Events subscribers so that the web
+interface can follow a job without polling.
+"""
+
+import json
+import queue
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, Optional
+
+
+# Statuses after which a job produces no further events
+TERMINAL_STATUSES = frozenset([
+    "completed", "error", "cancelled", "upload_completed", "upload_error"
+])
+
+
+class JobEventBus:
+    """Thread-safe publish/subscribe hub for per-job events."""
+
+    def __init__(self, history_size: int = 200, max_jobs: int = 50):
+        """Initialize the event bus."""
+        self.history_size = history_size
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+
+    def _get_job(self, job_id: str) -> Dict[str, Any]:
+        """Return the bookkeeping record for a job, creating it if needed."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = {
+                "next_id": 1,
+                "history": deque(maxlen=self.history_size),
+                "subscribers": [],
+                "finished": False,
+            }
+            self._jobs[job_id] = job
+            # Forget the oldest finished jobs once we track too many
+            # (running or watched jobs are kept, even if that means going over max_jobs)
+            excess = len(self._jobs) - self.max_jobs
+            if excess > 0:
+                evictable = [old_id for old_id, old in self._jobs.items()
+                             if old["finished"] and not old["subscribers"]]
+                for old_id in evictable[:excess]:
+                    del self._jobs[old_id]
+        return job
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Publish an event to every subscriber of a job."""
+        with self._lock:
+            job = self._get_job(job_id)
+            message = {"id": job["next_id"], "event": event, "data": data}
+            job["next_id"] += 1
+            job["history"].append(message)
+            if event == "status" and data.get("status") in TERMINAL_STATUSES:
+                job["finished"] = True
+            subscribers = list(job["subscribers"])
+        for q in subscribers:
+            q.put(message)
+
+    def subscribe(self, job_id: str, last_event_id: int = 0) -> "queue.Queue":
+        """Subscribe to a job, replaying events newer than last_event_id."""
+        q = queue.Queue()
+        with self._lock:
+            job = self._get_job(job_id)
+            for message in job["history"]:
+                if message["id"] > last_event_id:
+                    q.put(message)
+            job["subscribers"].append(q)
+        return q
+
+    def unsubscribe(self, job_id: str, q: "queue.Queue") -> None:
+        """Remove a subscriber queue."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and q in job["subscribers"]:
+                job["subscribers"].remove(q)
+
+    def has_job(self, job_id: str) -> bool:
+        """Check whether any event has been published for a job."""
+        with self._lock:
+            return job_id in self._jobs
+
+    def stream(self, job_id: str, last_event_id: int = 0,
+               heartbeat: float = 15.0, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Yield a job's events formatted as a text/event-stream body.
+        The stream ends after a terminal status event.
+        """
+        q = self.subscribe(job_id, last_event_id)
+        waited = 0.0
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = q.get(timeout=heartbeat)
+                except queue.Empty:
+                    waited += heartbeat
+                    if timeout is not None and waited >= timeout:
+                        return
+                    # Comment lines keep proxies from closing idle connections
+                    yield ": keep-alive\n\n"
+                    continue
+                waited = 0.0
+                yield format_sse(message)
+                data = message["data"]
+                if message["event"] == "status" and data.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            self.unsubscribe(job_id, q)
+
+
+def format_sse(message: Dict[str, Any]) -> str:
+    """Format an event message as a Server-Sent Events frame."""
+    payload = json.dumps(message["data"], default=str)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {payload}\n\n"
@@ -7,7 +7,9 @@ This module provides the primary interface for running automation tasks.
 
 import argparse
 import logging
+import signal
 import sys
+import time
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -16,6 +18,10 @@ sys.path.insert(0, str(project_root))
 
 from src.automation_framework import AutomationFramework
 from src.config_manager import ConfigManager
+from src.daemon import ClipDaemon
+from src.profiling import Profiler
+from src.task_execution import allow_process_isolation
+from src.task_scheduler import summarize
 
 
 def setup_logging(log_level: str = "INFO") -> None:
@@ -57,6 +63,18 @@ def main() -> int:
         action="store_true",
         help="List available tasks"
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cache/profiles",
+        metavar="DIR",
+        help="Profile the run and write pstats, collapsed stacks and a summary to DIR"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and clip videos arriving in the configured inbox or queue file"
+    )
     
     args = parser.parse_args()
     
@@ -78,21 +96,47 @@ def main() -> int:
                 print(f"  - {task}")
             return 0
         
+        if args.daemon:
+            # The daemon's watcher and scheduler threads make fork() unsafe
+            allow_process_isolation(False)
+            daemon = ClipDaemon(framework, config_manager.get_setting("daemon", {}))
+            if config_manager.get_setting("config_reload.enabled", True):
+                config_manager.start_watching(config_manager.get_setting("config_reload.interval_seconds", 2))
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda signum, frame: daemon.stop())
+            daemon.run()
+            return 0
+        
+        profiler = Profiler(args.task or "default_workflow").start() if args.profile else None
+        try:
+            if args.task:
+                logger.info(f"Running task: {args.task}")
+                result = framework.run_task(args.task)
+            else:
+                # Run default automation workflow
+                logger.info("Starting automation framework")
+                results = framework.run_default_workflow()
+                for name, task_result in results.items():
+                    status = "skipped" if task_result.skipped else ("ok" if task_result.success else "failed")
+                    print(f"  {name:<16} {status:<8} {task_result.duration_seconds:.2f}s")
+                succeeded, failed, skipped = summarize(results)
+                logger.info(f"Automation completed: {succeeded} succeeded, {failed} failed, {skipped} skipped")
+                result = failed == 0 and skipped == 0
+        finally:
+            if profiler:
+                profiler.stop()
+                print(profiler.report(), file=sys.stderr)
+                prefix = Path(args.profile) / f"{profiler.name}-{time.strftime('%Y%m%d-%H%M%S')}"
+                logger.info(f"Profile written to {', '.join(profiler.write(prefix).values())}")
+        
         if args.task:
-            logger.info(f"Running task: {args.task}")
-            result = framework.run_task(args.task)
             if result:
                 logger.info("Task completed successfully")
                 return 0
             else:
                 logger.error("Task failed")
                 return 1
-        else:
-            # Run default automation workflow
-            logger.info("Starting automation framework")
-            framework.run_default_workflow()
-            logger.info("Automation completed")
-            return 0
+        return 0 if result else 1
             
     except Exception as e:
         logger.error(f"Automation failed: {str(e)}")
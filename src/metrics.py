@@ -0,0 +1,374 @@
+"""
+Metrics module.
+
+This module provides a small in-process metrics registry: fixed-size
+ring buffers of durations (per pipeline stage and per task), windows of
+job outcomes, per-minute event rates, gauges and a feed of recent
+activity. Every aggregate is maintained incrementally as values are
+recorded, so reading a snapshot costs O(1) per metric. Durations also
+feed cumulative histograms that are exported in the Prometheus text
+exposition format.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds in seconds (pipeline stages run from sub-second to minutes)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Duration name prefix -> (Prometheus histogram name, label name)
+DURATION_FAMILIES = {
+    "stage": ("pipeline_stage_seconds", "stage"),
+    "task": ("task_seconds", "task"),
+    "job": ("job_seconds", "kind"),
+}
+
+
+class RingBuffer:
+    """Fixed-size window of numbers with a running sum."""
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._values = deque()
+        self._sum = 0.0
+        self.total_count = 0
+
+    def append(self, value: float) -> None:
+        if len(self._values) == self.capacity:
+            self._sum -= self._values.popleft()
+        self._values.append(value)
+        self._sum += value
+        self.total_count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, window mean and last value."""
+        n = len(self._values)
+        return {
+            "count": self.total_count,
+            "window": n,
+            "mean": round(self._sum / n, 3) if n else None,
+            "last": round(self._values[-1], 3) if n else None,
+        }
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", running))
+        return pairs
+
+
+class OutcomeWindow:
+    """Last N outcomes of one kind of job, with running per-outcome counts."""
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._outcomes = deque()
+        self._window_counts = {}
+        self.totals = {}
+
+    def append(self, outcome: str) -> None:
+        if len(self._outcomes) == self.capacity:
+            evicted = self._outcomes.popleft()
+            self._window_counts[evicted] -= 1
+        self._outcomes.append(outcome)
+        self._window_counts[outcome] = self._window_counts.get(outcome, 0) + 1
+        self.totals[outcome] = self.totals.get(outcome, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, and the success rate over the window (cancellations excluded)."""
+        success = self._window_counts.get("success", 0)
+        decided = len(self._outcomes) - self._window_counts.get("cancelled", 0)
+        return {
+            "totals": dict(self.totals),
+            "window": len(self._outcomes),
+            "success_rate": round(100.0 * success / decided, 1) if decided else None,
+        }
+
+
+class RateCounter:
+    """Events per hour from 60 one-minute buckets."""
+
+    BUCKETS = 60
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._buckets = [0] * self.BUCKETS
+        self._current_minute = int(clock() // 60)
+        self._sum = 0
+        self.total = 0
+
+    def _advance(self) -> None:
+        # Clear buckets for minutes that passed; bounded by BUCKETS per call
+        minute = int(self._clock() // 60)
+        steps = min(minute - self._current_minute, self.BUCKETS)
+        for i in range(1, steps + 1):
+            idx = (self._current_minute + i) % self.BUCKETS
+            self._sum -= self._buckets[idx]
+            self._buckets[idx] = 0
+        if minute > self._current_minute:
+            self._current_minute = minute
+
+    def add(self, n: int = 1) -> None:
+        self._advance()
+        self._buckets[self._current_minute % self.BUCKETS] += n
+        self._sum += n
+        self.total += n
+
+    def per_hour(self) -> int:
+        self._advance()
+        return self._sum
+
+
+class MetricsRegistry:
+    """Thread-safe registry of durations, outcomes, rates, gauges and activity."""
+
+    def __init__(self, window: int = 200, activity_size: int = 50):
+        """
+        Initialize the registry.
+
+        Args:
+            window: Number of samples kept per duration/outcome metric
+            activity_size: Number of recent activity entries kept
+        """
+        self.window = window
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._histograms = {}
+        self._outcomes = {}
+        self._rates = {}
+        self._gauges = {}
+        self._activity = deque(maxlen=activity_size)
+        self._journal = None
+
+    def start_journal(self) -> None:
+        """Also log every later update (see take_journal/replay); used by forked task attempts."""
+        with self._lock:
+            self._journal = []
+
+    def take_journal(self) -> List[Tuple[str, tuple, Dict[str, Any]]]:
+        """Stop journaling and return the updates logged since start_journal."""
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+        return journal
+
+    def replay(self, journal: List[Tuple[str, tuple, Dict[str, Any]]]) -> None:
+        """Apply updates journaled by another registry (e.g. in a child process)."""
+        for method, args, kwargs in journal:
+            getattr(self, method)(*args, **kwargs)
+
+    def record_duration(self, name: str, seconds: float) -> None:
+        """Record how long something (e.g. 'stage.extract') took."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("record_duration", (name, seconds), {}))
+            buf = self._durations.get(name)
+            if buf is None:
+                buf = self._durations[name] = RingBuffer(self.window)
+            buf.append(seconds)
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Record the duration of a with-block, even if it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_duration(name, time.monotonic() - start)
+
+    def record_outcome(self, kind: str, outcome: str) -> None:
+        """Record a job outcome such as ('processing', 'success')."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("record_outcome", (kind, outcome), {}))
+            window = self._outcomes.get(kind)
+            if window is None:
+                window = self._outcomes[kind] = OutcomeWindow(self.window)
+            window.append(outcome)
+
+    def increment(self, name: str, n: int = 1, **labels: str) -> None:
+        """Count events (e.g. 'clips_created') for totals and per-hour rates."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("increment", (name, n), labels))
+            counter = self._rates.get(key)
+            if counter is None:
+                counter = self._rates[key] = RateCounter()
+            counter.add(n)
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """Set a gauge to a value, or to a zero-argument callable read at snapshot time."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def adjust_gauge(self, name: str, delta: float) -> None:
+        """Add delta to a numeric gauge (e.g. +1/-1 around a resource's lifetime)."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("adjust_gauge", (name, delta), {}))
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def record_activity(self, kind: str, message: str) -> None:
+        """Add an entry ('success', 'upload', 'error', 'info') to the activity feed."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("record_activity", (kind, message), {}))
+            self._activity.appendleft({"type": kind, "message": message, "timestamp": time.time()})
+
+    def recent_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the newest activity entries first."""
+        with self._lock:
+            return [dict(entry) for entry, _ in zip(self._activity, range(limit))]
+
+    def uptime_seconds(self) -> float:
+        return time.time() - self.started_at
+
+    def _read_gauges(self) -> Dict[str, Any]:
+        """Current gauge values, evaluating callable gauges outside the lock."""
+        with self._lock:
+            gauges = dict(self._gauges)
+        for name, value in gauges.items():
+            if callable(value):
+                try:
+                    gauges[name] = value()
+                except Exception:
+                    gauges[name] = None
+        return gauges
+
+    def to_prometheus(self, namespace: str = "autoclip") -> str:
+        """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = {name: (h.cumulative(), h.sum, h.count) for name, h in self._histograms.items()}
+            counters = {key: c.total for key, c in self._rates.items()}
+            outcomes = {kind: dict(w.totals) for kind, w in self._outcomes.items()}
+        gauges = self._read_gauges()
+        lines = []
+
+        families = {}
+        for name, data in sorted(histograms.items()):
+            prefix, _, value = name.partition(".")
+            family, label = DURATION_FAMILIES.get(prefix, (f"{prefix}_seconds", "name"))
+            families.setdefault(family, []).append(((label, value or prefix), data))
+        for family, series in families.items():
+            metric = f"{namespace}_{family}"
+            lines.append(f"# TYPE {metric} histogram")
+            for (label, value), (buckets, total, count) in series:
+                for le, cumulative in buckets:
+                    lines.append(f'{metric}_bucket{{{label}="{_escape(value)}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label}="{_escape(value)}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{{label}="{_escape(value)}"}} {count}')
+
+        by_name = {}
+        for (name, labels), total in sorted(counters.items()):
+            by_name.setdefault(name, []).append((labels, total))
+        for name, series in by_name.items():
+            metric = f"{namespace}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, total in series:
+                lines.append(f"{metric}{_format_labels(labels)} {total}")
+
+        if outcomes:
+            metric = f"{namespace}_jobs_total"
+            lines.append(f"# TYPE {metric} counter")
+            for kind, totals in sorted(outcomes.items()):
+                for outcome, total in sorted(totals.items()):
+                    lines.append(f'{metric}{{kind="{_escape(kind)}",outcome="{_escape(outcome)}"}} {total}')
+
+        for name, value in sorted(gauges.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {namespace}_{name} gauge")
+                lines.append(f"{namespace}_{name} {value}")
+
+        lines.append(f"# TYPE {namespace}_uptime_seconds gauge")
+        lines.append(f"{namespace}_uptime_seconds {self.uptime_seconds():.1f}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every metric's current aggregates."""
+        with self._lock:
+            durations = {name: buf.summary() for name, buf in self._durations.items()}
+            outcomes = {kind: window.summary() for kind, window in self._outcomes.items()}
+            rates = {_series_name(name, labels): {"total": c.total, "per_hour": c.per_hour()}
+                     for (name, labels), c in self._rates.items()}
+        gauges = self._read_gauges()
+        return {
+            "uptime_seconds": round(self.uptime_seconds(), 1),
+            "durations": durations,
+            "outcomes": outcomes,
+            "rates": rates,
+            "gauges": gauges,
+        }
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a sorted label tuple as {k="v",...}, or nothing."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _series_name(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Display name for a counter series, e.g. 'quota_units{endpoint="search"}'."""
+    return name + _format_labels(labels)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Human friendly duration such as '3h 12m' or '45s'."""
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    days, rem = divmod(seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, secs = divmod(rem, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
+
+
+def format_time_ago(timestamp: float, now: Optional[float] = None) -> str:
+    """Relative time such as 'just now' or '5 minutes ago'."""
+    delta = int((now if now is not None else time.time()) - timestamp)
+    if delta < 60:
+        return "just now"
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if delta >= size:
+            n = delta // size
+            return f"{n} {unit}{'s' if n != 1 else ''} ago"
+    return "just now"
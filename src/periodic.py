@@ -0,0 +1,263 @@
+"""
+Periodic task module.
+
+This module runs framework tasks on a schedule inside a long-running
+process (the web app or the daemon), replacing external cron jobs that
+cold-start the framework for every run. A schedule is a cron expression
+("*/15 * * * *", "@daily") or an interval ("every 10m", or a number of
+seconds). Runs missed while the process was down are caught up with one
+run at start-up, and a task that is still running when it is due again is
+skipped rather than started twice.
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Union
+
+from src.atomic_json import load_json, save_json
+
+
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+DAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+_INTERVAL = re.compile(r"^every\s+(?P<n>\d+(?:\.\d+)?)\s*(?P<unit>s|m|h|d)$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_field(field: str, low: int, high: int, names: Dict[str, int]) -> Set[int]:
+    """Expand one cron field ('*', '*/5', '1-5', 'mon,wed', '10-40/10') to its values."""
+    values = set()
+    for part in field.lower().split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in cron field '{field}'")
+        if part == "*":
+            start, end = low, high
+        else:
+            bounds = [names[p] if p in names else int(p) for p in part.split("-", 1)]
+            start = bounds[0]
+            end = bounds[1] if len(bounds) == 2 else (high if step > 1 else start)
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A standard five-field cron expression, evaluated in local time."""
+
+    def __init__(self, expression: str):
+        """
+        Parse the expression (minute hour day-of-month month day-of-week, or an @alias).
+        Raises ValueError if it is malformed.
+        """
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.minutes = _parse_field(fields[0], 0, 59, {})
+        self.hours = _parse_field(fields[1], 0, 23, {})
+        self.days = _parse_field(fields[2], 1, 31, {})
+        self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+        # 7 is also Sunday
+        self.weekdays = {d % 7 for d in _parse_field(fields[4], 0, 7, DAY_NAMES)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        in_month = dt.day in self.days
+        in_week = (dt.isoweekday() % 7) in self.weekdays
+        # Like cron: if both day fields are restricted, either one may match
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, dt: datetime) -> datetime:
+        """First matching minute strictly after dt."""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+class IntervalSchedule:
+    """Runs every fixed number of seconds."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = float(seconds)
+
+    def next_after(self, dt: datetime) -> datetime:
+        return dt + timedelta(seconds=self.seconds)
+
+    def __repr__(self) -> str:
+        return f"IntervalSchedule({self.seconds:g})"
+
+
+def parse_schedule(value: Union[str, int, float]) -> Union[CronSchedule, IntervalSchedule]:
+    """Build a schedule from a cron expression, 'every <n><s|m|h|d>' or a number of seconds."""
+    if isinstance(value, (int, float)):
+        return IntervalSchedule(value)
+    match = _INTERVAL.match(value.strip().lower())
+    if match:
+        return IntervalSchedule(float(match["n"]) * _UNIT_SECONDS[match["unit"]])
+    return CronSchedule(value)
+
+
+class PeriodicScheduler:
+    """Starts scheduled tasks when they are due, one background thread per run."""
+
+    def __init__(self, run_task: Callable[[str], Any], state_path: Optional[str] = None,
+                 metrics: Any = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize the scheduler.
+
+        Args:
+            run_task: Runs a task by name (AutomationFramework.run_task)
+            state_path: JSON file keeping each task's last run, used to catch up
+                on runs missed while the process was down
+            metrics: Optional MetricsRegistry for skipped/caught-up runs
+            clock: Wall-clock time source (cron schedules follow local time)
+        """
+        self.run_task = run_task
+        self.state_path = Path(state_path) if state_path else None
+        self.metrics = metrics
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._entries = {}
+        self._running = {}
+        self._thread = None
+        self._stopped = False
+        self._last_runs = self._load_state()
+
+    def _load_state(self) -> Dict[str, float]:
+        if self.state_path is None:
+            return {}
+        return load_json(self.state_path, {}, self.logger, "schedule state")
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        save_json(self.state_path, self._last_runs, indent=2)
+
+    def add(self, task_name: str, schedule: Union[CronSchedule, IntervalSchedule],
+            catch_up: bool = True, run_now: bool = False) -> None:
+        """
+        Schedule a task. With catch_up, a run missed since the last recorded one
+        (however many were missed) is made up for once, right away. run_now
+        starts the first run immediately (the old start_periodic_task behaviour).
+        """
+        now = self.clock()
+        last = self._last_runs.get(task_name)
+        # Intervals continue from the last run rather than restarting at every start-up
+        due = schedule.next_after(datetime.fromtimestamp(last if last is not None else now)).timestamp()
+        if run_now:
+            due = now
+        elif due <= now:
+            if catch_up:
+                self.logger.info(f"Catching up on missed run of '{task_name}' (last run "
+                                 f"{datetime.fromtimestamp(last):%Y-%m-%d %H:%M})")
+                if self.metrics is not None:
+                    self.metrics.increment("scheduled_runs_caught_up", task=task_name)
+                due = now
+            else:
+                due = schedule.next_after(datetime.fromtimestamp(now)).timestamp()
+        with self._wakeup:
+            self._entries[task_name] = {"schedule": schedule, "due": due}
+            self._wakeup.notify()
+        self.logger.info(f"Scheduled task '{task_name}' ({schedule!r}), next run "
+                         f"{datetime.fromtimestamp(due):%Y-%m-%d %H:%M:%S}")
+        self.start()
+
+    def scheduled(self) -> Dict[str, Dict[str, Any]]:
+        """Schedule, next run and running state of each task."""
+        with self._lock:
+            return {name: {"schedule": repr(e["schedule"]), "next_run": e["due"],
+                           "last_run": self._last_runs.get(name),
+                           "running": name in self._running and self._running[name].is_alive()}
+                    for name, e in self._entries.items()}
+
+    def start(self) -> None:
+        """Start the scheduling thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._loop, name="periodic-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop scheduling; runs in progress are waited for up to timeout seconds each."""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+            thread, runs = self._thread, list(self._running.values())
+            self._entries.clear()
+        if thread is not None:
+            thread.join(timeout)
+        for run in runs:
+            run.join(timeout)
+        self._running.clear()
+
+    def _launch(self, task_name: str) -> None:
+        """Start one run unless the previous run of the task is still going (lock held)."""
+        running = self._running.get(task_name)
+        if running is not None and running.is_alive():
+            self.logger.warning(f"Skipping scheduled run of '{task_name}': previous run still in progress")
+            if self.metrics is not None:
+                self.metrics.increment("scheduled_runs_skipped", task=task_name)
+            return
+        self._last_runs[task_name] = self.clock()
+        try:
+            self._save_state()
+        except OSError as e:
+            self.logger.warning(f"Could not save schedule state: {e}")
+        thread = threading.Thread(target=self.run_task, args=(task_name,), name=f"periodic-{task_name}",
+                                  daemon=True)
+        self._running[task_name] = thread
+        thread.start()
+
+    def _loop(self) -> None:
+        with self._wakeup:
+            while not self._stopped:
+                now = self.clock()
+                for name, entry in self._entries.items():
+                    if entry["due"] <= now:
+                        self._launch(name)
+                        # Coalesce slots missed while the process was suspended or busy
+                        entry["due"] = entry["schedule"].next_after(datetime.fromtimestamp(now)).timestamp()
+                next_due = min((e["due"] for e in self._entries.values()), default=None)
+                # Wake at least once a minute so clock jumps (suspend, DST) are noticed
+                self._wakeup.wait(60.0 if next_due is None else min(60.0, max(0.0, next_due - now)))
@@ -0,0 +1,119 @@
+"""
+Clip previews module.
+
+This module describes the lightweight preview renditions made for every
+extracted clip: a low-resolution proxy video, a poster frame and a
+sprite sheet of evenly spaced frames for skimming. All three come out of
+a single ffmpeg decode of the clip. Previews are cached on disk under a
+fingerprint of the clip file, so re-running a job on unchanged clips
+does no work.
+"""
+
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+PREVIEW_DIR = Path("videos/previews")
+
+# Proxy rendition: at most 360p, small H.264 with low-bitrate audio
+PROXY_HEIGHT = 360
+PROXY_CRF = 30
+
+POSTER_WIDTH = 640
+
+# Sprite sheet geometry: SPRITE_COLUMNS x SPRITE_ROWS tiles, each SPRITE_TILE_WIDTH wide
+SPRITE_COLUMNS = 5
+SPRITE_ROWS = 4
+SPRITE_TILE_WIDTH = 160
+
+# Bytes hashed from each end of a clip for its fingerprint
+FINGERPRINT_SAMPLE = 1024 * 1024
+
+PREVIEW_FILES = {"proxy": "proxy.mp4", "poster": "poster.jpg", "sprite": "sprite.jpg"}
+
+
+def clip_fingerprint(path: str) -> str:
+    """
+    Fingerprint a clip by its size and the first and last megabyte.
+    Cheap enough to compute on every request, and it changes whenever
+    the clip is re-extracted with different content.
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha1(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        h.update(f.read(FINGERPRINT_SAMPLE))
+        if size > FINGERPRINT_SAMPLE:
+            f.seek(max(FINGERPRINT_SAMPLE, size - FINGERPRINT_SAMPLE))
+            h.update(f.read(FINGERPRINT_SAMPLE))
+    return h.hexdigest()[:16]
+
+
+def preview_paths(preview_dir: Path, fingerprint: str) -> Dict[str, Path]:
+    """Return the proxy/poster/sprite/meta paths for a fingerprint."""
+    base = Path(preview_dir) / fingerprint
+    paths = {kind: base / name for kind, name in PREVIEW_FILES.items()}
+    paths["meta"] = base / "meta.json"
+    return paths
+
+
+def load_cached_previews(preview_dir: Path, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Return the preview record for a fingerprint if all files exist."""
+    paths = preview_paths(preview_dir, fingerprint)
+    try:
+        with open(paths["meta"], "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not all(paths[kind].is_file() and paths[kind].stat().st_size > 0 for kind in PREVIEW_FILES):
+        return None
+    return dict(meta, **{kind: str(paths[kind]) for kind in PREVIEW_FILES})
+
+
+def sprite_interval(duration: float) -> float:
+    """Seconds between sprite frames so the sheet spans the whole clip."""
+    return max(0.1, duration / (SPRITE_COLUMNS * SPRITE_ROWS))
+
+
+def build_preview_command(clip_path: str, out_dir: Path, duration: float) -> List[str]:
+    """
+    Build one ffmpeg command that decodes the clip once and writes the
+    proxy, poster and sprite outputs into out_dir.
+    """
+    interval = sprite_interval(duration)
+    filters = ";".join([
+        "[0:v]split=3[p][t][s]",
+        f"[p]scale=-2:min({PROXY_HEIGHT}\\,ih)[proxy]",
+        f"[t]thumbnail=50,scale=min({POSTER_WIDTH}\\,iw):-2[poster]",
+        f"[s]fps=1/{interval:.3f},scale={SPRITE_TILE_WIDTH}:-2,tile={SPRITE_COLUMNS}x{SPRITE_ROWS}[sprite]",
+    ])
+    out_dir = Path(out_dir)
+    return [
+        "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error", "-y",
+        "-i", str(clip_path),
+        "-filter_complex", filters,
+        "-map", "[proxy]", "-map", "0:a?",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", str(PROXY_CRF),
+        "-c:a", "aac", "-b:a", "64k",
+        "-movflags", "+faststart",
+        str(out_dir / PREVIEW_FILES["proxy"]),
+        "-map", "[poster]", "-frames:v", "1", "-q:v", "3",
+        str(out_dir / PREVIEW_FILES["poster"]),
+        "-map", "[sprite]", "-frames:v", "1", "-q:v", "4",
+        str(out_dir / PREVIEW_FILES["sprite"]),
+    ]
+
+
+def sprite_meta(duration: float) -> Dict[str, Any]:
+    """Describe the sprite sheet layout for the front end."""
+    return {
+        "duration": duration,
+        "sprite_columns": SPRITE_COLUMNS,
+        "sprite_rows": SPRITE_ROWS,
+        "sprite_frames": min(SPRITE_COLUMNS * SPRITE_ROWS,
+                             max(1, math.ceil(duration / sprite_interval(duration)))),
+        "sprite_interval": sprite_interval(duration),
+    }
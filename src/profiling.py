@@ -0,0 +1,281 @@
+"""
+Profiling module.
+
+This module wraps a run (a CLI task or a web job) in cProfile and writes
+the results as a pstats file, a collapsed-stack file for flame graph
+tools (flamegraph.pl, speedscope, inferno) and a JSON summary. Since most
+of a pipeline run is spent in ffmpeg, the summary reports the wall and
+CPU time of child processes separately from the Python process itself.
+"""
+
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+# Deepest call stack written to the collapsed-stack file
+MAX_STACK_DEPTH = 64
+
+_current_profiler = contextvars.ContextVar("current_profiler", default=None)
+
+
+def children_cpu_times() -> Dict[str, float]:
+    """User and system CPU seconds of all waited-for child processes so far."""
+    if not RESOURCE_AVAILABLE:
+        return {"user": 0.0, "system": 0.0}
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"user": usage.ru_utime, "system": usage.ru_stime}
+
+
+def _label(func: tuple) -> str:
+    """Frame name for a pstats function key (file, line, name)."""
+    filename, line, name = func
+    if filename == "~":  # built-in
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Convert profile stats to collapsed stacks ('a;b;c <microseconds>').
+    cProfile only keeps caller/callee pairs, so each function's own time
+    is split across the paths leading to it in proportion to the time
+    each caller spent in it.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    totals = Counter()
+
+    def walk(func, stack, path, share):
+        own = entries[func][2]
+        stack = stack + (_label(func),)
+        if own * share > 0:
+            totals[";".join(stack)] += own * share
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            if callee in path or callee_total <= 0 or edge_time <= 0:
+                continue
+            walk(callee, stack, path | {callee}, share * min(1.0, edge_time / callee_total))
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, (), {func}, 1.0)
+    return [f"{stack} {int(seconds * 1e6)}" for stack, seconds in sorted(totals.items())
+            if int(seconds * 1e6) > 0]
+
+
+class Profiler:
+    """cProfile plus wall/CPU accounting for one run and its child processes."""
+
+    def __init__(self, name: str = "run"):
+        """
+        Initialize the profiler.
+
+        Args:
+            name: Label for the run (task name or job id) stored in the summary
+        """
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        self._profile = None
+        self._token = None
+        self._lock = threading.Lock()
+        self._children = {}
+        self._running = {}
+        self._thread_profiles = []
+        self._started = None
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._children_cpu = {"user": 0.0, "system": 0.0}
+
+    def start(self) -> "Profiler":
+        """Start profiling the calling thread."""
+        self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            # Python 3.12+ allows one active profiler per process
+            self.logger.warning(f"Python profiling unavailable for {self.name}: {e}")
+            self._profile = None
+        self._token = _current_profiler.set(self)
+        self._started = (time.perf_counter(), time.thread_time(), children_cpu_times())
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop profiling and return the summary."""
+        if self._started is None:
+            return self.summary()
+        wall0, cpu0, children0 = self._started
+        if self._profile is not None:
+            self._profile.disable()
+        self._wall = time.perf_counter() - wall0
+        self._cpu = time.thread_time() - cpu0
+        children = children_cpu_times()
+        self._children_cpu = {k: children[k] - children0[k] for k in children}
+        _current_profiler.reset(self._token)
+        self._started = None
+        return self.summary()
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @contextmanager
+    def profile_thread(self) -> Iterator[None]:
+        """
+        Profile the calling thread for the with-block as part of this run (e.g. a
+        task attempt thread). Where cProfile already covers all threads (3.12+)
+        the second profiler cannot start and is not needed.
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._thread_profiles.append(profile)
+
+    def record_child(self, command: str, wall_seconds: float) -> None:
+        """Add a finished child process's wall time under its command name."""
+        with self._lock:
+            entry = self._children.setdefault(command, {"count": 0, "wall_seconds": 0.0})
+            entry["count"] += 1
+            entry["wall_seconds"] += wall_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """Wall/CPU time of this run and of its child processes."""
+        with self._lock:
+            commands = {name: {"count": c["count"], "wall_seconds": round(c["wall_seconds"], 3)}
+                        for name, c in self._children.items()}
+        return {
+            "name": self.name,
+            "wall_seconds": round(self._wall, 3),
+            "python_cpu_seconds": round(self._cpu, 3),
+            "children": {
+                "wall_seconds": round(sum(c["wall_seconds"] for c in commands.values()), 3),
+                # RUSAGE_CHILDREN is process-wide: includes children of concurrent jobs
+                "cpu_user_seconds": round(self._children_cpu["user"], 3),
+                "cpu_system_seconds": round(self._children_cpu["system"], 3),
+                "commands": commands,
+            },
+        }
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Profile stats, or None if Python profiling was unavailable."""
+        with self._lock:
+            profiles = [p for p in [self._profile] + self._thread_profiles if p is not None]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def report(self, limit: int = 20) -> str:
+        """Text report: timing summary plus the top functions by cumulative time."""
+        s = self.summary()
+        children = s["children"]
+        lines = [
+            f"Profile: {self.name}",
+            f"  run:      wall {s['wall_seconds']:.2f}s, python cpu {s['python_cpu_seconds']:.2f}s",
+            f"  children: wall {children['wall_seconds']:.2f}s, "
+            f"cpu {children['cpu_user_seconds']:.2f}s user + {children['cpu_system_seconds']:.2f}s system",
+        ]
+        for command, c in sorted(children["commands"].items()):
+            lines.append(f"    {command}: {c['count']} runs, {c['wall_seconds']:.2f}s wall")
+        stats = self.stats()
+        if stats is not None:
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats("cumulative").print_stats(limit)
+            lines.append(out.getvalue().rstrip())
+        return "\n".join(lines)
+
+    def write(self, prefix: str) -> Dict[str, str]:
+        """
+        Write <prefix>.pstats, <prefix>.collapsed and <prefix>.summary.json.
+        Returns the written paths by kind.
+        """
+        prefix = Path(prefix)
+        prefix.parent.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        stats = self.stats()
+        if stats is not None:
+            paths["pstats"] = str(prefix.with_name(prefix.name + ".pstats"))
+            stats.dump_stats(paths["pstats"])
+            paths["collapsed"] = str(prefix.with_name(prefix.name + ".collapsed"))
+            with open(paths["collapsed"], "w", encoding="utf-8") as f:
+                f.write("\n".join(collapsed_stacks(stats)) + "\n")
+        paths["summary"] = str(prefix.with_name(prefix.name + ".summary.json"))
+        with open(paths["summary"], "w", encoding="utf-8") as f:
+            json.dump(dict(self.summary(), files=paths), f, indent=2)
+        return paths
+
+
+def current_profiler() -> Optional[Profiler]:
+    """Return the profiler active in this context, if any."""
+    return _current_profiler.get()
+
+
+def record_child(cmd: Sequence[str], wall_seconds: float) -> None:
+    """Report a finished child process to the active profiler, if any."""
+    profiler = _current_profiler.get()
+    if profiler is not None and cmd:
+        profiler.record_child(os.path.basename(str(cmd[0])), wall_seconds)
+
+
+def child_started(proc: Any) -> None:
+    """Note the start of a child process (a subprocess.Popen) for the active profiler."""
+    profiler = _current_profiler.get()
+    if profiler is not None:
+        with profiler._lock:
+            profiler._running[proc.pid] = time.perf_counter()
+
+
+def child_finished(proc: Any, cmd: Sequence[str]) -> None:
+    """Record the wall time of a child process reaped after child_started()."""
+    profiler = _current_profiler.get()
+    if profiler is not None:
+        with profiler._lock:
+            started = profiler._running.pop(proc.pid, None)
+        if started is not None:
+            record_child(cmd, time.perf_counter() - started)
+
+
+@contextmanager
+def child_process(cmd: Sequence[str]) -> Iterator[None]:
+    """Time a block that runs a child process to completion (e.g. subprocess.run)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_child(cmd, time.perf_counter() - start)
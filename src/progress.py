@@ -0,0 +1,137 @@
+"""
+Progress tracking module.
+
+This module turns fractional progress reported by individual pipeline
+stages (ffmpeg -progress output, upload chunks, ...) into one weighted
+overall percentage with an ETA.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+# Relative cost of each pipeline stage; only the stages in use are counted
+DEFAULT_STAGE_WEIGHTS = {
+    "prepare": 0.15,
+    "scene_detect": 0.35,
+    "extract": 0.25,
+    "transcribe": 0.15,
+    "upload": 0.10,
+}
+
+_FFMPEG_OUT_TIME = re.compile(r"^out_time_(?:us|ms)=(\d+)\s*$")
+_FFMPEG_PROGRESS_END = "progress=end"
+
+
+def parse_ffmpeg_progress_line(line: str) -> Optional[float]:
+    """
+    Parse one line of `ffmpeg -progress` output.
+    Returns the processed media time in seconds, or None for other keys.
+    Both out_time_us and out_time_ms are reported in microseconds by ffmpeg.
+    """
+    m = _FFMPEG_OUT_TIME.match(line.strip())
+    if m:
+        return int(m.group(1)) / 1_000_000
+    return None
+
+
+def is_ffmpeg_progress_end(line: str) -> bool:
+    """Check whether a `ffmpeg -progress` line marks the end of processing."""
+    return line.strip() == _FFMPEG_PROGRESS_END
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Format an ETA in seconds as a short human readable string."""
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def format_progress(snapshot: Dict[str, Any]) -> str:
+    """Render a progress snapshot as a single status line (used by the CLI)."""
+    return (f"[{snapshot['progress']:5.1f}%] {snapshot['stage'] or '-':<12} "
+            f"stage {snapshot['stage_progress']:5.1f}%  ETA {format_eta(snapshot['eta_seconds'])}")
+
+
+class ProgressTracker:
+    """Weighted multi-stage progress with ETA estimation."""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 min_interval: float = 0.5):
+        """
+        Initialize the tracker.
+
+        Args:
+            weights: Relative cost per stage (normalized internally)
+            callback: Called with a snapshot whenever progress changes
+            min_interval: Minimum seconds between callbacks for the same stage
+        """
+        weights = weights if weights is not None else DEFAULT_STAGE_WEIGHTS
+        total = sum(weights.values()) or 1.0
+        self.weights = {stage: w / total for stage, w in weights.items()}
+        self.callback = callback
+        self.min_interval = min_interval
+        self._fractions = {stage: 0.0 for stage in self.weights}
+        self._stage = None
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._last_emit = 0.0
+
+    def update(self, stage: str, fraction: float) -> None:
+        """Report the completed fraction (0.0-1.0) of a stage."""
+        if stage not in self.weights:
+            return
+        fraction = min(1.0, max(0.0, fraction))
+        with self._lock:
+            # Progress never moves backwards within a stage
+            current = self._fractions[stage]
+            if fraction < current or current >= 1.0 or (fraction == current and stage == self._stage):
+                return
+            stage_changed = stage != self._stage
+            self._fractions[stage] = fraction
+            self._stage = stage
+            now = time.monotonic()
+            if not (stage_changed or fraction >= 1.0 or now - self._last_emit >= self.min_interval):
+                return
+            self._last_emit = now
+        self._emit()
+
+    def complete(self, stage: str) -> None:
+        """Mark a stage as finished (also used for skipped stages)."""
+        self.update(stage, 1.0)
+
+    def overall(self) -> float:
+        """Return overall progress as a fraction."""
+        with self._lock:
+            return sum(self.weights[s] * f for s, f in self._fractions.items())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current progress state."""
+        overall = self.overall()
+        elapsed = time.monotonic() - self._started
+        eta = None
+        if 0.01 <= overall < 1.0:
+            eta = elapsed * (1.0 - overall) / overall
+        elif overall >= 1.0:
+            eta = 0.0
+        stage = self._stage
+        return {
+            "stage": stage,
+            "stage_progress": round(self._fractions.get(stage, 0.0) * 100, 1) if stage else 0.0,
+            "progress": round(overall * 100, 1),
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+    def _emit(self) -> None:
+        """Send the current snapshot to the callback."""
+        if self.callback:
+            self.callback(self.snapshot())
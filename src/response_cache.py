@@ -0,0 +1,205 @@
+"""
+Response cache module.
+
+This module provides an in-process LRU cache with per-endpoint TTLs for
+YouTube Data API responses, optionally backed by a directory of JSON
+files so cached data survives restarts. Entries keep their ETag so that
+expired responses can be revalidated with If-None-Match.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from src.atomic_json import save_json
+
+
+# Quota units charged by the YouTube Data API per call
+DEFAULT_QUOTA_COSTS = {
+    "search": 100,
+    "channels": 1,
+    "videos": 1,
+    "playlistItems": 1,
+}
+
+# Seconds a response stays fresh, per endpoint
+DEFAULT_TTLS = {
+    "search": 900,
+    "channels": 3600,
+    "videos": 900,
+    "playlistItems": 300,
+}
+
+# Query parameters that must never become part of a cache key
+SECRET_PARAMS = ("key", "access_token")
+
+
+class CacheEntry:
+    """A cached response body with its validator and expiry."""
+
+    __slots__ = ("data", "etag", "expires_at")
+
+    def __init__(self, data: Any, etag: Optional[str], expires_at: float):
+        self.data = data
+        self.etag = etag
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry can be served without revalidation."""
+        return (now if now is not None else time.time()) < self.expires_at
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache for JSON API responses."""
+
+    def __init__(self, max_entries: int = 256, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 300, disk_dir: Optional[str] = None,
+                 quota_costs: Optional[Dict[str, int]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of in-memory entries before LRU eviction
+            ttls: Freshness lifetime in seconds per endpoint (e.g. "search")
+            default_ttl: Lifetime for endpoints without an explicit TTL
+            disk_dir: Optional directory for a persistent second-level cache
+            quota_costs: Quota units per endpoint, used for the savings statistic
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.quota_costs = dict(DEFAULT_QUOTA_COSTS, **(quota_costs or {}))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.logger = logging.getLogger(__name__)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "evictions": 0,
+            "quota_units_saved": 0,
+        }
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """Normalize a URL into a cache key with secrets removed and params sorted."""
+        parsed = urlparse(url)
+        params = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                        if k not in SECRET_PARAMS)
+        return f"{parsed.netloc}{parsed.path}?{urlencode(params)}"
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Return the API endpoint name (last path segment) of a URL."""
+        return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    def ttl_for(self, url: str) -> float:
+        """Return the freshness lifetime for a URL's endpoint."""
+        return self.ttls.get(self.endpoint(url), self.default_ttl)
+
+    def lookup(self, url: str) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        Look up a URL.
+        Returns (entry, fresh). A stale entry is still returned so its ETag
+        can be used for revalidation. Fresh entries count as hits.
+        """
+        key = self.cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.disk_dir:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._insert(key, entry)
+
+        fresh = entry is not None and entry.is_fresh()
+        with self._lock:
+            if fresh:
+                self._stats["hits"] += 1
+                self._stats["quota_units_saved"] += self.quota_costs.get(self.endpoint(url), 1)
+            else:
+                self._stats["misses"] += 1
+        return entry, fresh
+
+    def store(self, url: str, data: Any, etag: Optional[str] = None) -> None:
+        """Store a response body for a URL."""
+        key = self.cache_key(url)
+        entry = CacheEntry(data, etag, time.time() + self.ttl_for(url))
+        with self._lock:
+            self._insert(key, entry)
+        if self.disk_dir:
+            self._save_to_disk(key, entry)
+
+    def revalidated(self, url: str) -> Optional[CacheEntry]:
+        """Extend the lifetime of an entry after a 304 Not Modified response."""
+        key = self.cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.time() + self.ttl_for(url)
+            self._stats["revalidated"] += 1
+        if self.disk_dir:
+            self._save_to_disk(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        """Drop all in-memory and on-disk entries."""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for path in self.disk_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit ratio and quota units saved."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        """Insert an entry and evict least recently used ones (lock held)."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """Return the file used to persist a cache key."""
+        return self.disk_dir / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _load_from_disk(self, key: str) -> Optional[CacheEntry]:
+        """Load an entry from the disk cache, if present and readable."""
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            return CacheEntry(record["data"], record.get("etag"), record["expires_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+    def _save_to_disk(self, key: str, entry: CacheEntry) -> None:
+        """Persist an entry atomically to the disk cache."""
+        path = self._disk_path(key)
+        try:
+            save_json(path, {"key": key, "data": entry.data, "etag": entry.etag, "expires_at": entry.expires_at})
+        except OSError as e:
+            self.logger.warning(f"Failed to write cache file {path}: {e}")
@@ -0,0 +1,185 @@
+"""
+Static assets module.
+
+This module loads the website bundle (HTML pages, CSS and JavaScript)
+into memory once, precompresses every file with gzip and, when the
+brotli package is installed, brotli, and serves it with content
+negotiation. CSS and JS are addressed by content hash (?v=<hash>) and
+cached as immutable; HTML pages reference those hashed URLs and are
+always revalidated. In debug mode changed files are reloaded.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Response, current_app, request, send_from_directory
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Files loaded into the store; anything else is left to send_from_directory
+ASSET_EXTENSIONS = (".html", ".css", ".js", ".svg", ".json", ".txt")
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class StaticAsset:
+    """One file held in memory with its precompressed variants."""
+
+    __slots__ = ("path", "mimetype", "digest", "mtime_ns", "bodies")
+
+    def __init__(self, path: str, mimetype: str, body: bytes, mtime_ns: int):
+        self.path = path
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.mtime_ns = mtime_ns
+        self.bodies = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if BROTLI_AVAILABLE:
+                self.bodies["br"] = brotli.compress(body, quality=11)
+
+    @property
+    def is_html(self) -> bool:
+        return self.mimetype == "text/html"
+
+
+class StaticAssetStore:
+    """In-memory, precompressed store for a directory of static files."""
+
+    def __init__(self, root: str, auto_reload: Optional[bool] = None):
+        """
+        Initialize the store and load all assets.
+
+        Args:
+            root: Directory holding the website bundle
+            auto_reload: Reload changed files on request; None follows the app's debug flag
+        """
+        self.root = Path(root)
+        self.auto_reload = auto_reload
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._assets = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load every asset below the root directory."""
+        assets = {}
+        if self.root.is_dir():
+            files = sorted(p for p in self.root.rglob("*") if p.is_file() and p.suffix in ASSET_EXTENSIONS)
+            # Load non-HTML assets first so pages can reference their hashes
+            for path in sorted(files, key=lambda p: p.suffix == ".html"):
+                rel = path.relative_to(self.root).as_posix()
+                body = path.read_bytes()
+                mimetype = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+                if mimetype == "text/html":
+                    body = self._link_hashed_assets(body.decode("utf-8"), assets).encode("utf-8")
+                assets[rel] = StaticAsset(rel, mimetype, body, path.stat().st_mtime_ns)
+        with self._lock:
+            self._assets = assets
+        raw = sum(len(a.bodies["identity"]) for a in assets.values())
+        packed = sum(len(a.bodies.get("gzip", a.bodies["identity"])) for a in assets.values())
+        self.logger.info(f"Loaded {len(assets)} static assets from {self.root} "
+                         f"({raw} bytes, {packed} gzipped, brotli={'on' if BROTLI_AVAILABLE else 'off'})")
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        """Return the asset for a path relative to the root."""
+        if self._should_reload():
+            self._reload_if_changed()
+        with self._lock:
+            return self._assets.get(path)
+
+    def url(self, path: str) -> str:
+        """Return the content-hashed URL of an asset (e.g. for templates)."""
+        asset = self.get(path)
+        if asset is None:
+            return "/" + path
+        return f"/{path}?v={asset.digest}"
+
+    def serve(self, path: str) -> Optional[Response]:
+        """
+        Build a response for an asset, or None if it is not in the store.
+        Picks the best encoding the client accepts and answers conditional
+        requests with 304 Not Modified.
+        """
+        asset = self.get(path)
+        if asset is None:
+            return None
+
+        encoding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in asset.bodies and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+        etag = asset.digest if encoding == "identity" else f"{asset.digest}-{encoding}"
+
+        response = Response(mimetype=asset.mimetype)
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+        else:
+            response.set_data(asset.bodies[encoding])
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        if not asset.is_html and request.args.get("v") == asset.digest:
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response
+
+    def _should_reload(self) -> bool:
+        """Whether files should be checked for changes on this request."""
+        if self.auto_reload is not None:
+            return self.auto_reload
+        try:
+            return current_app.debug
+        except RuntimeError:
+            return False
+
+    def _reload_if_changed(self) -> None:
+        """Reload everything when any file was added, removed or modified."""
+        with self._lock:
+            known = {path: asset.mtime_ns for path, asset in self._assets.items()}
+        current = {}
+        if self.root.is_dir():
+            for path in self.root.rglob("*"):
+                if path.is_file() and path.suffix in ASSET_EXTENSIONS:
+                    current[path.relative_to(self.root).as_posix()] = path.stat().st_mtime_ns
+        if current != known:
+            self.logger.info("Static assets changed on disk, reloading")
+            self.load()
+
+    @staticmethod
+    def _link_hashed_assets(html: str, assets: Dict[str, StaticAsset]) -> str:
+        """Point href/src attributes at the content-hashed URLs of loaded assets."""
+        def replace(match):
+            asset = assets.get(match.group(2))
+            if asset is None:
+                return match.group(0)
+            return f'{match.group(1)}="/{asset.path}?v={asset.digest}"'
+        return re.sub(r'\b(href|src)="/?([^"?#:]+)"', replace, html)
+
+
+def serve_asset_or_404(store: StaticAssetStore, path: str) -> Response:
+    """Serve an asset from the store, falling back to the file on disk."""
+    response = store.serve(path)
+    if response is not None:
+        return response
+    return send_from_directory(os.fspath(store.root), path)
@@ -0,0 +1,288 @@
+"""
+Task execution module.
+
+This module enforces timeouts and retries for automation tasks. An
+attempt runs either in a worker thread, where a timeout cancels the
+attempt's CancellationToken (killing the ffmpeg/yt-dlp processes it
+started), or in a forked child process in its own process group, which
+is killed outright when it overruns. Failed attempts are retried with
+exponential backoff and jitter, unless the task raised NonRetryableError
+or a timed-out attempt thread is still running.
+
+Process isolation forks the calling process, which is only safe where no
+other thread can hold a lock at the time: a single task run from the main
+thread of the CLI. Attempts started on any other thread (such as a
+TaskScheduler pool worker running a workflow) run in a thread instead, and
+long-running multithreaded hosts such as the web app call
+allow_process_isolation(False). A forked attempt's metric updates are sent
+back to the parent with its result; its catalog writes go straight to the
+database, but its Python profile is not collected.
+"""
+
+import contextvars
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cancellation import CancellationToken, use_token
+from src.metrics import MetricsRegistry
+from src.profiling import current_profiler
+
+
+# How long a timed-out attempt gets to exit after being cancelled/terminated
+KILL_GRACE_SECONDS = 5.0
+
+ISOLATION_MODES = ("thread", "process")
+
+logger = logging.getLogger(__name__)
+
+_process_isolation_allowed = True
+
+
+class NonRetryableError(Exception):
+    """Raised by a task whose failure must not be retried (e.g. it may already have uploaded)."""
+
+
+def allow_process_isolation(allowed: bool) -> None:
+    """Enable or disable forking for process-isolated attempts in this process."""
+    global _process_isolation_allowed
+    _process_isolation_allowed = allowed
+
+
+class RetryPolicy:
+    """Timeout, isolation and retry settings for one task."""
+
+    def __init__(self, max_retries: int = 3, retry_delay: float = 5.0, backoff: float = 2.0,
+                 max_delay: float = 300.0, jitter: float = 0.5, timeout: Optional[float] = 300.0,
+                 isolation: str = "thread"):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt
+            retry_delay: Delay before the first retry in seconds
+            backoff: Multiplier applied to the delay for each further retry
+            max_delay: Upper bound for a single delay
+            jitter: Fraction of each delay that is randomised (0 = none, 1 = full jitter)
+            timeout: Seconds an attempt may run; None or 0 disables the timeout
+            isolation: 'thread' or 'process'
+        """
+        if isolation not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation mode '{isolation}'")
+        self.max_retries = max(0, int(max_retries))
+        self.retry_delay = max(0.0, float(retry_delay))
+        self.backoff = max(1.0, float(backoff))
+        self.max_delay = float(max_delay)
+        self.jitter = min(1.0, max(0.0, float(jitter)))
+        self.timeout = float(timeout) if timeout else None
+        self.isolation = isolation
+
+    @classmethod
+    def from_settings(cls, defaults: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None) -> "RetryPolicy":
+        """
+        Build a policy from automation_settings, overridden by a task's task_settings
+        (keys: max_retries, retry_delay, retry_backoff, retry_max_delay, retry_jitter,
+        timeout, isolation).
+        """
+        settings = dict(defaults or {}, **(overrides or {}))
+        return cls(
+            max_retries=settings.get("max_retries", 3),
+            retry_delay=settings.get("retry_delay", 5.0),
+            backoff=settings.get("retry_backoff", 2.0),
+            max_delay=settings.get("retry_max_delay", 300.0),
+            jitter=settings.get("retry_jitter", 0.5),
+            timeout=settings.get("timeout", 300.0),
+            isolation=settings.get("isolation", "thread"),
+        )
+
+    def delay(self, attempt: int, rand: Callable[[], float] = random.random) -> float:
+        """Delay after failed attempt number `attempt` (1-based)."""
+        base = min(self.max_delay, self.retry_delay * self.backoff ** (attempt - 1))
+        return base * (1 - self.jitter * rand())
+
+
+class AttemptResult:
+    """Outcome of one attempt at running a task."""
+
+    def __init__(self, attempt: int, success: bool, started_at: float, duration_seconds: float,
+                 error: Optional[str] = None, timed_out: bool = False, retryable: bool = True):
+        self.attempt = attempt
+        self.success = success
+        self.started_at = started_at
+        self.duration_seconds = duration_seconds
+        self.error = error
+        self.timed_out = timed_out
+        self.retryable = retryable
+
+    @property
+    def outcome(self) -> str:
+        return "success" if self.success else ("timeout" if self.timed_out else "error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "attempt": self.attempt,
+            "outcome": self.outcome,
+            "started_at": self.started_at,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "error": self.error,
+        }
+
+
+def fork_available() -> bool:
+    """True if attempts can run in forked child processes."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def run_attempt(func: Callable[[], bool], timeout: Optional[float] = None,
+                isolation: str = "thread",
+                metrics: Optional[MetricsRegistry] = None) -> Tuple[bool, Optional[str], bool]:
+    """
+    Run func once under the timeout. Returns (success, error, timed_out).
+    Without a timeout a thread-isolated attempt runs inline.
+    """
+    return _attempt(func, timeout, isolation, metrics)[:3]
+
+
+def _attempt(func: Callable[[], bool], timeout: Optional[float], isolation: str,
+             metrics: Optional[MetricsRegistry]) -> Tuple[bool, Optional[str], bool, bool]:
+    """run_attempt plus whether a failure may be retried."""
+    if isolation == "process":
+        if not _process_isolation_allowed:
+            logger.debug("Process isolation is disabled in this process; running the attempt in a thread")
+        elif threading.current_thread() is not threading.main_thread():
+            # Sibling tasks on the pool may hold locks that the child would inherit
+            logger.debug("Process isolation needs the main thread; running the attempt in a thread")
+        elif fork_available():
+            return _run_in_process(func, timeout, metrics)
+        else:
+            logger.warning("Process isolation needs fork(); running the attempt in a thread")
+    if not timeout:
+        return _call(func)
+    return _run_in_thread(func, timeout)
+
+
+def _call(func: Callable[[], bool]) -> Tuple[bool, Optional[str], bool, bool]:
+    try:
+        return bool(func()), None, False, True
+    except NonRetryableError as e:
+        return False, str(e), False, False
+    except Exception as e:  # includes JobCancelled raised after a timeout
+        return False, str(e), False, True
+
+
+def _run_in_thread(func: Callable[[], bool], timeout: float) -> Tuple[bool, Optional[str], bool, bool]:
+    """
+    Run in a daemon thread with the caller's context (cancellation token, tracer,
+    profiler); on timeout cancel the attempt's token. A thread that does not stop
+    is abandoned and the failure is not retried, so two attempts never overlap.
+    """
+    token = CancellationToken()
+    outcome = {}
+    profiler = current_profiler()
+
+    def target():
+        with use_token(token), profiler.profile_thread() if profiler else nullcontext():
+            outcome["result"] = _call(func)
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(target,),
+                              name="task-attempt", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if not thread.is_alive():
+        return outcome["result"]
+    token.cancel(f"Timed out after {timeout:g}s")
+    thread.join(KILL_GRACE_SECONDS)
+    if thread.is_alive():
+        return False, f"timed out after {timeout:g}s (attempt did not stop and was abandoned)", True, False
+    return False, f"timed out after {timeout:g}s", True, True
+
+
+def _child_main(func: Callable[[], bool], conn: Any, metrics: Optional[MetricsRegistry]) -> None:
+    """Entry point of a forked attempt: own process group, result and metric updates sent over a pipe."""
+    if os.name == "posix":
+        os.setpgrp()
+    if metrics is not None:
+        metrics.start_journal()
+    try:
+        result = _call(func)
+        conn.send((result, metrics.take_journal() if metrics is not None else []))
+    finally:
+        conn.close()
+
+
+def _run_in_process(func: Callable[[], bool], timeout: Optional[float],
+                    metrics: Optional[MetricsRegistry] = None) -> Tuple[bool, Optional[str], bool, bool]:
+    """Run in a forked child; on timeout kill its whole process group (including ffmpeg)."""
+    ctx = multiprocessing.get_context("fork")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child_main, args=(func, send, metrics), name="task-attempt", daemon=True)
+    proc.start()
+    send.close()
+    try:
+        if recv.poll(timeout):
+            try:
+                result, journal = recv.recv()
+            except EOFError:
+                result, journal = None, []
+            if metrics is not None:
+                metrics.replay(journal)
+            proc.join(KILL_GRACE_SECONDS)
+            if result is not None:
+                return result
+            return False, f"attempt process exited with code {proc.exitcode}", False, True
+        if not proc.is_alive():
+            return False, f"attempt process exited with code {proc.exitcode}", False, True
+        _kill_group(proc)
+        return False, f"timed out after {timeout:g}s", True, True
+    finally:
+        recv.close()
+        if proc.is_alive():
+            _kill_group(proc)
+
+
+def _kill_group(proc: Any) -> None:
+    """Terminate a forked attempt and everything it started, escalating to SIGKILL."""
+    for sig in (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, sig)
+            else:
+                proc.terminate()
+        except (ProcessLookupError, PermissionError):
+            return
+        proc.join(KILL_GRACE_SECONDS)
+        if not proc.is_alive():
+            return
+
+
+def run_with_retries(func: Callable[[], bool], policy: RetryPolicy,
+                     on_attempt: Optional[Callable[[AttemptResult], None]] = None,
+                     sleep: Callable[[float], Any] = time.sleep,
+                     metrics: Optional[MetricsRegistry] = None) -> List[AttemptResult]:
+    """
+    Run attempts until one succeeds, fails for good or retries are used up;
+    returns the AttemptResults. on_attempt is called after each attempt. A
+    truthy return from sleep(delay) (e.g. Event.wait) stops further retries.
+    metrics receives the updates made inside forked attempts.
+    """
+    attempts = []
+    for attempt in range(1, policy.max_retries + 2):
+        started_at = time.time()
+        start = time.monotonic()
+        success, error, timed_out, retryable = _attempt(func, policy.timeout, policy.isolation, metrics)
+        result = AttemptResult(attempt, success, started_at, time.monotonic() - start, error, timed_out,
+                               retryable)
+        attempts.append(result)
+        if on_attempt:
+            on_attempt(result)
+        if success or not retryable or attempt > policy.max_retries:
+            break
+        if sleep(policy.delay(attempt)):
+            break
+    return attempts
@@ -0,0 +1,190 @@
+"""
+Task scheduler module.
+
+This module runs a set of automation tasks concurrently while respecting
+the dependencies they declare. Each task belongs to a resource class
+(e.g. 'media' for ffmpeg/Whisper work, 'network' for API calls) and each
+class has its own concurrency limit, so independent light tasks overlap
+while heavy ones do not oversubscribe the machine.
+"""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Concurrent tasks allowed per resource class
+DEFAULT_RESOURCE_LIMITS = {
+    "default": 4,
+    "network": 4,
+    "disk": 2,
+    "media": 1,
+}
+
+
+class TaskSpec:
+    """A registered task: its function, dependencies and resource class."""
+
+    def __init__(self, name: str, func: Callable[[], bool], depends_on: Iterable[str] = (),
+                 after: Iterable[str] = (), resource: str = "default"):
+        """
+        Initialize the spec.
+
+        Args:
+            name: Task name
+            func: Zero-argument callable returning True on success
+            depends_on: Tasks that must succeed first; they are scheduled too if not requested
+            after: Tasks that must finish first if they are scheduled in the same run
+            resource: Resource class limiting how many such tasks run at once
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.after = tuple(after)
+        self.resource = resource
+
+
+class TaskResult:
+    """Outcome and timing of one task in a run."""
+
+    def __init__(self, name: str, success: bool, started_at: Optional[float] = None,
+                 duration_seconds: float = 0.0, error: Optional[str] = None, skipped: bool = False,
+                 attempts: Optional[List[Dict[str, Any]]] = None):
+        self.name = name
+        self.success = success
+        self.started_at = started_at
+        self.duration_seconds = duration_seconds
+        self.error = error
+        self.skipped = skipped
+        self.attempts = attempts or []
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def __repr__(self) -> str:
+        state = "skipped" if self.skipped else ("ok" if self.success else "failed")
+        return f"TaskResult({self.name!r}, {state}, {self.duration_seconds:.2f}s)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "success": self.success,
+            "skipped": self.skipped,
+            "started_at": self.started_at,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "error": self.error,
+            "attempts": self.attempts,
+        }
+
+
+def resolve_order(specs: Dict[str, TaskSpec], names: Iterable[str]) -> List[str]:
+    """
+    Expand names with their hard dependencies and return them in a valid
+    topological order (requested order is kept where possible).
+    Raises ValueError for unknown tasks and dependency cycles.
+    """
+    selected = []
+    pending = list(names)
+    while pending:
+        name = pending.pop(0)
+        if name in selected:
+            continue
+        if name not in specs:
+            raise ValueError(f"Task '{name}' not found")
+        selected.append(name)
+        pending.extend(specs[name].depends_on)
+
+    ordered = []
+    state = {}
+
+    def visit(name, chain):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = "visiting"
+        spec = specs[name]
+        for dep in spec.depends_on + tuple(a for a in spec.after if a in selected):
+            visit(dep, chain + [name])
+        state[name] = "done"
+        ordered.append(name)
+
+    for name in selected:
+        visit(name, [])
+    return ordered
+
+
+class TaskScheduler:
+    """Runs tasks on an executor as soon as their dependencies allow."""
+
+    def __init__(self, max_workers: int = 4, resource_limits: Optional[Dict[str, int]] = None,
+                 executor_factory: Optional[Callable[[int], Executor]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Size of the worker pool
+            resource_limits: Concurrent tasks per resource class (unknown classes get 1)
+            executor_factory: Builds the pool from max_workers; defaults to a thread pool.
+                A ProcessPoolExecutor works for tasks whose functions can be pickled.
+        """
+        self.set_limits(max_workers, resource_limits)
+        self.executor_factory = executor_factory or (
+            lambda n: ThreadPoolExecutor(max_workers=n, thread_name_prefix="task"))
+        self.logger = logging.getLogger(__name__)
+
+    def set_limits(self, max_workers: int, resource_limits: Optional[Dict[str, int]] = None) -> None:
+        """Change the pool size and resource limits; runs already in progress keep theirs."""
+        self.max_workers = max(1, max_workers or (os.cpu_count() or 1))
+        self.resource_limits = dict(DEFAULT_RESOURCE_LIMITS, **(resource_limits or {}))
+
+    def run(self, specs: Dict[str, TaskSpec], names: Iterable[str],
+            execute: Callable[[TaskSpec], TaskResult]) -> Dict[str, TaskResult]:
+        """
+        Run the named tasks (plus their dependencies) and return results by name,
+        in dependency order. execute() runs one task on a pool worker. A task whose
+        hard dependency failed is skipped.
+        """
+        order = resolve_order(specs, names)
+        waiting_on = {name: set(specs[name].depends_on) |
+                      {a for a in specs[name].after if a in order} for name in order}
+        results = {}
+        running = {}
+        in_use = {}
+
+        with self.executor_factory(self.max_workers) as executor:
+            while len(results) < len(order):
+                for name in order:
+                    if name in results or name in running.values() or waiting_on[name] - set(results):
+                        continue
+                    spec = specs[name]
+                    failed = [d for d in spec.depends_on if not results[d].success]
+                    if failed:
+                        results[name] = TaskResult(name, False, error=f"dependency failed: {', '.join(failed)}",
+                                                   skipped=True)
+                        self.logger.warning(f"Skipping task '{name}': {results[name].error}")
+                        continue
+                    if in_use.get(spec.resource, 0) >= max(1, self.resource_limits.get(spec.resource, 1)):
+                        continue
+                    in_use[spec.resource] = in_use.get(spec.resource, 0) + 1
+                    running[executor.submit(execute, spec)] = name
+                if not running:
+                    # Everything left was just skipped; loop again to finish
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    in_use[specs[name].resource] -= 1
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        results[name] = TaskResult(name, False, error=str(e))
+        return {name: results[name] for name in order}
+
+
+def summarize(results: Dict[str, TaskResult]) -> Tuple[int, int, int]:
+    """(succeeded, failed, skipped) counts of a run."""
+    succeeded = sum(1 for r in results.values() if r.success)
+    skipped = sum(1 for r in results.values() if r.skipped)
+    return succeeded, len(results) - succeeded - skipped, skipped
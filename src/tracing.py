@@ -0,0 +1,131 @@
+"""
+Tracing module.
+
+This module records nested timing spans for a job and exports them in
+the Chrome trace event format, which chrome://tracing and Perfetto
+(ui.perfetto.dev) can open directly. A tracer is activated for the
+current thread of work with a context variable, so pipeline methods can
+open spans without a tracer being passed through every call; when no
+tracer is active, span() costs a single context variable lookup.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+_current_tracer = contextvars.ContextVar("current_tracer", default=None)
+
+
+class Tracer:
+    """Collects complete ('X') and instant ('i') trace events for one job."""
+
+    def __init__(self, name: str = "job", metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            name: Process name shown in the trace viewer
+            metadata: Extra key/values stored in the trace file (e.g. job id, URL)
+        """
+        self.name = name
+        self.metadata = dict(metadata or {})
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._events = []
+        self._threads = {}
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event["pid"] = self._pid
+        event["tid"] = thread.ident
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "pipeline", **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a with-block. Yields the span's attribute dict so results
+        (e.g. number of scenes) can be attached before it closes.
+        """
+        start = self._now_us()
+        args = dict(attrs)
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._add({"name": name, "cat": cat, "ph": "X", "ts": round(start, 1),
+                       "dur": round(self._now_us() - start, 1), "args": args})
+
+    def instant(self, name: str, cat: str = "pipeline", **attrs: Any) -> None:
+        """Record a point-in-time event."""
+        self._add({"name": name, "cat": cat, "ph": "i", "s": "t",
+                   "ts": round(self._now_us(), 1), "args": dict(attrs)})
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this tracer the target of span() for the enclosed code."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Return a copy of the recorded events."""
+        with self._lock:
+            return [dict(e) for e in self._events]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build the Chrome trace JSON object."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        meta = [{"name": "process_name", "ph": "M", "pid": self._pid, "args": {"name": self.name}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": tname}}
+                 for tid, tname in threads.items()]
+        return {
+            "traceEvents": meta + sorted(events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": self.metadata,
+        }
+
+    def write(self, path: str) -> Path:
+        """Write the trace atomically and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        tmp_path.replace(path)
+        return path
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Return the tracer active in this context, if any."""
+    return _current_tracer.get()
+
+
+def activate(tracer: Optional[Tracer]):
+    """Activate tracer if one is given; a no-op context otherwise."""
+    return tracer.activate() if tracer is not None else nullcontext()
+
+
+def span(name: str, cat: str = "pipeline", **attrs: Any):
+    """Open a span on the active tracer, or do nothing if tracing is off."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return nullcontext({})
+    return tracer.span(name, cat, **attrs)
@@ -0,0 +1,215 @@
+"""
+YouTube Data API module.
+
+This module provides a small client for the read-only YouTube Data API
+calls used by the web app and the automation framework: channel uploads
+playlists, paged playlist listings and batched video details. Requests
+go through a pooled HTTP client and, optionally, the response cache.
+"""
+
+import http.client
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from src.http_client import PooledHTTPClient
+from src.metrics import MetricsRegistry
+from src.response_cache import DEFAULT_QUOTA_COSTS, ResponseCache
+
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3/"
+
+# YouTube Data API caps maxResults and the number of IDs per videos.list call at 50
+MAX_PAGE_SIZE = 50
+
+# Videos up to this length are treated as Shorts
+SHORT_MAX_SECONDS = 90
+
+
+def parse_iso8601_duration(duration: str) -> float:
+    """Parse ISO8601 duration like PT1M5S to seconds."""
+    if not duration or not duration.startswith('P'):
+        return 0.0
+    hours = minutes = seconds = 0
+    match_h = re.search(r"(\d+)H", duration)
+    match_m = re.search(r"(\d+)M", duration)
+    match_s = re.search(r"(\d+)S", duration)
+    if match_h:
+        hours = int(match_h.group(1))
+    if match_m:
+        minutes = int(match_m.group(1))
+    if match_s:
+        seconds = int(match_s.group(1))
+    return hours*3600 + minutes*60 + seconds
+
+
+def summarize_video(item: Dict[str, Any], published_at: Optional[str] = None) -> Dict[str, Any]:
+    """Reduce a videos.list item to the fields the app works with."""
+    sn = item.get('snippet', {})
+    cd = item.get('contentDetails', {})
+    duration_s = parse_iso8601_duration(cd.get('duration', ''))
+    thumb = None
+    thumbs = sn.get('thumbnails', {})
+    # pick best available
+    for key in ['medium', 'high', 'default']:
+        if key in thumbs:
+            thumb = thumbs[key]['url']
+            break
+    return {
+        'id': item.get('id'),
+        'title': sn.get('title'),
+        'publishedAt': sn.get('publishedAt') or published_at,
+        'thumbnail': thumb,
+        'durationSeconds': duration_s,
+        'isShort': duration_s <= SHORT_MAX_SECONDS
+    }
+
+
+class YouTubeDataClient:
+    """Read-only YouTube Data API client with response caching."""
+
+    def __init__(self, http: Optional[PooledHTTPClient] = None,
+                 cache: Optional[ResponseCache] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the client.
+
+        Args:
+            http: Pooled HTTP client to send requests with
+            cache: Optional response cache (enables ETag revalidation)
+            metrics: Optional registry that counts quota units consumed
+        """
+        self.http = http or PooledHTTPClient()
+        self.cache = cache
+        self.metrics = metrics
+        self.quota_costs = cache.quota_costs if cache else dict(DEFAULT_QUOTA_COSTS)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def api_key() -> Optional[str]:
+        """Return the API key from the environment."""
+        return os.environ.get('YOUTUBE_API_KEY')
+
+    @staticmethod
+    def url(endpoint: str, **params) -> str:
+        """Build an API URL for an endpoint such as 'channels'."""
+        return API_BASE_URL + endpoint + '?' + urlencode(params)
+
+    def get_json(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        GET an API URL through the response cache.
+        Fresh cached responses are served without a request; stale ones are
+        revalidated with If-None-Match and reused on 304 Not Modified.
+        Returns None on any error.
+        """
+        entry, fresh = self.cache.lookup(url) if self.cache else (None, False)
+        if fresh:
+            return entry.data
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        try:
+            resp = self.http.get(url, headers=headers)
+            if self.metrics is not None:
+                endpoint = ResponseCache.endpoint(url)
+                self.metrics.increment('youtube_quota_units', self.quota_costs.get(endpoint, 1), endpoint=endpoint)
+            if resp.status == 304 and entry is not None:
+                self.cache.revalidated(url)
+                return entry.data
+            if resp.status != 200:
+                self.logger.error(f"YouTube API HTTP error: {resp.status} for {ResponseCache.cache_key(url)}")
+                return None
+            data = resp.json()
+            if self.cache:
+                self.cache.store(url, data, resp.headers.get('etag') or data.get('etag'))
+            return data
+        except (OSError, http.client.HTTPException) as e:
+            self.logger.error(f"YouTube API HTTP error: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"YouTube API parse error: {e}")
+            return None
+
+    def uploads_playlist_id(self, channel_id: str, api_key: str) -> Optional[str]:
+        """Return the channel's uploads playlist ID (channels.list, 1 unit, cached)."""
+        data = self.get_json(self.url('channels', part='contentDetails', id=channel_id, key=api_key))
+        if data and data.get('items'):
+            uploads = data['items'][0].get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+            if uploads:
+                return uploads
+        # Uploads playlists mirror the channel ID with a UU prefix
+        if channel_id.startswith('UC'):
+            return 'UU' + channel_id[2:]
+        return None
+
+    def playlist_page(self, playlist_id: str, api_key: str, page_size: int = MAX_PAGE_SIZE,
+                      page_token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Fetch one page of playlistItems (contentDetails only, 1 unit)."""
+        params = {
+            'part': 'contentDetails',
+            'playlistId': playlist_id,
+            'maxResults': max(1, min(int(page_size), MAX_PAGE_SIZE)),
+            'key': api_key
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        return self.get_json(self.url('playlistItems', **params))
+
+    def video_details(self, video_ids: List[str], api_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch contentDetails and snippet for video IDs in batches of 50 (1 unit per batch)."""
+        items = []
+        for i in range(0, len(video_ids), MAX_PAGE_SIZE):
+            batch = video_ids[i:i + MAX_PAGE_SIZE]
+            data = self.get_json(self.url('videos', part='contentDetails,snippet',
+                                          id=','.join(batch), key=api_key))
+            if not data:
+                return None
+            items.extend(data.get('items', []))
+        return items
+
+    def latest_videos(self, channel_id: str, api_key: str, page_size: int = 15, total: int = 15,
+                      page_token: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch the channel's latest videos with durations. Returns (payload, http_status).
+        Lists the uploads playlist with playlistItems.list (1 unit per page) instead of
+        search.list (100 units), following page tokens until `total` videos are collected.
+        """
+        # Step 1: get latest video IDs from the channel's uploads playlist
+        playlist_id = self.uploads_playlist_id(channel_id, api_key)
+        if not playlist_id:
+            return {'success': False, 'message': 'Uploads playlist not found'}, 502
+
+        video_ids = []
+        published_map = {}
+        next_token = page_token
+        while len(video_ids) < total:
+            playlist_data = self.playlist_page(playlist_id, api_key,
+                                               min(page_size, total - len(video_ids)), next_token)
+            if not playlist_data:
+                if not video_ids:
+                    return {'success': False, 'message': 'Playlist listing failed'}, 502
+                break
+            for it in playlist_data.get('items', []):
+                cd = it.get('contentDetails', {})
+                vid = cd.get('videoId')
+                if vid and vid not in published_map:
+                    video_ids.append(vid)
+                    published_map[vid] = cd.get('videoPublishedAt')
+            next_token = playlist_data.get('nextPageToken')
+            if not next_token:
+                break
+
+        if not video_ids:
+            return {'success': True, 'videos': [], 'nextPageToken': None}, 200
+
+        # Step 2: get durations and more details
+        details = self.video_details(video_ids, api_key)
+        if details is None:
+            return {'success': False, 'message': 'Videos fetch failed'}, 502
+
+        videos = [summarize_video(item, published_map.get(item.get('id'))) for item in details]
+        # Prioritize shorts at the top
+        videos.sort(key=lambda v: (not v['isShort'], v.get('publishedAt') or ''), reverse=False)
+        return {'success': True, 'videos': videos, 'nextPageToken': next_token}, 200
@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    """The default configuration, with the catalog and hardware profile kept under tmp_path."""
+    manager = ConfigManager()
+    manager.update_setting("catalog.path", str(tmp_path / "catalog.db"))
+    manager.update_setting("task_settings.system_check.profile_path", str(tmp_path / "hardware_profile.json"))
+    return manager
@@ -24,9 +24,8 @@ def test_config_manager_initialization():
     assert config["app_name"] == "Automation Framework"
 
 
-def test_automation_framework_initialization():
+def test_automation_framework_initialization(config_manager):
     """Test that AutomationFramework initializes properly."""
-    config_manager = ConfigManager()
     framework = AutomationFramework(config_manager)
     
     tasks = framework.list_tasks()
@@ -36,36 +35,32 @@ def test_automation_framework_initialization():
     assert "clip_uploader" in tasks
 
 
-def test_hello_world_task():
+def test_hello_world_task(config_manager):
     """Test the hello world task."""
-    config_manager = ConfigManager()
     framework = AutomationFramework(config_manager)
     
     result = framework.run_task("hello_world")
     assert result is True
 
 
-def test_system_check_task():
+def test_system_check_task(config_manager):
     """Test the system check task."""
-    config_manager = ConfigManager()
     framework = AutomationFramework(config_manager)
     
     result = framework.run_task("system_check")
     assert result is True
 
 
-def test_invalid_task():
+def test_invalid_task(config_manager):
     """Test running an invalid task."""
-    config_manager = ConfigManager()
     framework = AutomationFramework(config_manager)
     
     result = framework.run_task("nonexistent_task")
     assert result is False
 
 
-def test_task_status():
+def test_task_status(config_manager):
     """Test getting task status."""
-    config_manager = ConfigManager()
     framework = AutomationFramework(config_manager)
     
     status = framework.get_task_status()
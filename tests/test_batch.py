@@ -0,0 +1,93 @@
+"""
+Tests for multi-video batch processing.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.batch import PipelineBudget, collect_sources, run_batch, video_slug
+
+
+def test_sources_from_urls_and_manifests_are_deduplicated(tmp_path):
+    """video_url, video_urls and manifest entries are merged in order without repeats."""
+    text_manifest = tmp_path / "nightly.txt"
+    text_manifest.write_text("# nightly sources\nhttps://a.example/1.mp4\n\nhttps://a.example/2.mp4  # second\n")
+    assert collect_sources({"video_url": "https://a.example/2.mp4", "video_urls": ["https://a.example/3.mp4"],
+                            "manifest": str(text_manifest)}) == [
+        "https://a.example/2.mp4", "https://a.example/3.mp4", "https://a.example/1.mp4"]
+
+    json_manifest = tmp_path / "nightly.json"
+    json_manifest.write_text(json.dumps({"videos": [{"url": "https://youtu.be/x"}, "https://youtu.be/y"]}))
+    assert collect_sources({"manifest": str(json_manifest)}) == ["https://youtu.be/x", "https://youtu.be/y"]
+
+
+def test_budget_caps_concurrent_stages():
+    """Only `encode` slots' worth of encodes overlap, whatever the worker count."""
+    budget = PipelineBudget({"encode": 2})
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def encode():
+        with budget.slot("encode"):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=encode) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 2
+
+
+def test_whisper_models_are_pooled_per_asr_slot():
+    """Concurrent videos share loaded models; no more than `asr` are ever loaded."""
+    budget = PipelineBudget({"asr": 2})
+    loaded = []
+
+    def transcribe():
+        with budget.whisper_model("tiny", lambda: loaded.append(object()) or loaded[-1]):
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=transcribe) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 <= len(loaded) <= 2
+    with budget.whisper_model("base", lambda: "base-model") as model:
+        assert model == "base-model"
+    budget.release_models()
+
+
+def test_failing_video_does_not_abort_the_batch():
+    """Exceptions and pipeline errors are recorded per video; the others still run."""
+    def process(url):
+        if url.endswith("crash"):
+            raise RuntimeError("download failed")
+        errors = ["Failed processing clip 0"] if url.endswith("partial") else []
+        return {"url": url, "clips_created": 2, "clips_uploaded": 0, "errors": errors}
+
+    report = run_batch(["v/ok", "v/crash", "v/partial", "v/ok2"], process, max_concurrent=3)
+    assert [v["status"] for v in report["videos"]] == ["success", "error", "error", "success"]
+    assert report["videos"][1]["errors"] == ["download failed"]
+    assert report["totals"] == {"videos": 4, "succeeded": 2, "failed": 2, "clips_created": 6, "clips_uploaded": 0}
+
+
+def test_video_slug_is_stable_and_distinct():
+    """Slugs use the YouTube ID or file name and differ for different URLs."""
+    assert video_slug("https://www.youtube.com/watch?v=abc123").startswith("abc123-")
+    assert video_slug("/media/talk one.mp4").startswith("talk_one-")
+    assert video_slug("https://a.example/x.mp4") != video_slug("https://b.example/x.mp4")
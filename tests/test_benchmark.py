@@ -0,0 +1,46 @@
+"""
+Tests for the pipeline benchmark suite.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.benchmark import BenchmarkSuite, build_source_command, compare_results, ffmpeg_available
+
+
+def test_source_command_has_one_input_per_scene(tmp_path):
+    """A 20 second source cut every 6 seconds has four scenes and an audio track."""
+    cmd = build_source_command(tmp_path / "src.mp4", 320, 180, 20, 6)
+    inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-i"]
+    assert len(inputs) == 5
+    assert inputs[3].endswith("duration=2") and inputs[-1].startswith("sine=")
+    assert "concat=n=4:v=1:a=0" in cmd[cmd.index("-filter_complex") + 1]
+
+
+def test_compare_results_applies_tolerances():
+    """Only slowdowns beyond the stage tolerance and noise floor are regressions."""
+    baseline = {"results": {"a": {"extract": {"median_seconds": 1.0},
+                                  "metadata": {"median_seconds": 0.001}}}}
+    current = {"results": {"a": {"extract": {"median_seconds": 1.2},
+                                 "metadata": {"median_seconds": 0.004},
+                                 "scenes_detected": 3}}}
+    assert compare_results(current, baseline, default_tolerance=0.25) == []
+    regressions = compare_results(current, baseline, tolerances={"extract": 0.1})
+    assert [(r["stage"], r["ratio"]) for r in regressions] == [("extract", 1.2)]
+
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg is not installed")
+@pytest.mark.parametrize("repeat", [1, 2])
+def test_suite_runs_on_a_small_synthetic_source(tmp_path, repeat):
+    """The scene cuts rendered into the source are found again; repeated stages overwrite their output."""
+    spec = {"name": "tiny", "width": 320, "height": 180, "duration": 12, "scene_seconds": 6, "audio": "sine"}
+    results = BenchmarkSuite(tmp_path, repeat=repeat).run([spec])["results"]["tiny"]
+    assert results["scenes_detected"] >= results["expected_cuts"] == 1
+    assert results["clips_created"] >= 1
+    assert all(results[stage]["median_seconds"] >= 0 for stage in ("scene_detect", "extract", "process_video"))
@@ -0,0 +1,89 @@
+"""
+Tests for job cancellation.
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cancellation import CancellationToken, JobCancelled
+from src.auto_clip_uploader import AutoClipUploader
+
+
+def test_cancel_kills_registered_process():
+    """Cancelling the token terminates its child processes within seconds."""
+    token = CancellationToken()
+    proc = token.popen([sys.executable, "-c", "import time; time.sleep(60)"])
+
+    start = time.monotonic()
+    token.cancel("test")
+    proc.wait(timeout=5)
+
+    assert time.monotonic() - start < 5
+    assert token.cancelled
+    with pytest.raises(JobCancelled):
+        token.raise_if_cancelled()
+    with pytest.raises(JobCancelled):
+        token.popen([sys.executable, "-c", "pass"])
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as a stand-in ffmpeg")
+def test_scene_detect_stops_when_cancelled(tmp_path, monkeypatch):
+    """A hung ffmpeg run is torn down and surfaces as JobCancelled."""
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text('#!/bin/sh\n[ "$1" = "-version" ] && exit 0\nsleep 60\n')
+    fake_ffmpeg.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    uploader = AutoClipUploader()
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    start = time.monotonic()
+    with pytest.raises(JobCancelled):
+        uploader.run_ffmpeg_scene_detect("input.mp4", cancel_token=token)
+    assert time.monotonic() - start < 5
+
+
+def test_cancelled_download_removes_only_its_own_files(tmp_path, monkeypatch):
+    """A cancelled job deletes its partial download, not a concurrent job's source."""
+    other = tmp_path / "tmp" / "source-otherjob.mp4"
+    other.parent.mkdir()
+    other.write_bytes(b"x")
+    token = CancellationToken()
+
+    def fake_yt_dlp(args, progress_callback=None, cancel_token=None):
+        Path(args[args.index("-o") + 1].replace("%(ext)s", "mp4.part")).write_bytes(b"x")
+        token.cancel("user")
+        token.raise_if_cancelled()
+
+    uploader = AutoClipUploader()
+    monkeypatch.setattr(uploader, "_run_yt_dlp", fake_yt_dlp)
+    results = uploader.process_video("https://www.youtube.com/watch?v=abc", dry_run=True, cancel_token=token,
+                                     job_id="thisjob", clip_dir=tmp_path / "clips", tmp_dir=tmp_path / "tmp")
+    assert results["cancelled"]
+    assert sorted(p.name for p in other.parent.iterdir()) == ["source-otherjob.mp4"]
+
+
+def test_finished_run_removes_its_download(tmp_path, monkeypatch):
+    """The per-job download is deleted once the run is over, so sources do not pile up."""
+    def fake_yt_dlp(args, progress_callback=None, cancel_token=None):
+        Path(args[args.index("-o") + 1].replace("%(ext)s", "mp4")).write_bytes(b"x")
+
+    uploader = AutoClipUploader()
+    monkeypatch.setattr(uploader, "_run_yt_dlp", fake_yt_dlp)
+    monkeypatch.setattr(uploader, "run_ffmpeg_scene_detect", lambda source, **kwargs: [])
+    monkeypatch.setattr(uploader, "select_clip_ranges", lambda scenes, max_clips=None: [])
+    results = uploader.process_video("https://www.youtube.com/watch?v=abc", dry_run=True,
+                                     cancel_token=CancellationToken(), job_id="thisjob",
+                                     clip_dir=tmp_path / "clips", tmp_dir=tmp_path / "tmp")
+    assert not results["errors"]
+    assert [p.name for p in (tmp_path / "tmp").iterdir() if not p.name.startswith(".")] == []
@@ -0,0 +1,68 @@
+"""
+Tests for the SQLite clip catalog.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.catalog import ClipCatalog
+
+SOURCE_A = "https://youtube.com/watch?v=aaa"
+SOURCE_B = "https://youtube.com/watch?v=bbb"
+
+
+def clip(idx, **extra):
+    return dict({"index": idx, "start": idx * 10.0, "end": idx * 10.0 + 8, "duration": 8.0,
+                 "file_path": f"videos/clips/clip_{idx:03d}.mp4", "title": f"Clip {idx}",
+                 "tags": ["a", "b"], "transcript": "hello world"}, **extra)
+
+
+def test_jobs_clips_and_uploads_are_persisted(tmp_path):
+    """Data survives reopening the file; the database runs in WAL mode; upload outcomes update status."""
+    catalog = ClipCatalog(str(tmp_path / "catalog.db"))
+    catalog.start_job("job1", SOURCE_A, dry_run=True)
+    first = catalog.add_clip("job1", SOURCE_A, clip(0))
+    second = catalog.add_clip("job1", SOURCE_A, clip(1, uploaded=False, upload_error="quota"))
+    catalog.finish_job("job1", "completed")
+    catalog.record_upload(first, youtube_id="yt1")
+
+    reopened = ClipCatalog(str(tmp_path / "catalog.db"))
+    assert reopened._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    stored = reopened.get_clip(first)
+    assert (stored["status"], stored["youtube_id"], stored["tags"]) == ("uploaded", "yt1", ["a", "b"])
+    assert stored["transcript"] == "hello world" and stored["source_url"] == SOURCE_A
+    assert reopened.get_clip(second)["status"] == "upload_failed"
+    job = reopened.list_jobs()[0]
+    assert (job["status"], job["clips_created"], job["clips_uploaded"]) == ("completed", 2, 0)
+
+
+def test_listing_filters_and_paginates_with_a_cursor(tmp_path):
+    """Pages follow each other without overlap, newest first; filters narrow the set and the total."""
+    catalog = ClipCatalog(str(tmp_path / "catalog.db"))
+    for job, source in (("job1", SOURCE_A), ("job2", SOURCE_B)):
+        catalog.start_job(job, source)
+        for idx in range(5):
+            catalog.add_clip(job, source, clip(idx))
+    catalog.start_job("job3", SOURCE_B)
+    catalog.add_clip("job3", SOURCE_B, clip(0))
+    catalog.finish_job("job3", "cancelled", error="Cancelled by user")
+
+    seen, cursor = [], None
+    while True:
+        page = catalog.list_clips(limit=4, cursor=cursor)
+        seen += [c["id"] for c in page["clips"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True) and len(seen) == 11
+    assert "transcript" not in page["clips"][0]
+
+    page = catalog.list_clips(source=SOURCE_B, status="created", limit=2, include_total=True)
+    assert page["total"] == 5 and len(page["clips"]) == 2
+    assert {c["job_id"] for c in page["clips"]} == {"job2"}
+    assert catalog.list_clips(status="discarded")["clips"][0]["job_id"] == "job3"
+    assert catalog.list_clips(job_id="job1", include_total=True)["total"] == 5
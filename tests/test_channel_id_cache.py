@@ -0,0 +1,48 @@
+"""
+Tests for the persistent channel ID cache.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.channel_id_cache import ChannelIdCache
+
+
+def test_resolved_ids_persist_across_instances(tmp_path):
+    """A resolved handle is served from disk after a restart."""
+    path = tmp_path / "channel_ids.json"
+    key = ChannelIdCache.make_key("handle", "@ItsMeIrtza")
+    assert key == "handle:itsmeirtza"
+
+    ChannelIdCache(str(path)).put(key, "UC123")
+    assert ChannelIdCache(str(path)).get(key) == (True, "UC123")
+
+
+def test_negative_results_expire_sooner(tmp_path):
+    """'Not found' answers are cached, but only for the negative TTL."""
+    cache = ChannelIdCache(str(tmp_path / "ids.json"), ttl=60, negative_ttl=0.01)
+    cache.put("user:missing", None)
+    assert cache.get("user:missing") == (True, None)
+
+    time.sleep(0.02)
+    assert cache.get("user:missing") == (False, None)
+    assert cache.get("user:unknown") == (False, None)
+
+
+def test_concurrent_puts_leave_a_complete_file(tmp_path):
+    """Parallel resolutions all reach the file, and no temporary files are left behind."""
+    path = tmp_path / "ids.json"
+    cache = ChannelIdCache(str(path))
+    threads = [threading.Thread(target=cache.put, args=(f"handle:c{i}", f"UC{i}")) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(ChannelIdCache(str(path))) == 16
+    assert [p.name for p in tmp_path.iterdir()] == ["ids.json"]
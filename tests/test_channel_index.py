@@ -0,0 +1,110 @@
+"""
+Tests for the incremental channel index.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.automation_framework import AutomationFramework
+from src.channel_index import ChannelIndex
+from src.config_manager import ConfigManager
+
+
+class FakeYouTubeClient:
+    """Serves an uploads playlist (newest first) from memory and counts calls."""
+
+    def __init__(self, video_ids, page_size=2):
+        self.video_ids = list(video_ids)
+        self.page_size = page_size
+        self.calls = []
+
+    def uploads_playlist_id(self, channel_id, api_key):
+        self.calls.append("channels")
+        return "UU" + channel_id[2:]
+
+    def playlist_page(self, playlist_id, api_key, page_size=50, page_token=None):
+        self.calls.append("playlistItems")
+        start = int(page_token or 0)
+        end = start + self.page_size
+        return {
+            "etag": f"etag-{self.video_ids[0]}",
+            "items": [{"contentDetails": {"videoId": vid, "videoPublishedAt": vid}}
+                      for vid in self.video_ids[start:end]],
+            "nextPageToken": str(end) if end < len(self.video_ids) else None,
+        }
+
+    def video_details(self, video_ids, api_key):
+        self.calls.append("videos")
+        return [{"id": vid, "snippet": {"title": vid, "publishedAt": vid},
+                 "contentDetails": {"duration": "PT30S" if vid.endswith("s") else "PT10M"}}
+                for vid in video_ids]
+
+
+def test_first_sync_indexes_uploads(tmp_path):
+    """The first sync lists the playlist and records duration and Shorts flag."""
+    index = ChannelIndex(path=str(tmp_path / "index.json"))
+    client = FakeYouTubeClient(["v3", "v2s", "v1"])
+
+    new_videos = index.sync_channel(client, "UCabc", "key")
+
+    assert [v["id"] for v in new_videos] == ["v1", "v2s", "v3"]
+    videos = {v["id"]: v for v in index.videos("UCabc")}
+    assert videos["v2s"]["isShort"] and not videos["v3"]["isShort"]
+    assert videos["v1"]["durationSeconds"] == 600
+
+
+def test_incremental_sync_stops_at_known_videos(tmp_path):
+    """Later syncs only fetch new uploads and skip work when the ETag is unchanged."""
+    path = tmp_path / "index.json"
+    client = FakeYouTubeClient(["v3", "v2", "v1"])
+    ChannelIndex(path=str(path)).sync_channel(client, "UCabc", "key")
+
+    index = ChannelIndex(path=str(path))
+    client = FakeYouTubeClient(["v3", "v2", "v1"])
+    assert index.sync_channel(client, "UCabc", "key") == []
+    assert client.calls == ["playlistItems"]
+
+    client = FakeYouTubeClient(["v5", "v4", "v3", "v2", "v1"])
+    new_videos = index.sync_channel(client, "UCabc", "key")
+    assert [v["id"] for v in new_videos] == ["v4", "v5"]
+    assert client.calls == ["playlistItems", "playlistItems", "videos"]
+    assert len(index.videos("UCabc")) == 5
+
+
+class RecordingUploader:
+    def __init__(self):
+        self.calls = []
+
+    def process_video(self, url, dry_run=True, clip_dir=None, tmp_dir=None):
+        self.calls.append((url, clip_dir))
+        return {"clips_created": 0, "errors": []}
+
+
+def test_queued_videos_get_their_own_directories(tmp_path):
+    """Enqueued videos are clipped into separate directories, including after the worker went idle."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({
+        "catalog": {"path": str(tmp_path / "catalog.db")},
+        "scheduler": {"state_path": str(tmp_path / "schedule_state.json")},
+        "task_settings": {"channel_sync": {"index_path": str(tmp_path / "index.json")},
+                          "system_check": {"profile_path": str(tmp_path / "profile.json")}},
+    }))
+    framework = AutomationFramework(ConfigManager(str(path)))
+    framework.clip_uploader = uploader = RecordingUploader()
+
+    framework.enqueue_clip_job("https://www.youtube.com/watch?v=aaa")
+    framework.enqueue_clip_job("https://www.youtube.com/watch?v=bbb")
+    framework.clip_queue.join()
+    worker = framework._clip_worker
+    if worker is not None:
+        worker.join(5)
+    framework.enqueue_clip_job("https://www.youtube.com/watch?v=ccc")
+    framework.clip_queue.join()
+
+    assert [url[-3:] for url, _ in uploader.calls] == ["aaa", "bbb", "ccc"]
+    assert len({clip_dir for _, clip_dir in uploader.calls}) == 3
@@ -0,0 +1,78 @@
+"""
+Tests for reloading the configuration file while the framework runs.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.automation_framework import AutomationFramework
+from src.config_manager import ConfigManager, validate_config
+
+
+def write_config(path, config, stamp):
+    path.write_text(json.dumps(config))
+    os.utime(path, (stamp, stamp))  # distinct mtimes even within one clock tick
+
+
+def test_valid_changes_notify_subscribers_and_invalid_ones_are_rejected(tmp_path):
+    """A changed file is applied atomically after validation; a broken one leaves the old config in place."""
+    path = tmp_path / "config.json"
+    write_config(path, {"task_settings": {"clip_uploader": {"scene_threshold": 0.4}}}, 1000)
+    manager = ConfigManager(str(path))
+    changes = []
+    manager.subscribe(lambda new, old: changes.append((old["task_settings"]["clip_uploader"]["scene_threshold"],
+                                                       new["task_settings"]["clip_uploader"]["scene_threshold"])))
+    assert manager.check_for_changes() is False  # untouched
+
+    write_config(path, {"task_settings": {"clip_uploader": {"scene_threshold": 0.25}}}, 2000)
+    assert manager.check_for_changes() is True
+    assert changes == [(0.4, 0.25)]
+
+    write_config(path, {"task_settings": {"clip_uploader": {"scene_threshold": 4, "max_clips": "six"}}}, 3000)
+    assert manager.check_for_changes() is False
+    path.write_text('{"task_settings": ')  # half-written file
+    os.utime(path, (4000, 4000))
+    assert manager.check_for_changes() is False
+    assert manager.get_task_setting("clip_uploader", "scene_threshold") == 0.25
+    assert len(changes) == 1
+
+
+def test_validation_messages():
+    """Wrong types, ranges and choices are each reported; 'auto' budgets are allowed."""
+    errors = validate_config({"task_settings": {"clip_uploader": {"whisper_model": "huge",
+                                                                  "batch": {"budget": {"encode": "auto", "asr": 0}}}},
+                              "automation_settings": {"isolation": "fork"}})
+    assert len(errors) == 3
+    assert any("whisper_model" in e for e in errors)
+    assert any("budget.asr" in e for e in errors)
+    assert validate_config({"scheduler": {"max_workers": 2, "resource_limits": {"media": 1}}}) == []
+
+
+def test_framework_picks_up_new_limits_and_thresholds_between_jobs(tmp_path):
+    """Worker pool limits change at once; the uploader applies new settings when its next run starts."""
+    path = tmp_path / "config.json"
+    config = {"task_settings": {"clip_uploader": {"scene_threshold": 0.4, "max_clips": 6},
+                                "system_check": {"profile_path": str(tmp_path / "hardware_profile.json")}},
+              "scheduler": {"max_workers": 4, "resource_limits": {"media": 1}},
+              "catalog": {"path": str(tmp_path / "catalog.db")}}
+    write_config(path, config, 1000)
+    manager = ConfigManager(str(path))
+    framework = AutomationFramework(manager)
+    uploader = framework.clip_uploader
+    uploader._apply_pending_settings()
+
+    config["task_settings"]["clip_uploader"].update(scene_threshold=0.3, max_clips=3)
+    config["scheduler"] = {"max_workers": 8, "resource_limits": {"media": 2}}
+    write_config(path, config, 2000)
+    assert manager.check_for_changes()
+    assert framework.scheduler.max_workers == 8
+    assert framework.scheduler.resource_limits["media"] == 2
+    assert (uploader.SCENE_THRESHOLD, uploader.MAX_CLIPS_PER_RUN) == (0.4, 6)  # a job may be running
+    uploader._apply_pending_settings()  # what process_video does first
+    assert (uploader.SCENE_THRESHOLD, uploader.MAX_CLIPS_PER_RUN) == (0.3, 3)
@@ -0,0 +1,122 @@
+"""
+Tests for the watch-folder daemon.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.daemon import ClipDaemon, InboxWatcher, QueueFile
+from src.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_file_is_reported_once_it_stops_growing(tmp_path):
+    """A growing file is held back until size and mtime stay put for settle_seconds."""
+    clock = FakeClock()
+    watcher = InboxWatcher(str(tmp_path), settle_seconds=5, clock=clock)
+    video = tmp_path / "talk.mp4"
+    video.write_bytes(b"x" * 10)
+    (tmp_path / "notes.txt").write_text("not a video")
+
+    assert watcher.poll() == []
+    clock.now = 3
+    with video.open("ab") as f:
+        f.write(b"x" * 10)
+    assert watcher.poll() == []
+    clock.now = 6
+    assert watcher.poll() == []  # only 3s since the last change
+    clock.now = 9
+    assert watcher.poll() == [video]
+    clock.now = 20
+    assert watcher.poll() == []  # reported once
+    assert watcher.pending() == 0
+
+
+def test_queue_file_resumes_from_saved_offset(tmp_path):
+    """Entries are read once, partial lines wait, and a new reader continues where the last stopped."""
+    queue_path = tmp_path / "queue.txt"
+    queue_path.write_text("https://a.example/1.mp4\n# comment\nhttps://a.example/2")
+    queue = QueueFile(str(queue_path))
+    assert queue.poll() == ["https://a.example/1.mp4"]
+    queue.advance()
+
+    with queue_path.open("a") as f:
+        f.write(".mp4\n")
+    assert queue.poll() == ["https://a.example/2.mp4"]
+    queue.advance()
+    assert queue.poll() == []
+
+    with queue_path.open("a") as f:
+        f.write("https://a.example/3.mp4\nhttps://a.example/4.mp4\n")
+    queue = QueueFile(str(queue_path))
+    assert queue.poll() == ["https://a.example/3.mp4", "https://a.example/4.mp4"]
+    queue.advance()
+    # Only handled entries are saved; the rest are read again after a restart
+    assert QueueFile(str(queue_path)).poll() == ["https://a.example/4.mp4"]
+
+
+class FakeUploader:
+    CLIP_DIR = Path("clips")
+    TMP_DIR = Path("tmp")
+
+    def __init__(self):
+        self.resident = False
+        self.calls = []
+
+    def process_video(self, url, dry_run=False, cancel_token=None, clip_dir=None, tmp_dir=None):
+        self.calls.append((url, str(clip_dir), str(tmp_dir)))
+        errors = ["ffmpeg failed"] if "broken" in url else []
+        return {"url": url, "clips_created": 0 if errors else 2, "clips_uploaded": 0, "errors": errors}
+
+
+class FakeFramework:
+    def __init__(self):
+        self.clip_uploader = FakeUploader()
+        self.metrics = MetricsRegistry()
+
+
+def test_daemon_processes_and_archives_inbox_files(tmp_path):
+    """Ready files are clipped by the resident uploader and moved to processed/ or failed/."""
+    inbox = tmp_path / "inbox"
+    framework = FakeFramework()
+    daemon = ClipDaemon(framework, {"inbox": str(inbox), "settle_seconds": 0,
+                                    "processed_dir": str(inbox / "processed"),
+                                    "failed_dir": str(inbox / "failed")})
+    assert framework.clip_uploader.resident
+    (inbox / "good.mp4").write_bytes(b"video")
+    (inbox / "broken.mkv").write_bytes(b"video")
+
+    daemon.poll_once()  # first sighting
+    assert daemon.poll_once() == 2
+    assert sorted(p.name for p in (inbox / "processed").iterdir()) == ["good.mp4"]
+    assert sorted(p.name for p in (inbox / "failed").iterdir()) == ["broken.mkv"]
+    assert (daemon.processed, daemon.failed) == (1, 1)
+    # Each source writes to its own directories, without changing the shared uploader's
+    assert len({clip_dir for _, clip_dir, _ in framework.clip_uploader.calls}) == 2
+    assert len({tmp_dir for _, _, tmp_dir in framework.clip_uploader.calls}) == 2
+    assert framework.clip_uploader.CLIP_DIR == Path("clips")
+    assert daemon.poll_once() == 0
+
+
+def test_stop_ends_the_queue_batch_after_the_current_video(tmp_path):
+    """Entries left when the daemon stops are kept for the next run."""
+    queue_path = tmp_path / "queue.txt"
+    queue_path.write_text("https://a.example/1.mp4\nhttps://a.example/2.mp4\n")
+    framework = FakeFramework()
+    daemon = ClipDaemon(framework, {"queue_file": str(queue_path)})
+    framework.clip_uploader.process_video = lambda url, **kwargs: daemon.stop() or {
+        "url": url, "clips_created": 1, "clips_uploaded": 0, "errors": []}
+
+    assert daemon.poll_once() == 1
+    assert QueueFile(str(queue_path)).poll() == ["https://a.example/2.mp4"]
@@ -0,0 +1,61 @@
+"""
+Tests for hardware probing and the recommended pipeline settings.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import hardware
+from src.hardware import recommend, resolve_pipeline_settings
+
+
+def profile(cpus, available_gb, realtime_factor=None):
+    return {
+        "cpu_count": cpus,
+        "memory": {"total_gb": available_gb, "available_gb": available_gb},
+        "decode_benchmark": {"realtime_factor": realtime_factor} if realtime_factor else None,
+    }
+
+
+def test_recommendations_scale_with_cpus_memory_and_decode_speed():
+    """Small machines get tiny/1/1; big ones a larger model and more workers; slow decode serializes ffmpeg."""
+    assert recommend(profile(1, 4)) == {"extraction_workers": 1, "asr_workers": 1, "whisper_model": "tiny"}
+    assert recommend(profile(8, 32, realtime_factor=20)) == {
+        "extraction_workers": 4, "asr_workers": 2, "whisper_model": "medium"}
+    # Plenty of cores, little memory: the model and worker counts follow the memory
+    assert recommend(profile(16, 3)) == {"extraction_workers": 4, "asr_workers": 1, "whisper_model": "base"}
+    assert recommend(profile(8, 32, realtime_factor=1.5))["extraction_workers"] == 1
+
+
+def test_explicit_settings_override_recommendations():
+    """'auto' or missing values take the recommendation; explicit ones win."""
+    recommended = {"extraction_workers": 3, "asr_workers": 2, "whisper_model": "small"}
+    assert resolve_pipeline_settings({"whisper_model": "auto", "batch": {"budget": {
+        "download": 2, "encode": "auto", "asr": 1}}}, recommended) == {
+        "whisper_model": "small", "budget": {"download": 2, "encode": 3, "asr": 1}}
+    assert resolve_pipeline_settings({"whisper_model": "base"}, {}) == {"whisper_model": "base", "budget": {}}
+
+
+def test_ffmpeg_capabilities_parses_encoder_and_filter_lists(monkeypatch):
+    """Legend lines are skipped; hardware encoders and missing filters are reported."""
+    outputs = {
+        "-version": "ffmpeg version 6.1 Copyright (c) 2000-2023\n",
+        "-encoders": "Encoders:\n V..... = Video\n ------\n V....D libx264   H.264\n V....D h264_nvenc  NVENC\n",
+        "-filters": "Filters:\n  T.. = Timeline support\n  | = Source or sink filter\n"
+                    " TSC select  V->V  Select frames\n ... showinfo V->V  Show info\n ..C scale V->V  Scale\n",
+    }
+
+    def fake_run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 0, stdout=outputs[cmd[-1]], stderr="")
+
+    monkeypatch.setattr(hardware.shutil, "which", lambda name: "/usr/bin/" + name)
+    monkeypatch.setattr(hardware.subprocess, "run", fake_run)
+    caps = hardware.ffmpeg_capabilities()
+    assert caps["available"] and caps["libx264"]
+    assert caps["hardware_encoders"] == ["h264_nvenc"]
+    assert caps["missing_filters"] == ["tile"]
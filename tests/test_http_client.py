@@ -0,0 +1,114 @@
+"""
+Tests for the pooled keep-alive HTTP client, run against a local stand-in server.
+"""
+
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.http_client import PooledHTTPClient, fan_out
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Keep-alive JSON server that records which connection served each request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.requests += 1
+            fail = server.failures_left > 0
+            if fail:
+                server.failures_left -= 1
+        status = 503 if fail else 200
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(status)
+        if fail and server.retry_after:
+            self.send_header("Retry-After", server.retry_after)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.lock = threading.Lock()
+    srv.connections = set()
+    srv.requests = 0
+    srv.failures_left = 0
+    srv.retry_after = None
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_sequential_requests_reuse_one_connection(server):
+    """Keep-alive: many requests, one TCP connection."""
+    client = PooledHTTPClient()
+    base = f"http://127.0.0.1:{server.server_port}"
+    for i in range(5):
+        assert client.get_json(f"{base}/videos?id={i}") == {"path": f"/videos?id={i}"}
+
+    assert server.requests == 5
+    assert len(server.connections) == 1
+    assert client.stats()["connections_reused"] == 4
+    client.close()
+
+
+def test_fan_out_runs_concurrently_with_bounded_connections(server):
+    """Concurrent lookups share the pool and open at most one connection per worker."""
+    client = PooledHTTPClient()
+    base = f"http://127.0.0.1:{server.server_port}"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for _ in range(3):
+            results = fan_out(executor, {
+                "channel": lambda: client.get_json(f"{base}/channels"),
+                "latest": lambda: client.get_json(f"{base}/search"),
+            })
+            assert results["channel"] == {"path": "/channels"}
+            assert results["latest"] == {"path": "/search"}
+
+    assert server.requests == 6
+    assert len(server.connections) <= 2
+    client.close()
+
+
+def test_retries_transient_server_errors(server):
+    """503 responses are retried with backoff before giving up."""
+    server.failures_left = 2
+    client = PooledHTTPClient(retries=2, backoff=0.01)
+    resp = client.get(f"http://127.0.0.1:{server.server_port}/videos")
+    assert resp.status == 200
+    assert client.stats()["retries"] == 2
+
+    server.failures_left = 5
+    assert client.get(f"http://127.0.0.1:{server.server_port}/videos").status == 503
+    client.close()
+
+
+def test_long_retry_after_is_not_waited_out(server):
+    """A Retry-After beyond max_retry_after returns the error at once instead of blocking."""
+    server.failures_left = 1
+    server.retry_after = "3600"
+    client = PooledHTTPClient(retries=2, backoff=0.01, max_retry_after=5)
+    resp = client.get(f"http://127.0.0.1:{server.server_port}/videos")
+    assert resp.status == 503 and client.stats()["retries"] == 0
+    client.close()
@@ -0,0 +1,71 @@
+"""
+Tests for the disk janitor used by the cleanup task.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.janitor import IN_USE_PREFIX, DiskJanitor, in_use, mark_uploaded
+
+HOUR = 3600
+NOW = time.time()
+
+
+def make_file(path, size, hours_ago):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = NOW - hours_ago * HOUR
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_ttl_then_lru_until_under_cap(tmp_path):
+    """Expired files go first, then the least recently used until the cap is met; dry run deletes nothing."""
+    tmp = tmp_path / "tmp"
+    make_file(tmp / "source.mp4", 400, hours_ago=100)
+    make_file(tmp / "old.part", 300, hours_ago=50)
+    make_file(tmp / "older.part", 200, hours_ago=60)
+    make_file(tmp / "new.part", 100, hours_ago=1)
+    janitor = DiskJanitor(targets=[str(tmp)], max_age_hours=72, max_total_gb=350 / 1024 ** 3)
+
+    report = janitor.run(dry_run=True, now=NOW)
+    assert [(Path(f["path"]).name, f["reason"]) for f in report["evict"]] == [
+        ("source.mp4", "ttl"), ("older.part", "size_cap"), ("old.part", "size_cap")]
+    assert report["reclaimable_bytes"] == 900
+    assert report["freed_bytes"] == 0
+    assert (tmp / "source.mp4").exists()
+
+    report = janitor.run(now=NOW)
+    assert report["freed_bytes"] == 900
+    assert sorted(p.name for p in tmp.iterdir()) == ["new.part"]
+
+
+def test_running_recent_and_unuploaded_artifacts_are_protected(tmp_path):
+    """In-use directories, fresh files and clips awaiting upload survive; stale markers do not protect."""
+    clips = tmp_path / "clips"
+    running = clips / "job-a"
+    crashed = clips / "job-b"
+    make_file(running / "clip_000.mp4", 10, hours_ago=200)
+    make_file(crashed / "clip_000.mp4", 10, hours_ago=200)
+    (crashed / f"{IN_USE_PREFIX}999999999-0").touch()  # left by a process that no longer exists
+    make_file(clips / "clip_001.mp4", 10, hours_ago=100)  # never uploaded
+    make_file(clips / "clip_002.mp4", 10, hours_ago=100)
+    mark_uploaded(str(clips / "clip_002.mp4"), "yt123")
+    make_file(clips / "notes.json", 10, hours_ago=0)
+    janitor = DiskJanitor(targets=[str(clips)], clip_dirs=[str(clips)], max_age_hours=72,
+                          protect_unuploaded_hours=168)
+
+    with in_use(running):
+        report = janitor.run(now=NOW)
+    assert sorted(os.path.relpath(f["path"], clips) for f in report["evict"]) == [
+        "clip_002.mp4", os.path.join("job-b", "clip_000.mp4")]
+    assert report["protected_files"] == 3
+    assert (running / "clip_000.mp4").exists()
+    assert not crashed.exists()  # stale marker and the emptied directory are removed
+    assert not list(running.glob(IN_USE_PREFIX + "*"))
@@ -0,0 +1,58 @@
+"""
+Tests for the job event bus.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.job_events import JobEventBus
+
+
+def test_stream_replays_history_and_ends_on_terminal_status():
+    """Late subscribers get earlier events and the stream closes when the job finishes."""
+    bus = JobEventBus()
+    bus.publish("job1", "stage", {"stage": "scene_detect"})
+    bus.publish("job1", "status", {"status": "completed", "progress": 100})
+
+    frames = list(bus.stream("job1", heartbeat=0.1, timeout=1.0))
+    body = "".join(frames)
+    assert "event: stage" in body
+    assert "event: status" in body
+    assert '"status": "completed"' in body
+
+
+def test_stream_receives_live_events_after_last_event_id():
+    """Events published while streaming are delivered; already-seen ones are skipped."""
+    bus = JobEventBus()
+    bus.publish("job2", "stage", {"stage": "scene_detect"})
+
+    def publish_later():
+        bus.publish("job2", "clip", {"index": 0})
+        bus.publish("job2", "status", {"status": "error"})
+
+    timer = threading.Timer(0.05, publish_later)
+    timer.start()
+    body = "".join(bus.stream("job2", last_event_id=1, heartbeat=0.1, timeout=2.0))
+    timer.join()
+
+    assert "scene_detect" not in body
+    assert "id: 2\nevent: clip" in body
+    assert '"status": "error"' in body
+
+
+def test_only_finished_jobs_are_forgotten():
+    """Over max_jobs, the oldest finished jobs are dropped and running ones keep their history."""
+    bus = JobEventBus(max_jobs=2)
+    bus.publish("running", "stage", {"stage": "download"})
+    bus.publish("done", "status", {"status": "completed"})
+    bus.publish("new", "stage", {"stage": "download"})
+
+    assert "done" not in bus._jobs
+    assert list(bus._jobs) == ["running", "new"]
+    bus.publish("newer", "stage", {"stage": "download"})
+    assert list(bus._jobs) == ["running", "new", "newer"]
@@ -0,0 +1,77 @@
+"""
+Tests for the in-process metrics registry.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import MetricsRegistry, OutcomeWindow, RateCounter, RingBuffer
+
+
+def test_ring_buffer_keeps_running_mean_over_window():
+    """Old samples fall out of the window and out of the mean."""
+    buf = RingBuffer(capacity=3)
+    for value in (10, 1, 2, 3):
+        buf.append(value)
+    summary = buf.summary()
+    assert summary == {"count": 4, "window": 3, "mean": 2.0, "last": 3}
+
+
+def test_outcome_window_success_rate_ignores_cancellations():
+    """Cancelled jobs count toward totals but not the success rate."""
+    window = OutcomeWindow(capacity=4)
+    for outcome in ("error", "success", "success", "cancelled", "success"):
+        window.append(outcome)
+    summary = window.summary()
+    assert summary["totals"] == {"error": 1, "success": 3, "cancelled": 1}
+    assert summary["success_rate"] == 100.0
+
+
+def test_rate_counter_forgets_events_older_than_an_hour():
+    """Per-hour rates slide minute by minute."""
+    now = [0.0]
+    counter = RateCounter(clock=lambda: now[0])
+    counter.add(5)
+    now[0] = 30 * 60
+    counter.add(2)
+    assert counter.per_hour() == 7
+    now[0] = 61 * 60
+    assert counter.per_hour() == 2
+    now[0] = 200 * 60
+    assert counter.per_hour() == 0 and counter.total == 7
+
+
+def test_prometheus_exposition():
+    """Durations become cumulative histograms; labelled counters and gauges are exported."""
+    metrics = MetricsRegistry()
+    metrics.record_duration("stage.extract", 0.3)
+    metrics.record_duration("stage.extract", 7)
+    metrics.increment("youtube_quota_units", 100, endpoint="search")
+    metrics.adjust_gauge("whisper_models_resident", 1)
+
+    lines = metrics.to_prometheus().splitlines()
+    assert "# TYPE autoclip_pipeline_stage_seconds histogram" in lines
+    assert 'autoclip_pipeline_stage_seconds_bucket{stage="extract",le="0.5"} 1' in lines
+    assert 'autoclip_pipeline_stage_seconds_bucket{stage="extract",le="+Inf"} 2' in lines
+    assert 'autoclip_pipeline_stage_seconds_count{stage="extract"} 2' in lines
+    assert 'autoclip_youtube_quota_units_total{endpoint="search"} 100' in lines
+    assert "autoclip_whisper_models_resident 1" in lines
+
+
+def test_registry_snapshot_and_activity():
+    """Timers, gauges and the activity feed show up in a snapshot."""
+    metrics = MetricsRegistry()
+    with metrics.time("stage.extract"):
+        pass
+    metrics.set_gauge("queue_depth", lambda: 4)
+    metrics.record_activity("success", "first")
+    metrics.record_activity("error", "second")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["durations"]["stage.extract"]["count"] == 1
+    assert snapshot["gauges"]["queue_depth"] == 4
+    assert [a["message"] for a in metrics.recent_activity(1)] == ["second"]
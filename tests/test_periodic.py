@@ -0,0 +1,79 @@
+"""
+Tests for the built-in periodic task scheduler.
+"""
+
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import MetricsRegistry
+from src.periodic import CronSchedule, IntervalSchedule, PeriodicScheduler, parse_schedule
+
+
+def test_cron_next_run():
+    """Steps, ranges, names and the day-of-month/day-of-week OR rule."""
+    start = datetime(2026, 1, 30, 23, 58, 30)  # a Friday
+    assert CronSchedule("*/15 * * * *").next_after(start) == datetime(2026, 1, 31, 0, 0)
+    assert CronSchedule("30 9 * * mon-fri").next_after(start) == datetime(2026, 2, 2, 9, 30)
+    assert CronSchedule("@monthly").next_after(start) == datetime(2026, 2, 1, 0, 0)
+    assert CronSchedule("0 0 13 * 5").next_after(start) == datetime(2026, 2, 6, 0, 0)
+    assert CronSchedule("0 12 29 2 *").next_after(start) == datetime(2028, 2, 29, 12, 0)
+    assert isinstance(parse_schedule("every 15m"), IntervalSchedule)
+    assert parse_schedule(90).seconds == 90
+    with pytest.raises(ValueError):
+        parse_schedule("*/15 * * *")
+
+
+def test_missed_run_is_caught_up_once_at_start(tmp_path):
+    """A run missed while the process was down is due immediately; a recent one is not."""
+    now = datetime(2026, 3, 2, 12, 0).timestamp()
+    state = tmp_path / "schedule.json"
+    state.write_text(json.dumps({
+        "cleanup": datetime(2026, 3, 1, 3, 0).timestamp(),   # missed the 2 Mar 03:00 run
+        "report": datetime(2026, 3, 2, 11, 50).timestamp(),  # ran 10 minutes ago
+        "digest": datetime(2026, 3, 1, 3, 0).timestamp(),    # missed too, but catch_up=False
+    }))
+    metrics = MetricsRegistry()
+    scheduler = PeriodicScheduler(lambda name: None, str(state), metrics, clock=lambda: now)
+    scheduler.start = lambda: None  # inspect the schedule without running anything
+    scheduler.add("cleanup", CronSchedule("0 3 * * *"))
+    scheduler.add("report", IntervalSchedule(3600))
+    scheduler.add("digest", CronSchedule("0 3 * * *"), catch_up=False)
+
+    entries = scheduler.scheduled()
+    assert entries["cleanup"]["next_run"] == now
+    assert entries["report"]["next_run"] == datetime(2026, 3, 2, 12, 50).timestamp()
+    assert entries["digest"]["next_run"] == datetime(2026, 3, 3, 3, 0).timestamp()
+    assert metrics.snapshot()["rates"]['scheduled_runs_caught_up{task="cleanup"}']["total"] == 1
+
+
+def test_overlapping_runs_are_skipped(tmp_path):
+    """A task still running when it is due again is not started a second time."""
+    active = []
+    peak = []
+    release = threading.Event()
+
+    def run_task(name):
+        active.append(name)
+        peak.append(len(active))
+        release.wait(2)
+        active.remove(name)
+
+    metrics = MetricsRegistry()
+    scheduler = PeriodicScheduler(run_task, str(tmp_path / "state.json"), metrics)
+    scheduler.add("slow", IntervalSchedule(0.05), run_now=True)
+    time.sleep(0.3)
+    release.set()
+    scheduler.stop()
+    assert max(peak) == 1
+    assert metrics.snapshot()["rates"]['scheduled_runs_skipped{task="slow"}']["total"] >= 1
+    assert "slow" in json.loads((tmp_path / "state.json").read_text())
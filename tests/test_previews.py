@@ -0,0 +1,60 @@
+"""
+Tests for clip preview generation.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.previews import build_preview_command, clip_fingerprint
+from src.auto_clip_uploader import AutoClipUploader
+
+
+def test_single_decode_command_writes_three_outputs(tmp_path):
+    """Proxy, poster and sprite come from one input in one ffmpeg call."""
+    cmd = build_preview_command("clip.mp4", tmp_path, duration=40)
+    assert cmd.count("-i") == 1
+    assert cmd[-1].endswith("sprite.jpg")
+    assert str(tmp_path / "proxy.mp4") in cmd and str(tmp_path / "poster.jpg") in cmd
+    assert "fps=1/2.000" in cmd[cmd.index("-filter_complex") + 1]
+
+
+def test_fingerprint_follows_content(tmp_path):
+    """Rewriting a clip with different bytes changes its fingerprint."""
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"a" * 5000)
+    first = clip_fingerprint(str(clip))
+    assert clip_fingerprint(str(clip)) == first
+    clip.write_bytes(b"b" * 5000)
+    assert clip_fingerprint(str(clip)) != first
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as a stand-in ffmpeg")
+def test_previews_are_cached_by_fingerprint(tmp_path, monkeypatch):
+    """The second request for an unchanged clip does not run ffmpeg again."""
+    calls = tmp_path / "calls"
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text(
+        '#!/bin/sh\n[ "$1" = "-version" ] && exit 0\n'
+        f'echo run >> "{calls}"\n'
+        'for a in "$@"; do case "$a" in *proxy.mp4|*.jpg) echo data > "$a";; esac; done\n')
+    fake_ffmpeg.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    uploader = AutoClipUploader()
+    uploader.PREVIEW_DIR = tmp_path / "previews"
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"clip data")
+
+    previews = uploader.generate_previews(str(clip), 30)
+    assert previews["sprite_columns"] * previews["sprite_rows"] >= previews["sprite_frames"]
+    assert all(Path(previews[kind]).is_file() for kind in ("proxy", "poster", "sprite"))
+
+    assert uploader.generate_previews(str(clip), 30) == previews
+    assert calls.read_text().count("run") == 1
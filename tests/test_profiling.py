@@ -0,0 +1,50 @@
+"""
+Tests for run profiling.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.profiling import Profiler, RESOURCE_AVAILABLE
+from src.auto_clip_uploader import AutoClipUploader
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+def _outer():
+    return _busy(200000) + _busy(100000)
+
+
+def test_profile_files_and_collapsed_stacks(tmp_path):
+    """A profiled run writes pstats, collapsed stacks and a summary."""
+    with Profiler("unit") as profiler:
+        _outer()
+    paths = profiler.write(tmp_path / "run")
+
+    assert set(paths) == {"pstats", "collapsed", "summary"}
+    stacks = Path(paths["collapsed"]).read_text().splitlines()
+    busy = [line for line in stacks if "_outer (test_profiling.py" in line and "_busy (test_profiling.py" in line]
+    assert busy and all(int(line.rsplit(" ", 1)[1]) >= 0 for line in busy)
+    summary = json.loads(Path(paths["summary"]).read_text())
+    assert summary["name"] == "unit" and summary["wall_seconds"] > 0
+
+
+def test_child_processes_are_reported_separately():
+    """Wall time of spawned commands is attributed to the command name."""
+    cmd = [sys.executable, "-c", "sum(i for i in range(3000000))"]
+    with Profiler() as profiler:
+        proc = AutoClipUploader._spawn(cmd)
+        AutoClipUploader._finish(proc, cmd)
+    children = profiler.summary()["children"]
+
+    assert children["commands"][Path(sys.executable).name]["count"] == 1
+    assert children["wall_seconds"] > 0
+    if RESOURCE_AVAILABLE:
+        assert children["cpu_user_seconds"] + children["cpu_system_seconds"] > 0
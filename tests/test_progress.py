@@ -0,0 +1,52 @@
+"""
+Tests for stage-weighted progress tracking.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.progress import ProgressTracker, parse_ffmpeg_progress_line, is_ffmpeg_progress_end
+
+
+def test_parse_ffmpeg_progress_lines():
+    """out_time_us/out_time_ms are microseconds; other keys are ignored."""
+    assert parse_ffmpeg_progress_line("out_time_us=12500000\n") == 12.5
+    assert parse_ffmpeg_progress_line("out_time_ms=1000000") == 1.0
+    assert parse_ffmpeg_progress_line("out_time=00:00:12.500000") is None
+    assert parse_ffmpeg_progress_line("[Parsed_showinfo_1 @ 0x0] n:0 pts_time:1.2") is None
+    assert is_ffmpeg_progress_end("progress=end\n")
+    assert not is_ffmpeg_progress_end("progress=continue")
+
+
+def test_weighted_overall_progress_and_eta():
+    """Stage fractions combine by weight and never move backwards."""
+    snapshots = []
+    tracker = ProgressTracker({"scene_detect": 3, "extract": 1},
+                              callback=snapshots.append, min_interval=0)
+
+    tracker.update("scene_detect", 0.5)
+    assert tracker.overall() == 0.375
+    tracker.update("scene_detect", 0.25)
+    assert tracker.overall() == 0.375
+
+    tracker.complete("scene_detect")
+    tracker.update("extract", 0.5)
+    snap = tracker.snapshot()
+    assert snap["progress"] == 87.5
+    assert snap["stage"] == "extract"
+    assert snap["eta_seconds"] is not None
+
+    tracker.complete("extract")
+    assert snapshots[-1]["progress"] == 100.0
+    assert snapshots[-1]["eta_seconds"] == 0.0
+
+
+def test_unknown_stage_is_ignored():
+    """Stages that are not weighted (e.g. skipped uploads) do not affect progress."""
+    tracker = ProgressTracker({"extract": 1})
+    tracker.update("upload", 1.0)
+    assert tracker.overall() == 0.0
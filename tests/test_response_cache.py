@@ -0,0 +1,67 @@
+"""
+Tests for the YouTube API response cache.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.response_cache import ResponseCache
+
+SEARCH_URL = "https://www.googleapis.com/youtube/v3/search?part=snippet&q=irtza&key=SECRET"
+
+
+def test_cache_key_drops_api_key_and_sorts_params():
+    """The API key never ends up in a key and parameter order does not matter."""
+    key = ResponseCache.cache_key(SEARCH_URL)
+    assert "SECRET" not in key
+    assert key == ResponseCache.cache_key(
+        "https://www.googleapis.com/youtube/v3/search?key=OTHER&q=irtza&part=snippet")
+
+
+def test_fresh_hits_count_saved_quota():
+    """Fresh hits skip the request and credit the endpoint's quota cost."""
+    cache = ResponseCache()
+    assert cache.lookup(SEARCH_URL) == (None, False)
+
+    cache.store(SEARCH_URL, {"items": [1]}, etag='"abc"')
+    entry, fresh = cache.lookup(SEARCH_URL)
+    assert fresh and entry.data == {"items": [1]}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["quota_units_saved"] == 100
+
+
+def test_expired_entry_keeps_etag_for_revalidation():
+    """Stale entries are returned with their ETag and refreshed on 304."""
+    cache = ResponseCache(ttls={"search": 0.01})
+    cache.store(SEARCH_URL, {"items": []}, etag='"v1"')
+    time.sleep(0.02)
+
+    entry, fresh = cache.lookup(SEARCH_URL)
+    assert not fresh and entry.etag == '"v1"'
+
+    cache.revalidated(SEARCH_URL)
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_lru_eviction_and_disk_persistence(tmp_path):
+    """Least recently used entries are evicted but survive in the disk cache."""
+    cache = ResponseCache(max_entries=2, disk_dir=str(tmp_path))
+    urls = [f"https://www.googleapis.com/youtube/v3/videos?id={i}&key=K" for i in range(3)]
+    for i, url in enumerate(urls):
+        cache.store(url, {"id": i})
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+    reloaded = ResponseCache(disk_dir=str(tmp_path))
+    entry, fresh = reloaded.lookup(urls[0])
+    assert fresh and entry.data == {"id": 0}
+    assert all("key=K" not in p.read_text() for p in tmp_path.glob("*.json"))
@@ -0,0 +1,76 @@
+"""
+Tests for the in-memory static asset store.
+"""
+
+import gzip
+import os
+import sys
+from pathlib import Path
+
+from flask import Flask
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.static_assets import StaticAssetStore, serve_asset_or_404
+
+
+def make_app(root, auto_reload=False):
+    """Build a tiny app serving a store the way app.py does."""
+    store = StaticAssetStore(str(root), auto_reload=auto_reload)
+    app = Flask(__name__)
+
+    @app.route("/")
+    def home():
+        return serve_asset_or_404(store, "index.html")
+
+    @app.route("/css/<path:filename>")
+    def css_files(filename):
+        return serve_asset_or_404(store, f"css/{filename}")
+
+    return app, store
+
+
+def write_site(root):
+    (root / "css").mkdir()
+    (root / "css" / "style.css").write_text("body { color: red; }\n" * 100)
+    (root / "index.html").write_text('<link rel="stylesheet" href="css/style.css">')
+
+
+def test_pages_link_hashed_assets_served_as_immutable(tmp_path):
+    """HTML points at content-hashed CSS, which is gzipped and cached forever."""
+    write_site(tmp_path)
+    app, store = make_app(tmp_path)
+    client = app.test_client()
+
+    page = client.get("/")
+    assert page.headers["Cache-Control"] == "no-cache"
+    css_url = store.url("css/style.css")
+    assert css_url.encode() in page.data
+
+    resp = client.get(css_url, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(resp.data) == (tmp_path / "css" / "style.css").read_bytes()
+
+    cached = client.get(css_url, headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]})
+    assert cached.status_code == 304 and cached.data == b""
+
+
+def test_auto_reload_picks_up_changes(tmp_path):
+    """In reload mode an edited file changes its hash and the page's link."""
+    write_site(tmp_path)
+    app, store = make_app(tmp_path, auto_reload=True)
+    old_url = store.url("css/style.css")
+
+    css = tmp_path / "css" / "style.css"
+    css.write_text("body { color: blue; }\n")
+    stat = css.stat()
+    os.utime(css, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    new_url = store.url("css/style.css")
+    assert new_url != old_url
+    assert new_url.encode() in app.test_client().get("/").data
+    assert app.test_client().get("/css/missing.css").status_code == 404
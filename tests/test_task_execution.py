@@ -0,0 +1,110 @@
+"""
+Tests for task timeouts and retries.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cancellation import current_token
+from src.metrics import MetricsRegistry
+from src.task_execution import NonRetryableError, RetryPolicy, fork_available, run_attempt, run_with_retries
+from src.tracing import Tracer, current_tracer
+from src.automation_framework import AutomationFramework
+
+
+def test_backoff_grows_exponentially_with_bounded_jitter():
+    """Delays double per attempt, stay under max_delay and lose at most the jitter fraction."""
+    policy = RetryPolicy(retry_delay=1, backoff=2, max_delay=5, jitter=0.5)
+    assert [policy.delay(n, rand=lambda: 0.0) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    assert policy.delay(2, rand=lambda: 1.0) == 1.0
+
+
+def test_thread_timeout_cancels_the_attempt_token():
+    """A timed-out attempt sees its token cancelled, so cooperative work stops."""
+    start = time.monotonic()
+    success, error, timed_out = run_attempt(lambda: current_token().wait(10) and False, timeout=0.2)
+    assert (success, timed_out) == (False, True)
+    assert "abandoned" not in error and time.monotonic() - start < 5
+
+
+@pytest.mark.skipif(not fork_available(), reason="process isolation needs fork()")
+def test_process_isolation_kills_a_hung_attempt():
+    """An attempt stuck in a child process is killed at the timeout."""
+    start = time.monotonic()
+    success, error, timed_out = run_attempt(lambda: subprocess.run(["sleep", "30"]) and True,
+                                            timeout=0.5, isolation="process")
+    assert (success, timed_out) == (False, True) and time.monotonic() - start < 10
+    assert run_attempt(lambda: True, timeout=5, isolation="process") == (True, None, False)
+
+
+def test_retries_record_every_attempt():
+    """Failures are retried after increasing delays until an attempt succeeds."""
+    calls = []
+    delays = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+        return True
+
+    attempts = run_with_retries(flaky, RetryPolicy(max_retries=3, retry_delay=1, jitter=0, timeout=None),
+                                sleep=delays.append)
+    assert [a.outcome for a in attempts] == ["error", "error", "success"]
+    assert delays == [1, 2] and attempts[0].error == "transient"
+
+
+def test_attempt_threads_inherit_context_and_forked_metrics_come_back():
+    """The caller's tracer is visible in the attempt thread; a forked attempt's counters reach the parent."""
+    tracer = Tracer("job")
+    with tracer.activate():
+        assert run_attempt(lambda: current_tracer() is tracer, timeout=5) == (True, None, False)
+    if fork_available():
+        metrics = MetricsRegistry()
+        assert run_attempt(lambda: metrics.increment("clips_created", 2) or True, timeout=5,
+                           isolation="process", metrics=metrics) == (True, None, False)
+        assert metrics.snapshot()["rates"]["clips_created"]["total"] == 2
+
+
+def test_non_retryable_failures_stop_retrying():
+    """A task raising NonRetryableError gets a single attempt."""
+    calls = []
+
+    def uploads_then_fails():
+        calls.append(1)
+        raise NonRetryableError("clip 2 upload failed")
+
+    attempts = run_with_retries(uploads_then_fails, RetryPolicy(max_retries=3, retry_delay=0, timeout=None),
+                                sleep=lambda d: None)
+    assert len(calls) == 1 and attempts[0].error == "clip 2 upload failed"
+
+
+def test_framework_applies_per_task_retry_settings(config_manager):
+    """task_settings override automation_settings and attempts appear in the result."""
+    config_manager.config.setdefault("task_settings", {})["always_fails"] = {"max_retries": 1, "retry_delay": 0}
+    framework = AutomationFramework(config_manager)
+    framework.add_custom_task("always_fails", lambda: False)
+
+    result = framework.execute_task("always_fails")
+    assert not result.success
+    assert [a["outcome"] for a in result.attempts] == ["error", "error"]
+
+
+def test_process_isolation_falls_back_to_a_thread_off_the_main_thread():
+    """A pool worker never forks, so the attempt stays in this process."""
+    pids = []
+    worker = threading.Thread(target=lambda: pids.append(
+        run_attempt(lambda: pids.append(os.getpid()) or True, timeout=5, isolation="process")))
+    worker.start()
+    worker.join()
+    assert pids == [os.getpid(), (True, None, False)]
@@ -0,0 +1,87 @@
+"""
+Tests for the dependency-aware task scheduler.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.task_scheduler import TaskResult, TaskScheduler, TaskSpec, resolve_order
+from src.automation_framework import AutomationFramework
+
+
+def _specs(*specs):
+    return {spec.name: spec for spec in specs}
+
+
+def _execute(spec):
+    return TaskResult(spec.name, bool(spec.func()))
+
+
+def test_resolve_order_pulls_in_dependencies_and_detects_cycles():
+    """Hard dependencies are added; 'after' only orders tasks that were requested."""
+    specs = _specs(TaskSpec("a", None), TaskSpec("b", None, depends_on=["a"]),
+                   TaskSpec("c", None, after=["b"]))
+    assert resolve_order(specs, ["b"]) == ["a", "b"]
+    assert resolve_order(specs, ["c"]) == ["c"]
+    assert resolve_order(specs, ["c", "b"]) == ["a", "b", "c"]
+
+    specs["a"].depends_on = ("b",)
+    with pytest.raises(ValueError, match="cycle"):
+        resolve_order(specs, ["a"])
+
+
+def test_independent_tasks_overlap_and_dependents_wait():
+    """Two independent tasks run at the same time; their dependent starts after both."""
+    barrier = threading.Barrier(2, timeout=2)
+    finished = []
+
+    def independent(name):
+        def run():
+            barrier.wait()  # only passes if both run concurrently
+            finished.append(name)
+            return True
+        return run
+
+    specs = _specs(TaskSpec("x", independent("x")), TaskSpec("y", independent("y")),
+                   TaskSpec("z", lambda: sorted(finished) == ["x", "y"], depends_on=["x", "y"]))
+    results = TaskScheduler(max_workers=4).run(specs, ["z"], _execute)
+    assert list(results) == ["x", "y", "z"] and all(results.values())
+
+
+def test_failed_dependency_skips_dependents_and_limits_resources():
+    """Dependents of a failed task are skipped; a resource limit of 1 serialises its tasks."""
+    active = []
+    peak = []
+
+    def media():
+        active.append(1)
+        peak.append(len(active))
+        time.sleep(0.05)
+        active.pop()
+        return True
+
+    specs = _specs(TaskSpec("check", lambda: False), TaskSpec("upload", media, depends_on=["check"]),
+                   TaskSpec("m1", media, resource="media"), TaskSpec("m2", media, resource="media"))
+    results = TaskScheduler(max_workers=4, resource_limits={"media": 1}).run(
+        specs, ["upload", "m1", "m2"], _execute)
+    assert results["upload"].skipped and "check" in results["upload"].error
+    assert results["m1"].success and results["m2"].success and max(peak) == 1
+
+
+def test_framework_workflow_returns_results(config_manager):
+    """Custom tasks declare dependencies and the workflow reports each task's timing."""
+    framework = AutomationFramework(config_manager)
+    framework.add_custom_task("prepare", lambda: True)
+    framework.add_custom_task("publish", lambda: True, depends_on=["prepare"], resource="network")
+    results = framework.run_tasks(["publish"])
+    assert [r.name for r in results.values()] == ["prepare", "publish"]
+    assert all(r.success and r.duration_seconds >= 0 for r in results.values())
+    assert framework.run_task("publish") is True
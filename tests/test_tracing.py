@@ -0,0 +1,65 @@
+"""
+Tests for span tracing and Chrome trace export.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.tracing import Tracer, current_tracer, span
+from src.auto_clip_uploader import AutoClipUploader
+
+
+def test_spans_nest_and_export_as_chrome_trace(tmp_path):
+    """Inner spans lie within their parent and carry their attributes."""
+    tracer = Tracer("job", {"job_id": "abc"})
+    with tracer.activate():
+        with span("clip", clip=0) as attrs:
+            with span("extract_clip_stream", start=1.5):
+                pass
+            attrs["uploaded"] = False
+    assert current_tracer() is None
+
+    trace = json.loads(tracer.write(tmp_path / "trace.json").read_text())
+    events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+    outer, inner = events["clip"], events["extract_clip_stream"]
+    assert outer["args"] == {"clip": 0, "uploaded": False}
+    assert inner["args"] == {"start": 1.5}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert trace["otherData"] == {"job_id": "abc"}
+
+
+def test_span_without_active_tracer_is_a_no_op():
+    """Pipeline code can open spans whether or not the job is traced."""
+    with span("prepare_input", url="x") as attrs:
+        attrs["ignored"] = True
+    assert current_tracer() is None
+
+
+def test_failed_span_records_the_error():
+    """A span closed by an exception keeps the error in its attributes."""
+    tracer = Tracer()
+    try:
+        with tracer.span("youtube_upload"):
+            raise RuntimeError("quota exceeded")
+    except RuntimeError:
+        pass
+    assert tracer.events()[0]["args"]["error"] == "RuntimeError: quota exceeded"
+
+
+def test_process_video_trace_covers_the_run(tmp_path):
+    """A traced run records a root span and its stage spans."""
+    uploader = AutoClipUploader()
+    uploader.CLIP_DIR = tmp_path / "clips"
+    uploader.TMP_DIR = tmp_path / "tmp"
+    tracer = Tracer()
+    results = uploader.process_video(str(tmp_path / "missing.mp4"), dry_run=True, tracer=tracer)
+
+    names = [e["name"] for e in tracer.events()]
+    assert "process_video" in names and "run_ffmpeg_scene_detect" in names
+    root = next(e for e in tracer.events() if e["name"] == "process_video")
+    assert root["args"]["clips_created"] == results["clips_created"]